@@ -0,0 +1,96 @@
+import json
+import platform
+import shutil
+import tempfile
+from time import perf_counter
+
+from benchmarks.Corpus import Corpus
+from src.ImageRenamer import ImageRenamer
+from src.PhaseTimer import PhaseTimer
+
+
+class Benchmark:
+    """
+    Замеряет время каждой фазы переименования на сгенерированном корпусе и сравнивает результаты замеров.
+
+    Переименование меняет корпус, поэтому перед каждым повтором он создаётся заново.
+    Для каждой фазы в результат попадает наименьшее время из всех повторов: оно меньше всего зависит от шума.
+    """
+    VERSION = 1
+
+    def __init__(self, corpus: Corpus, jobs: int = 1, repeat: int = 3, workdir: str | None = None):
+        self.__corpus = corpus
+        self.__jobs = jobs
+        self.__repeat = max(1, repeat)
+        self.__workdir = workdir
+
+    def run(self) -> dict:
+        """
+        :return: Результат замеров, который можно сохранить в JSON
+        """
+        best = dict.fromkeys(PhaseTimer.PHASES, float('inf'))
+        best_total = float('inf')
+        for _ in range(self.__repeat):
+            root = tempfile.mkdtemp(prefix='imagerenamer-bench-', dir=self.__workdir)
+            try:
+                created = self.__corpus.generate(root)
+                renamer = ImageRenamer(root_path=root, is_recursion=True, jobs=self.__jobs, is_quiet=True)
+                started = perf_counter()
+                renamer.rename()
+                best_total = min(best_total, perf_counter() - started)
+                statistics = renamer.statistics.as_dict()
+                for phase, duration in statistics['phases'].items():
+                    best[phase] = min(best[phase], duration)
+            finally:
+                shutil.rmtree(root, ignore_errors=True)
+
+        return {
+            'version': self.VERSION,
+            'corpus': self.__corpus.describe(),
+            'created': created,
+            'jobs': self.__jobs,
+            'repeat': self.__repeat,
+            'renamed': renamer._renamed_qty,
+            'failed': renamer._failed_qty,
+            'phases': best,
+            'total': best_total,
+            'peak_rss': statistics['peak_rss'],
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        }
+
+    @staticmethod
+    def save(result: dict, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(result, file, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def load(path: str) -> dict:
+        with open(path, encoding='utf-8') as file:
+            result = json.load(file)
+        if result.get('version') != Benchmark.VERSION:
+            raise ValueError(f'{path}: неподдерживаемая версия результатов')
+        return result
+
+    @staticmethod
+    def compare(baseline: dict, current: dict, threshold: float = 0.1, min_delta: float = 0.05) -> list:
+        """
+        Сравнивает два результата замеров.
+        Фаза считается замедлившейся, если её время выросло больше чем на 'threshold' (доля)
+        и при этом больше чем на 'min_delta' секунд: так короткие фазы не срабатывают от шума.
+        :return: Список кортежей (фаза, время до, время после, замедлилась ли фаза)
+
+        Исключения:
+         - ValueError   результаты получены на разных корпусах или с разным количеством потоков
+        """
+        for key in ('corpus', 'jobs'):
+            if baseline[key] != current[key]:
+                raise ValueError(f'Результаты нельзя сравнивать: отличается {key}')
+
+        rows = list()
+        phases = dict(baseline['phases'], total=baseline['total'])
+        for phase, before in phases.items():
+            after = current['total'] if phase == 'total' else current['phases'].get(phase, 0.0)
+            is_regression = after - before > min_delta and after > before * (1 + threshold)
+            rows.append((phase, before, after, is_regression))
+        return rows
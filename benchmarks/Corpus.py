@@ -0,0 +1,122 @@
+import io
+import os
+import random
+import struct
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+import piexif
+from PIL import Image
+from pillow_heif import register_heif_opener
+
+register_heif_opener()
+
+
+@dataclass
+class Corpus:
+    """
+    Воспроизводимый набор файлов для замеров производительности.
+
+    Одни и те же параметры (и seed) всегда дают одно и то же дерево с одними и теми же датами.
+    Файлы создаются из заранее подготовленных шаблонов, в которых подменяется только дата,
+    поэтому даже корпус из миллиона файлов создаётся без кодирования изображений.
+    Виды файлов:
+     - jpeg   - JPEG с датой в EXIF
+     - noexif - JPEG без EXIF
+     - heic   - HEIC с датой в EXIF
+     - mp4    - короткий MP4 с датой создания в 'mvhd' и 'mdhd'
+    Расположение файлов:
+     - flat - все файлы в одной директории
+     - wide - много директорий на первом уровне
+     - deep - глубоко вложенные директории
+    """
+    files: int = 10_000
+    layout: str = 'wide'
+    seed: int = 0
+    # Доля каждого вида файлов
+    mix: dict = field(default_factory=lambda: {'jpeg': 0.7, 'noexif': 0.1, 'heic': 0.1, 'mp4': 0.1})
+    # Вероятность того, что файл снят в ту же секунду, что и предыдущий (серийная съёмка)
+    burst: float = 0.1
+    files_per_dir: int = 100
+    max_depth: int = 32
+
+    LAYOUTS = ('flat', 'wide', 'deep')
+    EXTENSIONS = {'jpeg': '.jpg', 'noexif': '.jpg', 'heic': '.heic', 'mp4': '.mp4'}
+    PLACEHOLDER = b'2000:01:01 00:00:00'
+
+    def __post_init__(self):
+        if self.layout not in self.LAYOUTS:
+            raise ValueError(f'Неизвестное расположение файлов: {self.layout}')
+        unknown = set(self.mix) - set(self.EXTENSIONS)
+        if unknown:
+            raise ValueError(f'Неизвестные виды файлов: {", ".join(sorted(unknown))}')
+
+    def describe(self) -> dict:
+        """
+        Возвращает параметры корпуса, по которым результаты замеров можно сравнивать между собой.
+        """
+        return {'files': self.files, 'layout': self.layout, 'seed': self.seed, 'mix': self.mix, 'burst': self.burst}
+
+    def generate(self, root: str) -> dict:
+        """
+        Создаёт корпус в директории 'root'.
+        :return: Количество созданных файлов каждого вида
+        """
+        templates = {kind: self.__make_template(kind) for kind in self.EXTENSIONS}
+        generator = random.Random(self.seed)
+        kinds = list(self.mix)
+        weights = [self.mix[kind] for kind in kinds]
+        created = dict.fromkeys(kinds, 0)
+        moment = datetime(2000, 1, 1)
+        dirname = None
+
+        for number in range(self.files):
+            if number % self.files_per_dir == 0:
+                dirname = os.path.join(root, self.__dir_path(number // self.files_per_dir))
+                os.makedirs(dirname, exist_ok=True)
+            if generator.random() >= self.burst:
+                moment += timedelta(seconds=generator.randint(1, 3600))
+            kind = generator.choices(kinds, weights)[0]
+            created[kind] += 1
+            with open(os.path.join(dirname, f'IMG_{number:07d}{self.EXTENSIONS[kind]}'), 'wb') as file:
+                file.write(self.__fill_template(kind, templates[kind], moment))
+        return created
+
+    def __dir_path(self, dir_number: int) -> str:
+        if self.layout == 'flat':
+            return ''
+        if self.layout == 'wide':
+            return f'dir_{dir_number:05d}'
+        branch, depth = divmod(dir_number, self.max_depth)
+        return os.path.join(f'branch_{branch:05d}', *(f'level_{level:02d}' for level in range(depth)))
+
+    def __make_template(self, kind: str) -> bytes:
+        if kind == 'mp4':
+            return b''
+        exif = piexif.dump({'0th': {piexif.ImageIFD.DateTime: self.PLACEHOLDER}})
+        buffer = io.BytesIO()
+        image = Image.new('RGB', (16, 16), 'blue')
+        if kind == 'jpeg':
+            image.save(buffer, 'JPEG', exif=exif)
+        elif kind == 'heic':
+            image.save(buffer, 'HEIF', exif=exif)
+        else:
+            image.save(buffer, 'JPEG')
+        return buffer.getvalue()
+
+    def __fill_template(self, kind: str, template: bytes, moment: datetime) -> bytes:
+        if kind == 'mp4':
+            return self.__make_video(moment)
+        if kind == 'noexif':
+            return template
+        return template.replace(self.PLACEHOLDER, moment.strftime('%Y:%m:%d %H:%M:%S').encode('ascii'), 1)
+
+    @staticmethod
+    def __make_video(moment: datetime) -> bytes:
+        def box(box_type: bytes, payload: bytes) -> bytes:
+            return struct.pack('>L4s', len(payload) + 8, box_type) + payload
+
+        seconds = int((moment - datetime(1904, 1, 1)).total_seconds())
+        header = struct.pack('>LLL', 0, seconds, seconds) + bytes(20)
+        moov = box(b'moov', box(b'mvhd', header) + box(b'trak', box(b'mdia', box(b'mdhd', header))))
+        return box(b'ftyp', b'isom' + bytes(4) + b'isommp41') + box(b'mdat', bytes(256)) + moov
@@ -0,0 +1,112 @@
+import gc
+import os
+import platform
+import tracemalloc
+
+from src.FileObject import FileObject
+
+
+class SyntheticEntry:
+    """
+    Файл синтетического дерева: то, что FileObject использует из os.DirEntry.
+    """
+    __slots__ = ('path', 'name')
+
+    def __init__(self, dirname: str, name: str):
+        self.path = os.path.join(dirname, name)
+        self.name = name
+
+
+class PathListIndex:
+    """
+    Прежнее устройство FileObject, с которым сравнивается текущее: список полных адресов,
+    словарь {полный адрес: позиция} и множество имён для каждой директории.
+    """
+    def __init__(self, walker):
+        self.__files = list()
+        self.__positions = dict()
+        self.__names_by_dir = dict()
+        for dirname, entries, skipped in walker:
+            names = self.__names_by_dir.setdefault(dirname, set())
+            names.update(skipped)
+            for entry in entries:
+                self.__positions[entry.path] = len(self.__files)
+                self.__files.append(entry.path)
+                names.add(entry.name)
+
+    def __len__(self):
+        return len(self.__files)
+
+
+class Memory:
+    """
+    Замеряет, сколько памяти занимает список файлов FileObject на дереве из миллионов файлов.
+
+    Дерево не создаётся на диске: FileObject получает содержимое директорий от синтетического обхода,
+    поэтому замер занимает секунды, а не часы. Память считается через tracemalloc - это объём
+    Python-объектов, которые остаются после сканирования. Для сравнения замеряется прежнее устройство
+    списка (PathListIndex). Результат имеет тот же вид, что и у Benchmark, но фазы - в мегабайтах.
+    """
+    VERSION = 1
+    ROOT = '/srv/archive/photos'
+
+    def __init__(self, files: int = 1_000_000, files_per_dir: int = 500, depth: int = 3):
+        """
+        :param files: Количество файлов
+        :param files_per_dir: Количество файлов в каждой директории
+        :param depth: Уровень вложенности директорий с файлами
+        """
+        self.__files = files
+        self.__files_per_dir = max(1, files_per_dir)
+        self.__depth = max(1, depth)
+
+    def run(self) -> dict:
+        """
+        :return: Результат замеров, который можно сохранить в JSON
+        """
+        phases = {
+            'legacy': self.__measure(PathListIndex),
+            'compact': self.__measure(lambda walker: FileObject(self.ROOT, True, walker=walker)),
+        }
+        return {
+            'version': self.VERSION,
+            'corpus': {'memory': True, 'files': self.__files, 'files_per_dir': self.__files_per_dir,
+                       'depth': self.__depth},
+            'jobs': 1,
+            'repeat': 1,
+            'phases': phases,
+            'total': phases['compact'],
+            'reduction': 1 - phases['compact'] / phases['legacy'] if phases['legacy'] else 0.0,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        }
+
+    def __measure(self, factory) -> float:
+        """
+        Возвращает объём памяти в мегабайтах, который занимает результат factory(обход дерева).
+        """
+        gc.collect()
+        tracemalloc.start()
+        try:
+            index = factory(self.__walk())
+            len(index)
+            size, _ = tracemalloc.get_traced_memory()
+            del index
+        finally:
+            tracemalloc.stop()
+        return size / 2 ** 20
+
+    def __walk(self):
+        """
+        Отдаёт содержимое директорий в формате DirectoryWalker, создавая объекты файлов по одной директории.
+        """
+        number = 0
+        dir_number = 0
+        while number < self.__files:
+            parts = [f'{2000 + dir_number % 20}', f'{dir_number // 20 % 100:02d}_event_{dir_number:06d}']
+            parts.extend(f'camera_{level}' for level in range(self.__depth - 2))
+            dirname = os.path.join(self.ROOT, *parts)
+            qty = min(self.__files_per_dir, self.__files - number)
+            yield dirname, [SyntheticEntry(dirname, f'IMG_{number + index:08d}.JPG') for index in range(qty)], set()
+            number += qty
+            dir_number += 1
@@ -0,0 +1,53 @@
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from time import perf_counter
+
+from benchmarks.Corpus import Corpus
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main.py')
+
+
+class Startup:
+    """
+    Замеряет время запуска main.py в отдельном процессе: так учитывается импорт всех модулей.
+
+    Сценарии:
+     - help      - `main.py --help`
+     - jpeg_only - предпросмотр папки, в которой только JPEG-файлы: PIL для неё загружаться не должен
+    Для каждого сценария берётся медиана из 'repeat' запусков. Результат имеет тот же вид, что и у Benchmark,
+    поэтому сравнивается той же командой compare.
+    """
+    VERSION = 1
+
+    def __init__(self, repeat: int = 20, files: int = 20):
+        self.__repeat = max(1, repeat)
+        self.__files = files
+
+    def run(self) -> dict:
+        root = tempfile.mkdtemp(prefix='imagerenamer-startup-')
+        try:
+            Corpus(self.__files, 'flat', mix={'jpeg': 1}).generate(root)
+            scenarios = {'help': ['--help'], 'jpeg_only': [root, '--preview', '--quiet']}
+            phases = {name: self.__measure(arguments) for name, arguments in scenarios.items()}
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+        return {
+            'version': self.VERSION,
+            'corpus': {'startup': True, 'files': self.__files},
+            'jobs': 1,
+            'repeat': self.__repeat,
+            'phases': phases,
+            'total': sum(phases.values()),
+        }
+
+    def __measure(self, arguments: list) -> float:
+        durations = list()
+        for _ in range(self.__repeat):
+            started = perf_counter()
+            subprocess.run([sys.executable, MAIN, *arguments], check=True, stdout=subprocess.DEVNULL)
+            durations.append(perf_counter() - started)
+        return statistics.median(durations)
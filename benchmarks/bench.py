@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+import os
+import sys
+
+import click
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.Benchmark import Benchmark  # noqa: E402
+from benchmarks.Corpus import Corpus  # noqa: E402
+from benchmarks.Memory import Memory  # noqa: E402
+from benchmarks.Startup import Startup  # noqa: E402
+
+
+def corpus_options(function):
+    """
+    Параметры корпуса, общие для команд generate и run.
+    """
+    options = (
+        click.option('-n', '--files', type=click.IntRange(min=1), default=10_000, show_default=True,
+                     help='Количество файлов в корпусе.'),
+        click.option('--layout', type=click.Choice(Corpus.LAYOUTS), default='wide', show_default=True,
+                     help='Расположение файлов: одна директория, много директорий или глубокое дерево.'),
+        click.option('--seed', type=int, default=0, show_default=True,
+                     help='Начальное значение генератора случайных чисел.'),
+        click.option('--burst', type=click.FloatRange(0, 1), default=0.1, show_default=True,
+                     help='Доля файлов, снятых в ту же секунду, что и предыдущий.'),
+    )
+    for option in reversed(options):
+        function = option(function)
+    return function
+
+
+@click.group()
+def main() -> None:
+    """
+    Замеры производительности ImageRenamer на синтетическом корпусе файлов.
+    """
+
+
+@main.command()
+@click.argument('root', type=click.Path(file_okay=False))
+@corpus_options
+def generate(root: str, files: int, layout: str, seed: int, burst: float) -> None:
+    """
+    Создать корпус в директории ROOT.
+    """
+    created = Corpus(files, layout, seed, burst=burst).generate(root)
+    click.echo(', '.join(f'{kind}: {qty}' for kind, qty in created.items()))
+
+
+@main.command()
+@corpus_options
+@click.option('-j', '--jobs', type=click.IntRange(min=1), default=1, show_default=True,
+              help='Количество потоков ImageRenamer.')
+@click.option('--repeat', type=click.IntRange(min=1), default=3, show_default=True,
+              help='Количество повторов, для каждой фазы берётся лучшее время.')
+@click.option('--workdir', type=click.Path(file_okay=False, exists=True),
+              help='Директория, в которой создаётся корпус. По-умолчанию - временная директория системы.')
+@click.option('-o', '--out', type=click.Path(dir_okay=False, writable=True),
+              help='Файл, в который записывается результат в формате JSON.')
+def run(files: int, layout: str, seed: int, burst: float, jobs: int, repeat: int,
+        workdir: str | None, out: str | None) -> None:
+    """
+    Замерить время фаз scan, extract, plan и apply.
+    """
+    result = Benchmark(Corpus(files, layout, seed, burst=burst), jobs, repeat, workdir).run()
+    for phase, duration in result['phases'].items():
+        click.echo(f'{phase:>8}  {duration:10.3f} s')
+    click.echo(f'{"total":>8}  {result["total"]:10.3f} s')
+    if out:
+        Benchmark.save(result, out)
+
+
+@main.command()
+@click.option('--repeat', type=click.IntRange(min=1), default=20, show_default=True,
+              help='Количество запусков каждого сценария, берётся медиана.')
+@click.option('-o', '--out', type=click.Path(dir_okay=False, writable=True),
+              help='Файл, в который записывается результат в формате JSON.')
+def startup(repeat: int, out: str | None) -> None:
+    """
+    Замерить время запуска main.py: --help и предпросмотр папки с JPEG-файлами.
+    """
+    result = Startup(repeat).run()
+    for scenario, duration in result['phases'].items():
+        click.echo(f'{scenario:>10}  {duration * 1000:8.1f} ms')
+    if out:
+        Benchmark.save(result, out)
+
+
+@main.command()
+@click.option('-n', '--files', type=click.IntRange(min=1), default=1_000_000, show_default=True,
+              help='Количество файлов в синтетическом дереве.')
+@click.option('--files-per-dir', type=click.IntRange(min=1), default=500, show_default=True,
+              help='Количество файлов в каждой директории.')
+@click.option('--depth', type=click.IntRange(min=1), default=3, show_default=True,
+              help='Уровень вложенности директорий с файлами.')
+@click.option('-o', '--out', type=click.Path(dir_okay=False, writable=True),
+              help='Файл, в который записывается результат в формате JSON.')
+def memory(files: int, files_per_dir: int, depth: int, out: str | None) -> None:
+    """
+    Замерить память, которую занимает список файлов, в сравнении с прежним хранением полных адресов.
+    """
+    result = Memory(files, files_per_dir, depth).run()
+    for layout, size in result['phases'].items():
+        click.echo(f'{layout:>8}  {size:10.1f} MB')
+    click.echo(f'{"saved":>8}  {result["reduction"] * 100:10.1f} %')
+    if out:
+        Benchmark.save(result, out)
+
+
+@main.command()
+@click.argument('baseline', type=click.Path(exists=True, dir_okay=False))
+@click.argument('current', type=click.Path(exists=True, dir_okay=False))
+@click.option('--threshold', type=click.FloatRange(min=0), default=0.1, show_default=True,
+              help='Допустимое замедление фазы (доля от времени BASELINE).')
+@click.option('--min-delta', type=click.FloatRange(min=0), default=0.05, show_default=True,
+              help='Замедление в секундах, меньше которого фаза не считается замедлившейся.')
+def compare(baseline: str, current: str, threshold: float, min_delta: float) -> None:
+    """
+    Сравнить результаты BASELINE и CURRENT. Код возврата 1, если какая-либо фаза замедлилась.
+    """
+    try:
+        rows = Benchmark.compare(Benchmark.load(baseline), Benchmark.load(current), threshold, min_delta)
+    except ValueError as error:
+        raise click.ClickException(str(error))
+
+    for phase, before, after, is_regression in rows:
+        change = (after / before - 1) * 100 if before else 0.0
+        mark = click.style('REGRESSION', fg='red') if is_regression else 'ok'
+        click.echo(f'{phase:>8}  {before:10.3f} s  {after:10.3f} s  {change:+7.1f} %  {mark}')
+    if any(row[3] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,8 @@ import os.path
 import click
 import settings
 from src import ImageRenamer
+from src.OutputWriter import OutputWriter
+from src.UniqueNameAllocator import UniqueNameAllocator
 
 
 @click.command()
@@ -23,21 +25,204 @@ from src import ImageRenamer
               show_default=True,
               help='При совпадении имён файла добавлять суффикс в конец имени. ' +
                    'Если False, то файл с таким же именем будет перезаписан.')
+@click.option('--unique-style',
+              type=click.Choice(UniqueNameAllocator.STYLES),
+              default=settings.UNIQUE_STYLE,
+              show_default=True,
+              help='Вид уникального имени: суффикс \' (copy)\' или номер (_001, _002).')
 @click.option('-r', '--recursion',
               is_flag=True,
               default=settings.RECURSION,
               show_default=True,
               help='Если флаг установлен, то программа будет рекурсивно ' +
                    'проходить каталоги и переименовывать в них файлы.')
+@click.option('-i', '--incremental',
+              is_flag=True,
+              default=settings.INCREMENTAL,
+              show_default=True,
+              help='Не открывать файлы, имена которых уже составлены по шаблону. ' +
+                   'Ускоряет повторный запуск в уже обработанной директории.')
+@click.option('-w', '--watch',
+              is_flag=True,
+              default=settings.WATCH,
+              show_default=True,
+              help='Следить за директорией и переименовывать новые файлы, как только закончится их запись. ' +
+                   'Для завершения нажмите Ctrl+C.')
+@click.option('--settle-time',
+              type=click.FloatRange(min=0),
+              default=settings.SETTLE_TIME,
+              show_default=True,
+              help='Сколько секунд размер и время изменения нового файла не должны меняться, ' +
+                   'чтобы его запись считалась законченной (в режиме --watch).')
+@click.option('--poll-interval',
+              type=click.FloatRange(min=0.01),
+              default=settings.POLL_INTERVAL,
+              show_default=True,
+              help='Период проверки директории в секундах, если inotify недоступен (в режиме --watch).')
+@click.option('--include',
+              multiple=True,
+              default=settings.INCLUDE,
+              help='Обрабатывать только файлы, подходящие под шаблон (например, \'*.jpg\' или \'.heic\'). ' +
+                   'Можно указать несколько раз.')
+@click.option('--exclude',
+              multiple=True,
+              default=settings.EXCLUDE,
+              help='Пропускать файлы и директории, подходящие под шаблон (например, \'.git\', \'@eaDir\' ' +
+                   'или \'Camera/thumbs\'). Исключённые директории не сканируются. Можно указать несколько раз.')
+@click.option('--max-depth',
+              type=click.IntRange(min=0),
+              default=settings.MAX_DEPTH,
+              help='Максимальная глубина вложенных директорий при рекурсивном обходе (0 - только сама директория).')
+@click.option('-j', '--jobs',
+              type=click.IntRange(min=1),
+              default=settings.JOBS,
+              show_default=True,
+              help='Количество потоков, в которых параллельно считываются EXIF-данные файлов.')
+@click.option('-P', '--processes',
+              type=click.IntRange(min=1),
+              default=settings.PROCESSES,
+              show_default=True,
+              help='Количество процессов, между которыми делится дерево директорий. ' +
+                   'Каждую директорию обрабатывает ровно один процесс.')
+@click.option('--probe-workers',
+              type=click.IntRange(min=1),
+              default=settings.PROBE_WORKERS,
+              show_default=True,
+              help='Количество потоков, которые заранее запускают ffprobe для видеофайлов.')
+@click.option('--async', 'use_async',
+              is_flag=True,
+              default=settings.ASYNC,
+              show_default=True,
+              help='Использовать конвейер на asyncio: сканирование, чтение файлов и переименование ' +
+                   'выполняются одновременно. Ускоряет работу на сетевых дисках.')
+@click.option('--in-flight',
+              type=click.IntRange(min=1),
+              default=settings.IN_FLIGHT,
+              show_default=True,
+              help='Количество файлов, которые конвейер на asyncio обрабатывает одновременно.')
+@click.option('--queue-size',
+              type=click.IntRange(min=1),
+              default=settings.QUEUE_SIZE,
+              show_default=True,
+              help='Количество директорий, которые в конвейере на asyncio могут ожидать переименования.')
+@click.option('--cache',
+              type=click.Path(dir_okay=False),
+              default=settings.CACHE,
+              help='Файл, в котором между запусками хранятся EXIF-данные неизменившихся файлов.')
+@click.option('--cache-size',
+              type=click.IntRange(min=1),
+              default=settings.CACHE_SIZE,
+              show_default=True,
+              help='Максимальное количество записей в кэше EXIF-данных.')
+@click.option('--plan-out',
+              type=click.Path(dir_okay=False, writable=True),
+              help='Не переименовывать файлы, а записать план переименования в файл.')
+@click.option('--apply-plan',
+              type=click.Path(exists=True, dir_okay=False),
+              help='Выполнить план переименования, записанный ранее с помощью --plan-out.')
+@click.option('--journal',
+              type=click.Path(dir_okay=False, writable=True),
+              default=settings.JOURNAL,
+              help='Записывать все переименования в журнал, чтобы их можно было отменить с помощью --undo.')
+@click.option('--journal-sync',
+              type=click.IntRange(min=1),
+              default=settings.JOURNAL_SYNC,
+              show_default=True,
+              help='Количество записей журнала, после которого он сбрасывается на диск. '
+                   'Перед переименованием в очередной директории журнал сбрасывается в любом случае, '
+                   'поэтому на каждую директорию с переименованиями приходится хотя бы один сброс.')
+@click.option('--undo',
+              type=click.Path(exists=True, dir_okay=False),
+              help='Отменить переименования, записанные в журнал.')
+@click.option('-f', '--format', 'output_format',
+              type=click.Choice(OutputWriter.FORMATS),
+              default=settings.OUTPUT_FORMAT,
+              show_default=True,
+              help='Формат вывода: текст или JSON Lines с записью на каждый файл.')
+@click.option('-q', '--quiet',
+              is_flag=True,
+              default=settings.QUIET,
+              show_default=True,
+              help='Не выводить ничего, кроме ошибок, из-за которых работа невозможна.')
+@click.option('-s', '--summary-only',
+              is_flag=True,
+              default=settings.SUMMARY_ONLY,
+              show_default=True,
+              help='Выводить только итоговое количество переименованных и непереименованных файлов.')
+@click.option('--stats',
+              is_flag=True,
+              default=settings.STATS,
+              show_default=True,
+              help='Вывести статистику работы: время каждой фазы, время получения даты, ' +
+                   'объём прочитанных данных, пиковое потребление памяти и ошибки по видам.')
+@click.option('--trace',
+              type=click.Path(dir_okay=False, writable=True),
+              default=settings.TRACE,
+              help='Записать трассировку в формате Chrome trace event (chrome://tracing, Perfetto).')
+@click.option('--trace-sample',
+              type=click.IntRange(min=1),
+              default=settings.TRACE_SAMPLE,
+              show_default=True,
+              help='Записывать в трассировку каждый N-й отрезок времени.')
+@click.option('--trace-slow-ms',
+              type=click.FloatRange(min=0),
+              default=settings.TRACE_SLOW_MS,
+              show_default=True,
+              help='Отрезки не короче этого времени (в миллисекундах) записываются в трассировку всегда.')
 def main(path: str, preview: bool, recursion: bool,
-         template: str, unique_name: bool) -> None:
+         incremental: bool, watch: bool, settle_time: float, poll_interval: float,
+         include: tuple, exclude: tuple, max_depth: int | None,
+         template: str, unique_name: bool, unique_style: str, jobs: int, processes: int, probe_workers: int,
+         use_async: bool, in_flight: int, queue_size: int,
+         cache: str | None, cache_size: int, plan_out: str | None, apply_plan: str | None,
+         journal: str | None, journal_sync: int, undo: str | None,
+         output_format: str, quiet: bool, summary_only: bool, stats: bool,
+         trace: str | None, trace_sample: int, trace_slow_ms: float) -> None:
+    if processes > 1:
+        unsupported = {'--async': use_async, '--watch': watch, '--cache': cache, '--plan-out': plan_out,
+                       '--apply-plan': apply_plan, '--journal': journal, '--undo': undo, '--trace': trace}
+        for option, value in unsupported.items():
+            if value:
+                raise click.UsageError(f'{option} нельзя использовать вместе с --processes')
     renamer = ImageRenamer.ImageRenamer(
         root_path=os.path.abspath(path),
         is_recursion=recursion,
+        is_incremental=incremental,
+        settle_time=settle_time,
+        poll_interval=poll_interval,
+        include=include,
+        exclude=exclude,
+        max_depth=max_depth,
         template_datetime_for_new_file=template,
-        is_unique_name=unique_name
+        is_unique_name=unique_name,
+        unique_style=unique_style,
+        jobs=jobs,
+        processes=processes,
+        probe_workers=probe_workers,
+        is_async=use_async,
+        in_flight=in_flight,
+        queue_size=queue_size,
+        cache_path=cache,
+        cache_size=cache_size,
+        plan_out=plan_out,
+        journal_path=journal,
+        journal_sync=journal_sync,
+        output_format=output_format,
+        is_quiet=quiet,
+        is_summary_only=summary_only,
+        is_stats=stats,
+        trace_path=trace,
+        trace_sample=trace_sample,
+        trace_slow_ms=trace_slow_ms
     )
-    renamer.rename(preview)
+    if undo:
+        renamer.undo(undo)
+    elif apply_plan:
+        renamer.apply_plan(apply_plan)
+    elif watch:
+        renamer.watch(preview)
+    else:
+        renamer.rename(preview)
 
 
 if __name__ == '__main__':
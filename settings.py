@@ -9,8 +9,91 @@ PREVIEW = False
 # По-умолчанию отключён.
 RECURSION = False
 
+# Инкрементальный режим: файлы, имена которых уже составлены по шаблону, не открываются.
+# По-умолчанию отключён.
+INCREMENTAL = False
+
+# Режим наблюдения: новые файлы переименовываются, как только закончится их запись.
+# По-умолчанию отключён.
+WATCH = False
+
+# Сколько секунд размер и время изменения нового файла не должны меняться, чтобы его запись считалась законченной.
+SETTLE_TIME = 2.0
+
+# Период проверки директории в режиме наблюдения, если inotify недоступен.
+POLL_INTERVAL = 1.0
+
+# Шаблоны файлов, которые нужно обрабатывать, например ('*.jpg', '.heic').
+# По-умолчанию обрабатываются все файлы.
+INCLUDE = ()
+
+# Шаблоны файлов и директорий, которые нужно пропускать, например ('.git', '@eaDir', 'Camera/thumbs').
+# Исключённые директории не сканируются.
+EXCLUDE = ()
+
+# Максимальная глубина вложенных директорий при рекурсивном обходе. По-умолчанию не ограничена.
+MAX_DEPTH = None
+
 # Шаблон, на основе которого будет происходить переименование файлов.
 TEMPLATE = '%Y%m%d_%H%M%S'
 
 # Параметр, отвечающий за создание уникальных имён в случае их совпадения.
 UNIQUE_NAME = False
+
+# Вид уникального имени: 'copy' - суффикс ' (copy)' повторяется, 'number' - к имени добавляется номер (_001, _002).
+UNIQUE_STYLE = 'copy'
+
+# Количество потоков, в которых параллельно считываются EXIF-данные файлов.
+# По-умолчанию 1, то есть файлы обрабатываются последовательно.
+JOBS = 1
+
+# Количество процессов, между которыми делится дерево директорий.
+PROCESSES = 1
+
+# Количество потоков, которые заранее запускают ffprobe для видеофайлов.
+PROBE_WORKERS = 4
+
+# Конвейер на asyncio, в котором сканирование, чтение файлов и переименование выполняются одновременно.
+# Полезен для сетевых дисков. По-умолчанию отключён.
+ASYNC = False
+
+# Количество файлов, которые конвейер на asyncio обрабатывает одновременно.
+IN_FLIGHT = 64
+
+# Количество директорий, которые в конвейере на asyncio могут ожидать переименования.
+QUEUE_SIZE = 4
+
+# Путь к файлу кэша EXIF-данных. По-умолчанию кэш не используется.
+CACHE = None
+
+# Максимальное количество записей в кэше EXIF-данных.
+CACHE_SIZE = 1_000_000
+
+# Путь к журналу переименований. По-умолчанию журнал не ведётся.
+JOURNAL = None
+
+# Количество записей журнала, после которого он сбрасывается на диск (fsync).
+# Записи разных директорий в одну пачку не объединяются: перед переименованием в очередной директории
+# журнал сбрасывается в любом случае, поэтому fsync выполняется хотя бы раз на каждую директорию с переименованиями.
+JOURNAL_SYNC = 1000
+
+# Формат вывода: 'text' - текст, 'jsonl' - по одной JSON-записи на строку.
+OUTPUT_FORMAT = 'text'
+
+# Не выводить ничего, кроме ошибок, из-за которых работа невозможна.
+QUIET = False
+
+# Выводить только итоговое количество переименованных и непереименованных файлов.
+SUMMARY_ONLY = False
+
+# Выводить после завершения работы статистику: время фаз, время получения даты, объём прочитанного, память, ошибки.
+STATS = False
+
+# Путь к файлу трассировки в формате Chrome trace event. По-умолчанию трассировка не ведётся.
+TRACE = None
+
+# В трассировку записывается каждый N-й отрезок времени.
+TRACE_SAMPLE = 10
+
+# Отрезки не короче этого времени (в миллисекундах) записываются в трассировку всегда.
+TRACE_SLOW_MS = 10
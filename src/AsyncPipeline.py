@@ -0,0 +1,97 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+
+class AsyncPipeline:
+    """
+    Конвейер на asyncio для сетевых дисков (SMB, NFS), где каждое обращение к файлу стоит миллисекунды.
+
+    Три стадии работают одновременно:
+     - сканирование директорий (DirectoryWalker) в отдельном потоке;
+     - получение новых имён: до in_flight файлов обрабатываются одновременно в пуле потоков,
+       потому что PIL, ffprobe и чтение заголовков - блокирующие вызовы;
+     - построение плана, переименование и вывод результатов директории в ещё одном отдельном потоке,
+       поэтому директории обрабатываются строго по очереди и в порядке обхода.
+    Между стадиями - очередь из не более чем queue_size директорий: если переименование не успевает
+    за чтением, то сканирование приостанавливается, и память не растёт.
+    """
+    def __init__(self, walker, extract, on_directory, in_flight: int = 64, queue_size: int = 4, timer=None):
+        """
+        :param walker: Итерируемый объект с кортежами (директория, список os.DirEntry, имена пропущенных файлов),
+                       например DirectoryWalker
+        :param extract: Функция, которая получает os.DirEntry и возвращает результат для него
+        :param on_directory: Функция (директория, имена файлов директории, результаты extract в порядке обхода)
+        :param in_flight: Количество файлов, которые обрабатываются одновременно
+        :param queue_size: Количество директорий, которые могут ожидать переименования
+        :param timer: PhaseTimer, в который записывается время сканирования и ожидания результатов
+        """
+        self.__walker = walker
+        self.__extract = extract
+        self.__on_directory = on_directory
+        self.__in_flight = max(1, in_flight)
+        self.__queue_size = max(1, queue_size)
+        self.__timer = timer
+
+    def run(self) -> None:
+        """
+        Выполняет конвейер до конца. Исключение любой стадии прерывает работу и передаётся вызывающему коду.
+        """
+        with ThreadPoolExecutor(1, thread_name_prefix='scan') as scan_executor, \
+                ThreadPoolExecutor(self.__in_flight, thread_name_prefix='extract') as extract_executor, \
+                ThreadPoolExecutor(1, thread_name_prefix='apply') as apply_executor:
+            asyncio.run(self.__run(scan_executor, extract_executor, apply_executor))
+
+    async def __run(self, scan_executor, extract_executor, apply_executor) -> None:
+        directories = asyncio.Queue(self.__queue_size)
+        tasks = (asyncio.ensure_future(self.__scan(directories, scan_executor, extract_executor)),
+                 asyncio.ensure_future(self.__apply(directories, apply_executor)))
+        try:
+            # Если одна стадия упала, другая может навсегда заблокироваться на очереди, поэтому она отменяется
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for task in done:
+            task.result()
+
+    async def __scan(self, directories: asyncio.Queue, scan_executor, extract_executor) -> None:
+        """
+        Сканирует директории и отправляет файлы на обработку, не превышая in_flight одновременно.
+        """
+        loop = asyncio.get_running_loop()
+        in_flight = asyncio.Semaphore(self.__in_flight)
+        walker = iter(self.__walker)
+        while True:
+            started = perf_counter()
+            item = await loop.run_in_executor(scan_executor, next, walker, None)
+            self.__add_time('scan', perf_counter() - started)
+            if item is None:
+                break
+
+            dirname, entries, skipped = item
+            futures = list()
+            for entry in entries:
+                await in_flight.acquire()
+                future = loop.run_in_executor(extract_executor, self.__extract, entry)
+                future.add_done_callback(lambda _: in_flight.release())
+                futures.append(future)
+            await directories.put((dirname, skipped.union(entry.name for entry in entries), futures))
+        await directories.put(None)
+
+    async def __apply(self, directories: asyncio.Queue, apply_executor) -> None:
+        """
+        Дожидается результатов директории и передаёт их on_directory в отдельном потоке.
+        """
+        loop = asyncio.get_running_loop()
+        while (item := await directories.get()) is not None:
+            dirname, names, futures = item
+            started = perf_counter()
+            results = await asyncio.gather(*futures)
+            self.__add_time('extract', perf_counter() - started)
+            await loop.run_in_executor(apply_executor, self.__on_directory, dirname, names, results)
+
+    def __add_time(self, phase: str, seconds: float) -> None:
+        if self.__timer is not None:
+            self.__timer.add(phase, seconds)
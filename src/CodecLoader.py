@@ -0,0 +1,80 @@
+import importlib
+import threading
+
+from src.ProjectException import FileDoesntHaveExif
+
+
+class CodecLoader:
+    """
+    Загружает библиотеки для чтения изображений при первом обращении к ним, а не при запуске программы.
+
+    Импорт PIL и pillow_heif занимает десятки миллисекунд, а JPEG-файлы читает JpegExifReader
+    без этих библиотек, поэтому `main.py --help` и запуск на папке с одними JPEG-файлами их не загружают.
+    Формат файла заранее определяет FormatSniffer, поэтому загружается только нужный модуль PIL,
+    а не все модули сразу, и только ему передаётся файл. pillow_heif загружается только для HEIF-файлов
+    и для AVIF-файлов, которые не смог прочитать сам Pillow.
+    """
+    # Вид файла из FormatSniffer: модули, которые его читают, в порядке очерёдности -
+    # кортежи (модуль PIL или None для pillow_heif, название формата в PIL)
+    PILLOW_FORMATS = {
+        'jpeg': (('JpegImagePlugin', 'JPEG'),),
+        'tiff': (('TiffImagePlugin', 'TIFF'),),
+        'png': (('PngImagePlugin', 'PNG'),),
+        'webp': (('WebPImagePlugin', 'WEBP'),),
+        'heif': ((None, 'HEIF'),),
+        # Модуль AVIF есть только в новых версиях Pillow и может быть собран без libavif
+        'avif': (('AvifImagePlugin', 'AVIF'), (None, 'AVIF')),
+    }
+    __lock = threading.Lock()
+    __image_module = None
+    __loaded = set()
+
+    @classmethod
+    def open_image(cls, file, kind: str):
+        """
+        Открывает изображение из файлового объекта 'file' модулем PIL, который читает формат 'kind'.
+        Файл не закрывается вместе с изображением.
+
+        Исключения:
+         - FileDoesntHaveExif   PIL не смог распознать изображение
+        """
+        position = file.tell()
+        for plugin, format_name in cls.PILLOW_FORMATS[kind]:
+            try:
+                image_module = cls.__load(plugin)
+            except ImportError:
+                # В этой версии Pillow нет такого модуля. pillow_heif - обязательная зависимость
+                if plugin is None:
+                    raise
+                continue
+            if format_name not in image_module.OPEN:
+                continue
+            file.seek(position)
+            try:
+                return image_module.open(file, formats=[format_name])
+            except image_module.UnidentifiedImageError:
+                continue
+        raise FileDoesntHaveExif
+
+    @classmethod
+    def __load(cls, plugin: str | None):
+        """
+        Импортирует PIL.Image и модуль PIL 'plugin' (или pillow_heif, если plugin - None),
+        если они ещё не импортированы.
+        """
+        if plugin in cls.__loaded:
+            return cls.__image_module
+        with cls.__lock:
+            if cls.__image_module is None:
+                from PIL import Image
+                cls.__image_module = Image
+            if plugin is None:
+                import pillow_heif
+                pillow_heif.register_heif_opener()
+                # В версиях pillow_heif, которые читают AVIF, для него есть отдельная функция
+                if hasattr(pillow_heif, 'register_avif_opener'):
+                    pillow_heif.register_avif_opener()
+            else:
+                importlib.import_module(f'PIL.{plugin}')
+            cls.__loaded.add(plugin)
+        return cls.__image_module
@@ -0,0 +1,69 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+
+
+class DatetimeParser:
+    """
+    Распознаёт дату и время из EXIF-данных и форматирует их по шаблону пользователя.
+
+    Известные форматы с полями фиксированной ширины разбираются одним регулярным выражением
+    без datetime.strptime(). Всё остальное (и всё, что не удалось разобрать быстро) проверяется
+    через strptime() по тем же шаблонам и в том же порядке, что и раньше, поэтому результат совпадает
+    с прежним, включая вариант '%Y/%d/%m', который проверяется только после '%Y/%m/%d'.
+    Результат форматирования запоминается: у серийных снимков одинаковые даты.
+    """
+    # Группы шаблонов. Шаблоны внутри группы могут совпасть с одной и той же строкой,
+    # поэтому их порядок внутри группы никогда не меняется.
+    TEMPLATE_GROUPS = (('%Y:%m:%d %H:%M:%S',), ('%Y.%m.%d %H:%M:%S',), ('%Y/%m/%d %H:%M:%S', '%Y/%d/%m %H:%M:%S'),
+                       ('%Y-%m-%dT%H:%M:%S.000000Z',))
+
+    __FAST_PATTERN = re.compile(r'([0-9]{4})([:./])([0-9]{2})\2([0-9]{2}) ([0-9]{2}):([0-9]{2}):([0-9]{2})'
+                                r'|([0-9]{4})-([0-9]{2})-([0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})\.000000Z')
+
+    def __init__(self, template: str, cache_size: int = 4096):
+        self.__template = template
+        # Индекс группы шаблонов, которая совпала последней: с неё начинается медленная проверка
+        self.__last_group = 0
+        self.format = lru_cache(maxsize=cache_size)(self.__format)
+
+    def parse(self, datetime_string: str) -> datetime:
+        """
+        Проверяет 'datetime_string' на соответствие шаблонам.
+        В случае, если совпадение найдено, то возвращает объект типа Datetime.
+
+        Исключения:
+         - ValueError   не получилось распознать дату и время в EXIF
+        """
+        match = self.__FAST_PATTERN.fullmatch(datetime_string)
+        if match is not None:
+            if match.group(1) is not None:
+                year, _, month, day, hour, minute, second = match.groups()[:7]
+            else:
+                year, month, day, hour, minute, second = match.groups()[7:]
+            try:
+                return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
+            except ValueError:
+                # Например, '%Y/%d/%m' или дата, которой не существует: решает strptime()
+                ...
+        return self.__parse_slow(datetime_string)
+
+    def __parse_slow(self, datetime_string: str) -> datetime:
+        groups_qty = len(self.TEMPLATE_GROUPS)
+        first_group = self.__last_group
+        for shift in range(groups_qty):
+            group = (first_group + shift) % groups_qty
+            for template in self.TEMPLATE_GROUPS[group]:
+                try:
+                    result = datetime.strptime(datetime_string, template)
+                except ValueError:
+                    continue
+                self.__last_group = group
+                return result
+        raise ValueError(f'Не получилось распознать дату и время: {datetime_string}')
+
+    def __format(self, datetime_string: str) -> str:
+        """
+        Возвращает строку с изменённым на основе шаблона форматом даты и времени.
+        """
+        return datetime.strftime(self.parse(datetime_string), self.__template)
@@ -0,0 +1,84 @@
+import os
+
+from src.PathFilter import PathFilter
+from src.Tracer import NullTracer
+
+
+class DirectoryWalker:
+    """
+    Потоковый обход директорий на основе os.scandir.
+    Отдаёт содержимое директорий по одной: кортеж (абсолютный путь директории, список файлов в виде os.DirEntry,
+    множество имён пропущенных файлов). Пропущенные фильтром файлы не обрабатываются,
+    но их имена заняты, поэтому их нужно учитывать при выборе новых имён.
+    Файлы внутри директории и поддиректории отсортированы по имени, поэтому порядок обхода стабилен.
+    Тип файла и результат stat() кэшируются в os.DirEntry и повторно не запрашиваются.
+    Директории, исключённые фильтром, отбрасываются во время обхода и не сканируются.
+    """
+    def __init__(self, root_dir_path: str = '.', is_recursion: bool = False, tracer=None,
+                 path_filter: PathFilter | None = None, start_dir_path: str | None = None):
+        """
+        :param start_dir_path: Директория внутри root_dir_path, с которой начинается обход.
+                               Пути для фильтра и глубина по-прежнему считаются от root_dir_path
+        """
+        self.__root_dir_path = os.path.abspath(root_dir_path)
+        self.__prefix_length = len(os.path.join(self.__root_dir_path, ''))
+        self.__start_dir_path = self.__root_dir_path if start_dir_path is None else os.path.abspath(start_dir_path)
+        self.__is_recursion = is_recursion
+        self.__tracer = tracer if tracer is not None else NullTracer()
+        self.__filter = path_filter
+
+    def __iter__(self):
+        # Явный стек вместо рекурсии: поддиректории кладутся в обратном порядке,
+        # чтобы доставаться из стека по алфавиту.
+        stack = [(self.__start_dir_path, self.__depth(self.__start_dir_path))]
+        while stack:
+            current_dir, depth = stack.pop()
+            try:
+                with self.__tracer.span('scandir', 'scan', dir=current_dir):
+                    files, skipped, subdirs = self.__scan_of_dir(current_dir, depth)
+            except (FileNotFoundError, PermissionError):
+                # Корневая директория обязана существовать, а вложенную могли удалить во время обхода
+                if current_dir == self.__start_dir_path:
+                    raise
+                continue
+
+            yield current_dir, files, skipped
+            stack.extend((subdir, depth + 1) for subdir in reversed(subdirs))
+
+    def scan_dir(self, dirname: str) -> tuple:
+        """
+        Сканирует одну директорию dirname внутри корневой, не спускаясь во вложенные.
+        Возвращает кортеж (список файлов в виде os.DirEntry, множество имён пропущенных файлов, список поддиректорий).
+        Поддиректории возвращаются, только если включена рекурсия, и отбираются фильтром.
+        """
+        dirname = os.path.abspath(dirname)
+        with self.__tracer.span('scandir', 'scan', dir=dirname):
+            return self.__scan_of_dir(dirname, self.__depth(dirname))
+
+    def __depth(self, dirname: str) -> int:
+        if dirname == self.__root_dir_path:
+            return 0
+        return dirname[self.__prefix_length:].count(os.sep) + 1
+
+    def __scan_of_dir(self, current_dir: str, depth: int) -> tuple:
+        files = list()
+        skipped = set()
+        subdirs = list()
+        path_filter = self.__filter
+        with os.scandir(current_dir) as entries:
+            for entry in entries:
+                if self.__is_recursion and entry.is_dir():
+                    if path_filter is None or path_filter.is_dir_allowed(self.__relative(entry), entry.name, depth + 1):
+                        subdirs.append(entry.path)
+                elif entry.is_file():
+                    if path_filter is None or path_filter.is_file_allowed(self.__relative(entry), entry.name):
+                        files.append(entry)
+                    else:
+                        skipped.add(entry.name)
+        files.sort(key=lambda item: item.name)
+        subdirs.sort()
+        return files, skipped, subdirs
+
+    def __relative(self, entry: os.DirEntry) -> str:
+        relative_path = entry.path[self.__prefix_length:]
+        return relative_path if os.sep == '/' else relative_path.replace(os.sep, '/')
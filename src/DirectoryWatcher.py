@@ -0,0 +1,338 @@
+import os
+import select
+import stat
+import struct
+from time import monotonic, sleep
+
+from src.DirectoryWalker import DirectoryWalker
+from src.PathFilter import PathFilter
+
+
+class WatchedFile:
+    """
+    Файл, запись которого закончилась. Повторяет ту часть интерфейса os.DirEntry, которой пользуется ImageRenamer,
+    и хранит результат stat(), полученный при проверке файла, чтобы не запрашивать его повторно.
+    """
+    __slots__ = ('path', 'name', '__stat_result')
+
+    def __init__(self, path: str, stat_result: os.stat_result):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.__stat_result = stat_result
+
+    def __fspath__(self) -> str:
+        return self.path
+
+    def __repr__(self):
+        return f'<WatchedFile {self.name!r}>'
+
+    def stat(self) -> os.stat_result:
+        return self.__stat_result
+
+    @staticmethod
+    def is_file() -> bool:
+        return True
+
+
+class InotifyBackend:
+    """
+    События файловой системы от inotify (только Linux). Функции libc вызываются через ctypes.
+    read() отдаёт список кортежей (вид события, путь, является ли путь директорией). Виды событий:
+     - 'changed' - файл или директория созданы, изменены или перемещены сюда;
+     - 'removed' - файл или директория удалены или перемещены отсюда;
+     - 'rescan'  - очередь событий переполнилась, и дерево нужно пересканировать.
+
+    Исключения:
+     - OSError   inotify недоступен
+    """
+    __EVENT = struct.Struct('iIII')
+    __IN_MODIFY = 0x00000002
+    __IN_CLOSE_WRITE = 0x00000008
+    __IN_MOVED_FROM = 0x00000040
+    __IN_MOVED_TO = 0x00000080
+    __IN_CREATE = 0x00000100
+    __IN_DELETE = 0x00000200
+    __IN_Q_OVERFLOW = 0x00004000
+    __IN_IGNORED = 0x00008000
+    __IN_ONLYDIR = 0x01000000
+    __IN_ISDIR = 0x40000000
+    __IN_NONBLOCK = 0o4000
+    __IN_CLOEXEC = 0o2000000
+    __MASK = (__IN_MODIFY | __IN_CLOSE_WRITE | __IN_MOVED_FROM | __IN_MOVED_TO | __IN_CREATE | __IN_DELETE |
+              __IN_ONLYDIR)
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        try:
+            libc.inotify_init1.argtypes = (ctypes.c_int,)
+            libc.inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        except AttributeError:
+            raise OSError('inotify недоступен') from None
+        fd = libc.inotify_init1(self.__IN_NONBLOCK | self.__IN_CLOEXEC)
+        if fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self.__libc = libc
+        self.__fd = fd
+        # Дескриптор наблюдения -> директория
+        self.__dirs = dict()
+
+    def add(self, dirname: str) -> None:
+        """
+        Начинает следить за директорией. Директории, которые уже исчезли или недоступны, пропускаются.
+        """
+        descriptor = self.__libc.inotify_add_watch(self.__fd, os.fsencode(dirname), self.__MASK)
+        if descriptor >= 0:
+            self.__dirs[descriptor] = dirname
+
+    def read(self, timeout: float) -> list:
+        """
+        Ждёт события не дольше timeout секунд и возвращает все события, которые успели прийти.
+        """
+        if not select.select([self.__fd], [], [], timeout)[0]:
+            return []
+        try:
+            data = os.read(self.__fd, 65536)
+        except BlockingIOError:
+            return []
+
+        events = list()
+        offset = 0
+        while offset < len(data):
+            descriptor, mask, _, length = self.__EVENT.unpack_from(data, offset)
+            offset += self.__EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if mask & self.__IN_Q_OVERFLOW:
+                events.append(('rescan', None, True))
+                continue
+            if mask & self.__IN_IGNORED:
+                self.__dirs.pop(descriptor, None)
+                continue
+            dirname = self.__dirs.get(descriptor)
+            if dirname is None or not name:
+                continue
+            kind = 'removed' if mask & (self.__IN_DELETE | self.__IN_MOVED_FROM) else 'changed'
+            events.append((kind, os.path.join(dirname, name), bool(mask & self.__IN_ISDIR)))
+        return events
+
+    def close(self) -> None:
+        os.close(self.__fd)
+
+
+class PollingBackend:
+    """
+    Запасной вариант для систем без inotify: после каждого ожидания просит пересканировать дерево.
+    """
+    @staticmethod
+    def add(dirname: str) -> None:
+        ...
+
+    @staticmethod
+    def read(timeout: float) -> list:
+        sleep(timeout)
+        return [('rescan', None, True)]
+
+    @staticmethod
+    def close() -> None:
+        ...
+
+
+class DirectoryWatcher:
+    """
+    Следит за директорией и отдаёт пачки файлов, запись которых закончилась.
+
+    Изменения приходят от inotify, а если он недоступен, то находятся пересканированием дерева.
+    Файл считается записанным, когда его размер и время изменения не меняются settle_time секунд,
+    поэтому недокачанные файлы не открываются. Файлы, которые оказались готовы одновременно,
+    отдаются одной пачкой: словарём {директория: список WatchedFile}.
+    Сначала отдаются файлы, которые уже были в директории на момент запуска.
+    Имена файлов каждой директории хранятся в памяти и обновляются по событиям и по переименованиям,
+    сделанным самой программой (см. renamed), поэтому для поиска коллизий директории повторно не сканируются.
+    """
+    def __init__(self, root_dir_path: str, is_recursion: bool = False, path_filter: PathFilter | None = None,
+                 settle_time: float = 2.0, poll_interval: float = 1.0, use_inotify: bool = True):
+        """
+        :param settle_time: Сколько секунд размер и время изменения файла не должны меняться
+        :param poll_interval: Сколько секунд ждать событий за один раз. Без inotify - период пересканирования
+        :param use_inotify: Если False, то изменения всегда находятся пересканированием
+
+        Исключения:
+         - FileNotFoundError   директория не существует
+        """
+        self.__root_dir_path = os.path.abspath(root_dir_path)
+        self.__prefix_length = len(os.path.join(self.__root_dir_path, ''))
+        self.__is_recursion = is_recursion
+        self.__filter = path_filter
+        self.__settle_time = settle_time
+        self.__poll_interval = poll_interval
+        # Директория -> множество имён её файлов, в том числе пропущенных фильтром
+        self.__names = dict()
+        # Путь файла -> None или ((размер, время изменения), когда они были замечены впервые)
+        self.__pending = dict()
+        # Собственные переименования уже учтены в renamed(), поэтому события о них нужно пропустить:
+        # путь -> сколько событий о появлении (для новых имён) или исчезновении (для старых) файла осталось.
+        # В цепочке одно и то же имя сначала освобождается, а потом занимается снова, поэтому счётчики раздельные
+        self.__own_added = dict()
+        self.__own_removed = dict()
+
+        self.__backend = None
+        if use_inotify:
+            try:
+                self.__backend = InotifyBackend()
+            except OSError:
+                ...
+        if self.__backend is None:
+            self.__backend = PollingBackend()
+        try:
+            self.__scan(self.__root_dir_path, dict())
+        except OSError:
+            self.__backend.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.__backend.close()
+
+    @property
+    def is_inotify(self) -> bool:
+        return isinstance(self.__backend, InotifyBackend)
+
+    def names_in_dir(self, dirname: str) -> set:
+        """
+        Возвращает множество имён файлов, находящихся в директории dirname.
+        """
+        return self.__names.setdefault(dirname, set())
+
+    def renamed(self, old_item: str, new_item: str) -> None:
+        """
+        Учитывает переименование, сделанное программой. Подходит в качестве on_rename для RenameExecutor.
+        """
+        old_dirname, old_name = os.path.split(old_item)
+        new_dirname, new_name = os.path.split(new_item)
+        self.names_in_dir(old_dirname).discard(old_name)
+        self.names_in_dir(new_dirname).add(new_name)
+        self.__pending.pop(old_item, None)
+        self.__own_removed[old_item] = self.__own_removed.get(old_item, 0) + 1
+        self.__own_added[new_item] = self.__own_added.get(new_item, 0) + 1
+
+    def batches(self, stop=None):
+        """
+        Отдаёт пачки готовых файлов, пока не будет установлено событие stop (threading.Event).
+        """
+        while stop is None or not stop.is_set():
+            batch = self.poll(min(self.__poll_interval, self.__settle_time / 2) if self.__pending
+                              else self.__poll_interval)
+            if batch:
+                yield batch
+
+    def poll(self, timeout: float) -> dict:
+        """
+        Ждёт событий не дольше timeout секунд, учитывает их и возвращает пачку готовых файлов (возможно, пустую).
+        """
+        for kind, path, is_dir in self.__backend.read(timeout):
+            if kind == 'rescan':
+                self.__scan(self.__root_dir_path, self.__names)
+            elif kind == 'removed':
+                self.__remove(path, is_dir)
+            elif is_dir:
+                self.__add_dir(path)
+            else:
+                self.__add_file(path)
+        return self.__collect()
+
+    def __scan(self, start_dir_path: str, known: dict) -> None:
+        """
+        Сканирует дерево, начиная с start_dir_path, и начинает следить за его директориями.
+        В очередь на проверку попадают файлы, которых нет в known (директория -> множество имён).
+        """
+        if start_dir_path == self.__root_dir_path:
+            self.__names = dict()
+            self.__own_added.clear()
+            self.__own_removed.clear()
+        walker = DirectoryWalker(self.__root_dir_path, self.__is_recursion, path_filter=self.__filter,
+                                 start_dir_path=start_dir_path)
+        for dirname, entries, skipped in walker:
+            self.__backend.add(dirname)
+            known_names = known.get(dirname, ())
+            names = self.names_in_dir(dirname)
+            names.update(skipped)
+            for entry in entries:
+                names.add(entry.name)
+                if entry.name not in known_names:
+                    self.__pending.setdefault(entry.path, None)
+
+    def __add_dir(self, path: str) -> None:
+        if not self.__is_recursion:
+            return
+        relative_path = path[self.__prefix_length:].replace(os.sep, '/')
+        if self.__filter is not None and \
+                not self.__filter.is_dir_allowed(relative_path, os.path.basename(path), relative_path.count('/') + 1):
+            return
+        self.__scan(path, dict())
+
+    def __add_file(self, path: str) -> None:
+        if self.__consume(self.__own_added, path):
+            return
+        dirname, name = os.path.split(path)
+        self.names_in_dir(dirname).add(name)
+        if self.__filter is None or self.__filter.is_file_allowed(path[self.__prefix_length:].replace(os.sep, '/'),
+                                                                  name):
+            # Файл изменился: время ожидания отсчитывается заново
+            self.__pending[path] = None
+
+    def __remove(self, path: str, is_dir: bool) -> None:
+        if is_dir:
+            prefix = os.path.join(path, '')
+            for dirname in [dirname for dirname in self.__names if dirname == path or dirname.startswith(prefix)]:
+                del self.__names[dirname]
+            for item in [item for item in self.__pending if item.startswith(prefix)]:
+                del self.__pending[item]
+            return
+        if self.__consume(self.__own_removed, path):
+            return
+        dirname, name = os.path.split(path)
+        self.names_in_dir(dirname).discard(name)
+        self.__pending.pop(path, None)
+
+    @staticmethod
+    def __consume(own: dict, path: str) -> bool:
+        """
+        Возвращает True и уменьшает счётчик, если событие о пути path вызвано собственным переименованием.
+        """
+        if path not in own:
+            return False
+        own[path] -= 1
+        if not own[path]:
+            del own[path]
+        return True
+
+    def __collect(self) -> dict:
+        """
+        Проверяет файлы из очереди и забирает из неё те, запись которых закончилась.
+        """
+        now = monotonic()
+        ready = dict()
+        for path, state in list(self.__pending.items()):
+            try:
+                stat_result = os.stat(path)
+            except OSError:
+                del self.__pending[path]
+                continue
+            if not stat.S_ISREG(stat_result.st_mode):
+                del self.__pending[path]
+                continue
+            signature = (stat_result.st_size, stat_result.st_mtime_ns)
+            if state is None or state[0] != signature:
+                self.__pending[path] = (signature, now)
+            elif now - state[1] >= self.__settle_time:
+                del self.__pending[path]
+                ready.setdefault(os.path.dirname(path), list()).append(WatchedFile(path, stat_result))
+        for files in ready.values():
+            files.sort(key=lambda item: item.name)
+        return dict(sorted(ready.items()))
@@ -1,7 +1,5 @@
 from dataclasses import dataclass
 
-import click
-
 
 @dataclass
 class FieldBasic:
@@ -10,9 +8,34 @@ class FieldBasic:
     """
     root_path: str
     is_recursion: bool = False
+    is_incremental: bool = False
+    settle_time: float = 2.0
+    poll_interval: float = 1.0
+    include: tuple = ()
+    exclude: tuple = ()
+    max_depth: int | None = None
     is_unique_name: bool = False
     suffix_for_unique_name: str = ' (copy)'
+    unique_style: str = 'copy'
     template_datetime_for_new_file: str = '%Y%m%d_%H%M%S'
+    jobs: int = 1
+    processes: int = 1
+    probe_workers: int = 4
+    cache_path: str | None = None
+    cache_size: int = 1_000_000
+    plan_out: str | None = None
+    journal_path: str | None = None
+    journal_sync: int = 1000
+    output_format: str = 'text'
+    is_quiet: bool = False
+    is_summary_only: bool = False
+    is_async: bool = False
+    in_flight: int = 64
+    queue_size: int = 4
+    is_stats: bool = False
+    trace_path: str | None = None
+    trace_sample: int = 10
+    trace_slow_ms: float = 10
 
     def __post_init__(self):
         """
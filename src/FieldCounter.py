@@ -8,3 +8,4 @@ class FieldCounter:
     """
     _renamed_qty: int = 0
     _failed_qty: int = 0
+    _unchanged_qty: int = 0
@@ -12,6 +12,9 @@ class FieldTextString:
         'SUCCESS': (_style_ok +
                     click.style('{0} -> ', bold=True, fg='black') +
                     click.style('{1}', bold=True, fg='green')),
+        'UNCHANGED': (_style_ok +
+                      click.style('{0}', bold=True, fg='black') +
+                      click.style(' уже назван по шаблону.')),
         'FILE_EXISTS': (__style_fail +
                         click.style('{0}', bold=True, fg='black') +
                         click.style(' невозможно переименовать, ') +
@@ -29,8 +32,21 @@ class FieldTextString:
         'INCORRECT_EXIF': (__style_fail +
                            click.style('{0}', bold=True, fg='black') +
                            click.style(' невозможно переименовать. Не получилось прочитать EXIF-данные.')),
+        'FILE_CHANGED': (__style_fail +
+                         click.style('{0}', bold=True, fg='black') +
+                         click.style(' невозможно переименовать. Файл изменился после построения плана.')),
     }
+    # Те же шаблоны без ANSI-кодов - для вывода не в терминал
+    message_code_plain: dict = {code: click.unstyle(template) for code, template in message_code.items()}
 
-    __dir_not_exist = (__style_fail + click.style('Директория ', fg='white') +
+    _dir_not_exist = (__style_fail + click.style('Директория ', fg='white') +
+                      click.style('{0}', bold=True, fg='black') +
+                      click.style(' не существует.', fg='white'))
+
+    _plan_incorrect = (__style_fail + click.style('Файл ', fg='white') +
                        click.style('{0}', bold=True, fg='black') +
-                       click.style(' не существует.', fg='white'))
\ No newline at end of file
+                       click.style(' не является планом переименования.', fg='white'))
+
+    _journal_incorrect = (__style_fail + click.style('Не удалось прочитать журнал ', fg='white') +
+                          click.style('{0}', bold=True, fg='black') +
+                          click.style('.', fg='white'))
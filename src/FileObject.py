@@ -1,52 +1,194 @@
 import os
+from array import array
+
+from src.DirectoryWalker import DirectoryWalker
 
 
 class FileObject:
-    def __init__(self, root_dir_path: str = '.', is_recursion: bool = False):
-        self.__files = list()
+    """
+    Список файлов директории с хеш-индексами.
+    Директории сканируются лениво, по мере обхода, поэтому обработка файлов может начинаться
+    до того, как закончится сканирование всего дерева.
+    Методы, которым нужен весь список целиком (__len__, __getitem__), досканируют его до конца,
+    а проверки и изменения элементов - до директории, в которой находится элемент.
+
+    Полные адреса файлов не хранятся: адрес каждой директории записывается один раз в таблицу директорий,
+    а для файла хранятся только номер директории (в массиве array) и имя. Полный адрес собирается,
+    только когда его запрашивают, поэтому на миллионах файлов общие начала адресов не дублируются в памяти.
+    """
+    # Позиция имён, которые заняты, но в список не входят, например пропущенных фильтром файлов
+    __NOT_IN_LIST = -1
+
+    def __init__(self, root_dir_path: str = '.', is_recursion: bool = False, tracer=None, path_filter=None,
+                 walker=None):
+        """
+        :param walker: Итерируемый объект с содержимым директорий в формате DirectoryWalker,
+                       который используется вместо обхода root_dir_path
+        """
+        # Таблица директорий: адрес директории по номеру и номер по адресу
+        self.__dirs = list()
+        self.__dir_ids = dict()
+        # Для каждой позиции в списке - номер директории и имя файла
+        self.__file_dirs = array('I')
+        self.__file_names = list()
+        # Для каждой директории - словарь {имя файла: позиция в списке}.
+        # Его ключи - все занятые имена директории, поэтому отдельное множество имён не нужно.
+        self.__positions = list()
         self.__is_recursion = is_recursion
         self.__root_dir_path = root_dir_path
 
-        self.__scan_of_dir(root_dir_path)
+        if walker is None:
+            walker = DirectoryWalker(root_dir_path, is_recursion, tracer, path_filter)
+        self.__walker = iter(walker)
+        self.__is_scanned = False
 
     def __len__(self):
-        return len(self.__files)
+        self.__scan_all()
+        return len(self.__file_names)
 
     def __getitem__(self, position):
-        return self.__files[position]
+        self.__scan_all()
+        if isinstance(position, slice):
+            return [self.__full_name(index) for index in range(*position.indices(len(self.__file_names)))]
+        if position < 0:
+            position += len(self.__file_names)
+        if not 0 <= position < len(self.__file_names):
+            raise IndexError('list index out of range')
+        return self.__full_name(position)
 
     def __setitem__(self, key, value):
-        self.__files[key] = value
+        self.update(self[key], value)
+
+    def __contains__(self, item: str) -> bool:
+        dirname, basename = os.path.split(item)
+        self.__scan_until(dirname)
+        return basename in self.__positions_in_dir(dirname)
+
+    def __iter__(self):
+        """
+        Отдаёт абсолютные адреса файлов, при необходимости досканируя очередную директорию.
+        """
+        position = 0
+        while True:
+            while position < len(self.__file_names):
+                yield self.__full_name(position)
+                position += 1
+            if self.__scan_next_dir() is None:
+                return
 
     def __repr__(self):
         return f'Files of directory {self.__root_dir_path}'
 
-    def __scan_of_dir(self, current_dir: str):
-        with os.scandir(current_dir) as files:
-            for file in files:
-                filename_full = os.path.abspath(os.path.join(current_dir, file))
+    def iter_entries(self):
+        """
+        Сканирует директории и отдаёт файлы в виде os.DirEntry, чтобы можно было
+        использовать закэшированные в них тип файла и результат stat().
+        Может быть вызван только до начала сканирования любым другим способом.
+        """
+        if self.__file_names:
+            raise RuntimeError('Сканирование директорий уже начато')
+        while (entries := self.__scan_next_dir()) is not None:
+            yield from entries
+
+    def __scan_next_dir(self) -> list | None:
+        """
+        Сканирует очередную директорию и добавляет её файлы в индекс.
+        Возвращает список os.DirEntry этих файлов или None, если сканирование закончено.
+        """
+        if self.__is_scanned:
+            return None
+        try:
+            dirname, entries, skipped = next(self.__walker)
+        except StopIteration:
+            self.__is_scanned = True
+            return None
 
-                if self.__is_recursion and file.is_dir():
-                    self.__files.append(self.__scan_of_dir(filename_full))
-                if file.is_file():
-                    self.__files.append(filename_full)
-        self.__files = sorted(self.__files)
+        dir_id = self.__dir_id(dirname)
+        positions = self.__positions[dir_id]
+        # Пропущенные фильтром файлы в список не попадают, но их имена заняты
+        for name in skipped:
+            positions.setdefault(name, self.__NOT_IN_LIST)
+        for entry in entries:
+            positions[entry.name] = len(self.__file_names)
+            self.__file_dirs.append(dir_id)
+            self.__file_names.append(entry.name)
+        return entries
+
+    def __scan_all(self) -> None:
+        while self.__scan_next_dir() is not None:
+            ...
+
+    def __scan_until(self, dirname: str) -> None:
+        """
+        Сканирует директории, пока среди отсканированных не окажется dirname.
+        """
+        while dirname not in self.__dir_ids and self.__scan_next_dir() is not None:
+            ...
+
+    def __dir_id(self, dirname: str) -> int:
+        """
+        Возвращает номер директории в таблице директорий, при необходимости добавляя её туда.
+        """
+        dir_id = self.__dir_ids.get(dirname)
+        if dir_id is None:
+            dir_id = len(self.__dirs)
+            self.__dirs.append(dirname)
+            self.__dir_ids[dirname] = dir_id
+            self.__positions.append(dict())
+        return dir_id
+
+    def __positions_in_dir(self, dirname: str) -> dict:
+        dir_id = self.__dir_ids.get(dirname)
+        return self.__positions[dir_id] if dir_id is not None else dict()
+
+    def __full_name(self, position: int) -> str:
+        return os.path.join(self.__dirs[self.__file_dirs[position]], self.__file_names[position])
+
+    def names_in_dir(self, dirname: str):
+        """
+        Возвращает множество имён файлов, находящихся в директории dirname.
+        Это ключи словаря (dict_keys): они поддерживают проверку 'in' и операции над множествами
+        и отражают последующие изменения списка.
+        """
+        self.__scan_until(dirname)
+        return self.__positions_in_dir(dirname).keys()
 
     def index(self, item: str) -> int:
         """
         Возвращает индекс элемента item в списке.
         """
-        return self.__files.index(item)
+        dirname, basename = os.path.split(item)
+        self.__scan_until(dirname)
+        position = self.__positions_in_dir(dirname).get(basename, self.__NOT_IN_LIST)
+        if position == self.__NOT_IN_LIST:
+            raise ValueError(f'{item} is not in list')
+        return position
 
     def append(self, item: str) -> None:
         """
         Добавляет новый элемент item в список.
         """
-        self.__files.append(item)
+        dirname, basename = os.path.split(item)
+        self.__scan_until(dirname)
+        dir_id = self.__dir_id(dirname)
+        positions = self.__positions[dir_id]
+        if positions.get(basename, self.__NOT_IN_LIST) != self.__NOT_IN_LIST:
+            return
+        positions[basename] = len(self.__file_names)
+        self.__file_dirs.append(dir_id)
+        self.__file_names.append(basename)
 
     def update(self, old_item: str, new_item: str) -> None:
         """
         Заменяет old_item на new_item.
         """
-        index = self.index(old_item)
-        self.__files[index] = new_item
+        position = self.index(old_item)
+        new_dirname, new_basename = os.path.split(new_item)
+        self.__scan_until(new_dirname)
+
+        old_dirname, old_basename = os.path.split(old_item)
+        del self.__positions[self.__dir_ids[old_dirname]][old_basename]
+        dir_id = self.__dir_id(new_dirname)
+        self.__positions[dir_id][new_basename] = position
+        self.__file_dirs[position] = dir_id
+        self.__file_names[position] = new_basename
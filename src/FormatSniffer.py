@@ -0,0 +1,70 @@
+class FormatSniffer:
+    """
+    Определяет формат файла по первым байтам (сигнатуре), не полагаясь на расширение.
+
+    Виды файлов:
+     - jpeg     - JPEG
+     - tiff     - TIFF и основанные на нём RAW-форматы (CR2, NEF, ARW, DNG и др.)
+     - png      - PNG
+     - webp     - WebP
+     - heif     - HEIF/HEIC
+ - avif     - AVIF
+     - iso-bmff - MP4, MOV, 3GP и другие контейнеры ISO Base Media File Format
+     - video    - остальные видеоконтейнеры, которые читает только ffprobe (Matroska, AVI, MPEG-TS и др.)
+    Для всех остальных файлов возвращается None: такие файлы не открываются ни PIL, ни ffprobe.
+    """
+    # Сколько байт нужно прочитать из начала файла. MPEG-TS распознаётся по трём пакетам по 188 байт.
+    HEADER_SIZE = 512
+
+    __TIFF_PREFIXES = (b'II*\x00', b'MM\x00*', b'II+\x00', b'MM\x00+')
+    __HEIF_BRANDS = frozenset((b'heic', b'heix', b'hevc', b'hevx', b'heim', b'heis', b'hevm', b'hevs',
+                               b'mif1', b'msf1'))
+    __AVIF_BRANDS = frozenset((b'avif', b'avis'))
+    # Типы боксов, с которых может начинаться QuickTime-файл без 'ftyp'
+    __QUICKTIME_BOXES = frozenset((b'moov', b'mdat', b'wide', b'free', b'skip', b'pnot'))
+    __VIDEO_PREFIXES = (
+        b'\x1a\x45\xdf\xa3',                    # Matroska, WebM
+        b'\x30\x26\xb2\x75\x8e\x66\xcf\x11',    # ASF, WMV
+        b'\x00\x00\x01\xba',                    # MPEG-PS
+        b'\x00\x00\x01\xb3',                    # MPEG-1/2 video
+        b'FLV\x01',                             # Flash Video
+    )
+    __TS_PACKET = 188
+
+    @classmethod
+    def sniff(cls, header: bytes) -> str | None:
+        """
+        :param header: Первые HEADER_SIZE байт файла (или весь файл, если он короче)
+        :return: Вид файла или None, если формат не распознан
+        """
+        if header.startswith(b'\xff\xd8\xff'):
+            return 'jpeg'
+        if header[:4] in cls.__TIFF_PREFIXES:
+            return 'tiff'
+        if header.startswith(b'\x89PNG\r\n\x1a\n'):
+            return 'png'
+        if header.startswith(b'RIFF'):
+            return {b'WEBP': 'webp', b'AVI ': 'video'}.get(header[8:12])
+        box_type = header[4:8]
+        if box_type == b'ftyp':
+            brand = header[8:12]
+            if brand in cls.__AVIF_BRANDS:
+                return 'avif'
+            return 'heif' if brand in cls.__HEIF_BRANDS else 'iso-bmff'
+        if box_type in cls.__QUICKTIME_BOXES:
+            return 'iso-bmff'
+        if header.startswith(cls.__VIDEO_PREFIXES) or cls.__is_transport_stream(header):
+            return 'video'
+        return None
+
+    @classmethod
+    def __is_transport_stream(cls, header: bytes) -> bool:
+        """
+        MPEG-TS (.ts) - пакеты по 188 байт, каждый начинается с 0x47.
+        M2TS (.mts, .m2ts) - перед каждым пакетом ещё 4 байта временной метки.
+        """
+        for offset, packet_size in ((0, cls.__TS_PACKET), (4, cls.__TS_PACKET + 4)):
+            positions = range(offset, len(header), packet_size)
+            if len(positions) >= 2 and all(header[position] == 0x47 for position in positions):
+                return True
+        return False
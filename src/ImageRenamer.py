@@ -1,21 +1,34 @@
+import dataclasses
 import os
-from os.path import isfile
-from datetime import datetime
-
-import PIL
-from PIL import Image
-from pillow_heif import register_heif_opener
-
-import click
-import ffmpeg
+from contextlib import contextmanager, nullcontext
+from functools import partial
+from itertools import groupby
+from operator import itemgetter
+from time import perf_counter
 
+from src.CodecLoader import CodecLoader
+from src.DatetimeParser import DatetimeParser
+from src.DirectoryWalker import DirectoryWalker
 from src.FieldBasic import FieldBasic
 from src.FieldCounter import FieldCounter
 from src.FileObject import FileObject
-from src.ProjectException import FileDoesntHaveExif
+from src.FormatSniffer import FormatSniffer
+from src.IsoBmffReader import IsoBmffReader
+from src.JpegExifReader import JpegExifReader
+from src.ProjectException import FileDoesntHaveExif, UnsupportedFormat
+from src.RenameExecutor import RenameExecutor
+from src.RenameJournal import RenameJournal
+from src.RenamePlanner import RenamePlan, RenamePlanner
+from src.RenameResult import RenameResult
+from src.RunStatistics import RunStatistics
+from src.TemplateMatcher import TemplateMatcher
+from src.Tracer import NullTracer, Tracer
+from src.VideoProbe import VideoProbe
 from src.FieldTextString import FieldTextString
-
-register_heif_opener()
+from src.OutputWriter import OutputWriter
+from src.PathFilter import PathFilter
+from src.PlanFile import PlanReader, PlanWriter
+from src.WorkerPool import WorkerPool
 
 
 class ImageRenamer(FieldBasic, FieldCounter, FieldTextString):
@@ -26,162 +39,528 @@ class ImageRenamer(FieldBasic, FieldCounter, FieldTextString):
     def rename(self, preview: bool = False) -> None:
         """
         :param preview: Если True, то будет выведен виртуальный результат переименования, но без переименования.
+                        Если указан plan_out, то файлы тоже не переименовываются, а план записывается в файл.
         :return: None
         """
+        with self.__open_output():
+            if self.processes > 1:
+                self.__rename_sharded(preview)
+            else:
+                self.__rename(preview)
+            self.__print_statistics()
+
+    def __rename(self, preview: bool) -> None:
         try:
-            # Соглашение по именованию переменных
-            # *_full - абсолютный адрес файла, например /home/user/folder/a.jpg
-            # *_local - локальный адрес файла относительно корневой директории, например folder/a.jpg
-            # *_short - имя файла, например a.jpg
-            file_objects = FileObject(self.root_path, self.is_recursion)
-            for old_filename_full in file_objects:
-                old_filename_local = self.__get_local_name_from_full(old_filename_full)
+            self.__rename_files(preview)
+            self.__output.summary(self._renamed_qty, self._failed_qty, self._unchanged_qty)
+        except FileNotFoundError:
+            self.__output.error('DIR_NOT_EXISTS', self._dir_not_exist, self.root_path)
+
+    def __rename_files(self, preview: bool, walker=None) -> None:
+        """
+        Переименовывает файлы всех директорий, которые отдаёт 'walker', по-умолчанию - DirectoryWalker для root_path,
+        и выводит результаты.
+        """
+        if not self.is_async:
+            for plan, _ in self.__iter_plans(preview, walker):
+                self.__report(plan)
+            return
+
+        from src.AsyncPipeline import AsyncPipeline
+        with self.__open_session(preview, is_async=True) as (_, _, process_directory):
+            AsyncPipeline(DirectoryWalker(self.root_path, self.is_recursion, self.__tracer, self.__path_filter),
+                          self.__extract_new_filename,
+                          lambda dirname, names, results: self.__report(process_directory(dirname, names, results)),
+                          self.in_flight, self.queue_size, self.statistics.phases).run()
+
+    def __iter_plans(self, preview: bool, walker=None):
+        """
+        Переименовывает файлы директорий, которые отдаёт 'walker', по-умолчанию - DirectoryWalker для root_path.
+        После каждой директории отдаёт кортеж (выполненный план, результаты __extract_new_filename в порядке плана).
+        """
+        timer = self.statistics.phases
+        with self.__open_session(preview, walker) as (file_objects, pool, process_directory):
+            entries = self.__video_probe.prefetching(timer.measure_iter('scan', file_objects.iter_entries()),
+                                                     is_skipped=self.__is_prefetch_skipped)
+            extracted = timer.measure_iter('extract', pool.map(self.__extract_new_filename, entries))
+            for dirname, results in groupby(extracted, key=itemgetter(0)):
+                results = list(results)
+                yield process_directory(dirname, file_objects.names_in_dir(dirname), results), results
+
+    @contextmanager
+    def __open_session(self, preview: bool, walker=None, is_async: bool = False):
+        """
+        Открывает всё, что нужно для переименования дерева, и отдаёт кортеж (FileObject или None в режиме asyncio,
+        пул потоков, функция (директория, имена файлов, результаты __extract_new_filename) -> выполненный план).
+        """
+        # Соглашение по именованию переменных
+        # *_full - абсолютный адрес файла, например /home/user/folder/a.jpg
+        # *_local - локальный адрес файла относительно корневой директории, например folder/a.jpg
+        # *_short - имя файла, например a.jpg
+        self.__tracer = self.__open_tracer()
+        self.__path_filter = PathFilter(self.include, self.exclude, self.max_depth)
+        file_objects = None if is_async else FileObject(self.root_path, self.is_recursion, self.__tracer,
+                                                        self.__path_filter, walker)
+        planner = RenamePlanner(self.is_unique_name, self.suffix_for_unique_name, self.unique_style)
+        self.__datetime_parser = DatetimeParser(self.template_datetime_for_new_file)
+        self.__template_matcher = self.__create_template_matcher()
+        with self.__tracer, \
+                WorkerPool(self.jobs) as pool, \
+                VideoProbe(self.probe_workers) as self.__video_probe, \
+                self.__open_cache() as self.__cache, \
+                self.__open_plan_writer() as plan_writer, \
+                self.__open_journal() as journal:
+            executor = RenameExecutor(preview or bool(self.plan_out),
+                                      on_rename=file_objects.update if file_objects is not None else None,
+                                      journal=journal, tracer=self.__tracer)
+
+            # Первая фаза - получение новых имён и построение плана, вторая - его выполнение.
+            # Коллизии возможны только внутри одной директории, поэтому план строится для каждой директории
+            # отдельно, как только получены новые имена всех её файлов.
+            yield file_objects, pool, partial(self.__process_directory, planner, executor, plan_writer)
+
+    def iter_results(self, preview: bool = False):
+        """
+        Программный интерфейс: переименовывает файлы так же, как rename(), но ничего не выводит,
+        а отдаёт результат обработки каждого файла (RenameResult) сразу после обработки его директории.
+        Результаты не накапливаются, поэтому потребление памяти не зависит от количества файлов.
+        Счётчики и statistics обновляются так же, как и при rename(). Конвейер на asyncio не используется.
+        :param preview: Если True, то файлы не переименовываются
+
+        Исключения:
+         - FileNotFoundError   директория root_path не существует
+        """
+        self.statistics = RunStatistics()
+        for plan, results in self.__iter_plans(preview):
+            dirname = plan.dirname
+            for planned, result in zip(plan.renames, results):
+                self.__count(planned.code)
+                yield RenameResult(os.path.join(dirname, planned.old_name),
+                                   os.path.join(dirname, planned.new_name) if planned.new_name is not None else None,
+                                   planned.code, result[4], result[5])
+        self.statistics.finish()
+
+    def plan(self):
+        """
+        Отдаёт результаты так же, как iter_results(), но не переименовывает файлы.
+        """
+        return self.iter_results(preview=True)
+
+    def __rename_sharded(self, preview: bool) -> None:
+        """
+        Переименовывает файлы в нескольких процессах (см. ShardedRun) и выводит объединённые итоговые счётчики.
+        """
+        if not os.path.isdir(self.root_path):
+            self.__output.error('DIR_NOT_EXISTS', self._dir_not_exist, self.root_path)
+            return
+        from src.ShardedRun import ShardedRun
+
+        fields = {field.name: getattr(self, field.name) for field in dataclasses.fields(FieldBasic)}
+        fields['processes'] = 1
+        for report in ShardedRun(fields, self.processes, preview).run(self.__output):
+            self._renamed_qty += report['renamed']
+            self._failed_qty += report['failed']
+            self._unchanged_qty += report['unchanged']
+            self.statistics.merge(report['statistics'])
+        self.__output.summary(self._renamed_qty, self._failed_qty, self._unchanged_qty)
+
+    def rename_shard(self, walker, stream, preview: bool = False) -> dict:
+        """
+        Переименовывает файлы директорий, которые отдаёт 'walker' (в формате DirectoryWalker),
+        и записывает вывод в поток 'stream'. Используется процессами-обработчиками ShardedRun:
+        итоговые счётчики не выводятся, а возвращаются вместе со статистикой.
+        :return: Словарь {'renamed': ..., 'failed': ..., 'unchanged': ..., 'statistics': RunStatistics.as_dict()}
+        """
+        self.__output = OutputWriter(self.output_format, self.is_quiet, self.is_summary_only, stream)
+        self.statistics = RunStatistics()
+        with self.__output:
+            self.__rename_files(preview, walker)
+        self.statistics.finish()
+        return {'renamed': self._renamed_qty, 'failed': self._failed_qty, 'unchanged': self._unchanged_qty,
+                'statistics': self.statistics.as_dict()}
+
+    def __process_directory(self, planner: RenamePlanner, executor: RenameExecutor, plan_writer,
+                            dirname: str, names: set, results: list) -> RenamePlan:
+        """
+        Строит план переименования директории по результатам __extract_new_filename и выполняет его.
+        """
+        timer = self.statistics.phases
+        with timer.measure('plan'), self.__tracer.span('plan', 'plan', dir=dirname):
+            plan = planner.plan(dirname, names, (result[1:4] for result in results))
+            if plan_writer is not None:
+                plan_writer.write(plan)
+        with timer.measure('apply'):
+            executor.execute(plan)
+        return plan
+
+    def watch(self, preview: bool = False, stop=None) -> None:
+        """
+        Следит за директорией и переименовывает файлы по мере их появления, пока не будет нажато Ctrl+C
+        или не будет установлено событие 'stop' (threading.Event).
+        Сначала обрабатываются файлы, которые уже есть в директории, затем - новые, как только закончится их запись.
+        Файлы обрабатываются пачками, дерево директорий повторно не сканируется.
+        :param preview: Если True, то будет выведен виртуальный результат переименования, но без переименования.
+        :param stop: Событие, по которому наблюдение заканчивается
+        :return: None
+        """
+        with self.__open_output():
+            self.__watch(preview, stop)
+            self.__print_statistics()
+
+    def __watch(self, preview: bool, stop) -> None:
+        from src.DirectoryWatcher import DirectoryWatcher
+        try:
+            self.__tracer = self.__open_tracer()
+            path_filter = PathFilter(self.include, self.exclude, self.max_depth)
+            planner = RenamePlanner(self.is_unique_name, self.suffix_for_unique_name, self.unique_style)
+            self.__datetime_parser = DatetimeParser(self.template_datetime_for_new_file)
+            self.__template_matcher = self.__create_template_matcher()
+            timer = self.statistics.phases
+            with DirectoryWatcher(self.root_path, self.is_recursion, path_filter,
+                                  self.settle_time, self.poll_interval) as watcher, \
+                    self.__tracer, \
+                    WorkerPool(self.jobs) as pool, \
+                    VideoProbe(self.probe_workers) as self.__video_probe, \
+                    self.__open_cache() as self.__cache, \
+                    self.__open_journal() as journal:
+                # В режиме предпросмотра файлы остаются на месте, поэтому имена в памяти не меняются
+                executor = RenameExecutor(preview, on_rename=None if preview else watcher.renamed,
+                                          journal=journal, tracer=self.__tracer)
                 try:
-                    new_filename_full = self.__get_new_filename(old_filename_full)
-                except FileNotFoundError:
-                    self.__print_message(self.message_code['FILE_NOT_EXISTS'], old_filename_local)
-                    self._failed_qty += 1
-                    continue
-                except (FileDoesntHaveExif, KeyError):
-                    self.__print_message(self.message_code['FILE_DOESNT_HAVE_EXIF'], old_filename_local)
-                    self._failed_qty += 1
-                    continue
-                except PermissionError:
-                    self.__print_message(self.message_code['PERMISSION_DENIED'], old_filename_local)
-                    self._failed_qty += 1
-                    continue
-                except ValueError:
-                    self.__print_message(self.message_code['INCORRECT_EXIF'], old_filename_local)
-                    self._failed_qty += 1
-                    continue
+                    for batch in watcher.batches(stop):
+                        for dirname, files in batch.items():
+                            results = list(timer.measure_iter('extract', pool.map(self.__extract_new_filename, files)))
+                            self.__report(self.__process_directory(planner, executor, None,
+                                                                   dirname, watcher.names_in_dir(dirname), results))
+                        self.__output.flush()
+                except KeyboardInterrupt:
+                    ...
 
-                # Если файл с таким именем уже существует в директории, то в зависимости от настроек
-                # либо подбираем уникальное имя, либо пишем, что невозможно переименовать, и идём дальше.
-                if new_filename_full in file_objects:
-                    if self.is_unique_name:
-                        new_filename_full = self.__make_unique_filename(new_filename_full)
-                    else:
-                        self._failed_qty += 1
-                        self.__print_message(self.message_code['FILE_EXISTS'],
-                                             self.__get_local_name_from_full(old_filename_full),
-                                             self.__get_local_name_from_full(new_filename_full))
-                        continue
+            self.__output.summary(self._renamed_qty, self._failed_qty, self._unchanged_qty)
+        except FileNotFoundError:
+            self.__output.error('DIR_NOT_EXISTS', self._dir_not_exist, self.root_path)
+
+    def apply_plan(self, plan_path: str) -> None:
+        """
+        Выполняет план, записанный ранее с помощью plan_out, не открывая сами файлы.
+        Перед переименованием проверяется только то, что размер и время изменения файла совпадают с записанными.
+        Имена, которые оказались заняты после построения плана, обрабатываются так же, как и при обычном запуске.
+        :param plan_path: Путь к файлу плана
+        :return: None
+        """
+        with self.__open_output():
+            try:
+                reader = PlanReader(plan_path)
+            except (OSError, ValueError):
+                self.__output.error('PLAN_INCORRECT', self._plan_incorrect, plan_path)
+                return
+            self.__apply_plan(reader)
+            self.__print_statistics()
+
+    def __apply_plan(self, reader: PlanReader) -> None:
+        planner = RenamePlanner(self.is_unique_name, self.suffix_for_unique_name, self.unique_style)
+        self.__tracer = self.__open_tracer()
+        with reader, self.__tracer, self.__open_journal() as journal:
+            executor = RenameExecutor(journal=journal, tracer=self.__tracer)
+            self.root_path = reader.root_path
+            timer = self.statistics.phases
+            for dirname, operations in reader:
+                with timer.measure('scan'):
+                    extracted = list()
+                    for old_name, new_name, size, mtime_ns in operations:
+                        error_code = self.__check_fingerprint(os.path.join(dirname, old_name), size, mtime_ns)
+                        extracted.append((old_name, None if error_code else new_name, error_code))
+                    try:
+                        names = {entry.name for _, entries, _ in DirectoryWalker(dirname) for entry in entries}
+                    except FileNotFoundError:
+                        names = set()
+                with timer.measure('plan'), self.__tracer.span('plan', 'plan', dir=dirname):
+                    plan = planner.plan(dirname, names, extracted)
+                with timer.measure('apply'):
+                    executor.execute(plan)
+                self.__report(plan)
+
+        self.__output.summary(self._renamed_qty, self._failed_qty)
+
+    def undo(self, journal_path: str) -> None:
+        """
+        Отменяет переименования, записанные в журнал, за один проход по журналу в обратном порядке.
+        Директории повторно не сканируются, EXIF-данные не читаются.
+        :param journal_path: Путь к журналу
+        :return: None
+        """
+        with self.__open_output():
+            self.__undo(journal_path)
+            self.__print_statistics()
 
-                if not preview:
+    def __undo(self, journal_path: str) -> None:
+        """
+        Отменяет переименования, записанные в журнал. Перемещение через временное имя при разрешении цикла
+        (см. RenamePlanner.TEMP_SUFFIX) выводится и учитывается в счётчиках как одно переименование.
+        """
+        # Временное имя -> адрес, который был у файла до перемещения на это имя
+        hops = dict()
+        try:
+            for source, destination in RenameJournal.undo_operations(journal_path):
+                with self.statistics.phases.measure('apply'):
                     try:
-                        os.rename(old_filename_full, new_filename_full)
+                        os.rename(source, destination)
                     except PermissionError:
-                        self.__print_message(self.message_code['PERMISSION_DENIED'], old_filename_full)
-                        continue
-
-                file_objects.update(old_filename_full, new_filename_full)
-                self._renamed_qty += 1
-                self.__print_message(self.message_code['SUCCESS'],
-                                     self.__get_local_name_from_full(old_filename_full),
-                                     self.__get_local_name_from_full(new_filename_full))
-
-            words = ['файлов', 'файл', 'файла', 'файла', 'файла', 'файлов', 'файлов', 'файлов', 'файлов', 'файлов']
-            self.__print_message(f'\nУспешно переименовано: {self._renamed_qty} '
-                                 f'{words[int(str(self._renamed_qty)[-1])]}', 'hi')
-            if self._failed_qty:
-                self.__print_message(f'Не удалось переименовать: {self._failed_qty} '
-                                     f'{words[int(str(self._failed_qty)[-1])]}', 'hi')
+                        error_code = 'PERMISSION_DENIED'
+                    except OSError:
+                        error_code = 'FILE_EXISTS'
+                    else:
+                        error_code = 'SUCCESS'
+
+                if error_code == 'SUCCESS' and destination.endswith(RenamePlanner.TEMP_SUFFIX):
+                    hops[destination] = hops.pop(source, source)
+                    continue
+                self.__report_undo(error_code, hops.pop(source, source), destination)
+        except OSError:
+            self.__output.error('JOURNAL_INCORRECT', self._journal_incorrect, journal_path)
+            return
+        # Файлы, которые остались на временном имени, потому что в журнале нет второй половины перемещения
+        for destination, source in hops.items():
+            self.__report_undo('SUCCESS', source, destination)
+
+        self.__output.summary(self._renamed_qty, self._failed_qty)
+
+    def __report_undo(self, code: str, source: str, destination: str) -> None:
+        self.__count(code)
+        self.__output.message(code, self.__get_local_name_from_full(source),
+                              self.__get_local_name_from_full(destination))
+
+    @staticmethod
+    def __check_fingerprint(filename: str, size: int, mtime_ns: int) -> str | None:
+        """
+        Проверяет, что файл не изменился после построения плана. Возвращает None или код ошибки.
+        """
+        try:
+            stat_result = os.stat(filename)
         except FileNotFoundError:
-            self.__print_message(self.__dir_not_exist, self.root_path)
+            return 'FILE_NOT_EXISTS'
+        except PermissionError:
+            return 'PERMISSION_DENIED'
+        if stat_result.st_size != size or stat_result.st_mtime_ns != mtime_ns:
+            return 'FILE_CHANGED'
+        return None
 
-    def __get_new_filename(self, filename) -> str | None:
+    def __open_output(self) -> OutputWriter:
         """
-        Возвращает новое имя для файла 'filename' на основе его EXIF-данных.
-        Если файл не содержит EXIF-данных, то возвращает None.
+        Создаёт объект для вывода результатов в соответствии с настройками пользователя.
         """
-        abs_dirpath = os.sep.join(filename.split(os.sep)[:-1])
-        new_filename = os.path.join(abs_dirpath, self.__get_datetime_from_exif(filename))
+        self.__output = OutputWriter(self.output_format, self.is_quiet, self.is_summary_only)
+        self.statistics = RunStatistics()
+        return self.__output
 
-        return new_filename
+    def __print_statistics(self) -> None:
+        """
+        Завершает сбор статистики и выводит её, если пользователь её запросил.
+        """
+        self.statistics.finish()
+        if self.is_stats:
+            self.__output.statistics(self.statistics.as_dict())
 
-    def __get_datetime_from_exif(self, filename: str) -> str | None:
+    def __create_template_matcher(self) -> TemplateMatcher | None:
         """
-        Пытается получить EXIF-данные из файла, указанного в 'filename'.
-        Это может быть изображение, тогда используется модуль PIL,
-        или видео, тогда используется модуль ffmpeg.
+        Создаёт объект для проверки имён файлов, если включён инкрементальный режим.
+        """
+        if self.is_incremental:
+            return TemplateMatcher(self.template_datetime_for_new_file, self.suffix_for_unique_name, self.unique_style)
+        return None
 
-        В случае успеха - возвращает форматированную строку, пригодную для нового имени файла.
-        Если EXIF-информации у файла нет, возвращает None.
+    def __open_journal(self):
+        """
+        Открывает журнал переименований, если пользователь указал путь к нему.
+        """
+        if self.journal_path:
+            return RenameJournal(self.journal_path, self.journal_sync)
+        return nullcontext()
 
-        Исключения:
-         - FileNotFoundError     файл не существует
-         - PermissionError       нет прав доступа к файлу
-         - FileDoesntHaveExif   'filename' не является изображением
-         - KeyError              нет ключа 306 в EXIF-данных
+    def __open_plan_writer(self):
         """
-        try:
-            image = Image.open(filename)
+        Открывает файл для записи плана переименования, если пользователь указал путь к нему.
+        """
+        if self.plan_out:
+            return PlanWriter(self.plan_out, self.root_path)
+        return nullcontext()
 
-            exifdata = image.getexif()[306]
-        except PIL.UnidentifiedImageError:
-            try:
-                exifdata = ffmpeg.probe(filename)['streams'][0]['tags']['creation_time']
-            except (KeyError, ffmpeg._run.Error):
-                raise FileDoesntHaveExif
+    def __open_tracer(self):
+        """
+        Создаёт объект для записи трассировки, если пользователь указал путь к ней.
+        """
+        if self.trace_path:
+            return Tracer(self.trace_path, self.trace_sample, self.trace_slow_ms)
+        return NullTracer()
 
-        old_format = self.__try_parsing_date(exifdata)
-        extension = os.path.splitext(filename)[1]
-        return self.__reformat_datetime(old_format) + f'{extension}'
+    def __open_cache(self):
+        """
+        Открывает кэш EXIF-данных, если пользователь указал путь к нему.
+        """
+        if self.cache_path:
+            from src.MetadataCache import MetadataCache
+            return MetadataCache(self.cache_path, self.cache_size)
+        return nullcontext()
 
-    @staticmethod
-    def __try_parsing_date(datetime_string):
+    def __extract_new_filename(self, entry: os.DirEntry) -> tuple:
         """
-        Проверяет 'datetime_string' на соответствие шаблонам.
-        В случае, если совпадение найдено, то возвращает объект типа Datetime.
+        Вычисляет новое имя для файла 'entry'.
+        Метод может выполняться в пуле потоков, поэтому он не меняет состояние объекта (кроме статистики),
+        а возвращает кортеж (директория, старое имя, новое имя, код ошибки, способ получения даты, время в секундах).
+        Если новое имя получить не удалось, то вместо него возвращается None, а код ошибки - ключ из message_code.
+        В инкрементальном режиме файлы, имя которых уже составлено по шаблону, не открываются:
+        их новым именем считается текущее, а способ получения даты - None.
+        """
+        dirname = os.path.dirname(entry.path)
+        if self.__template_matcher is not None and self.__template_matcher.matches(entry.name):
+            return dirname, entry.name, entry.name, None, None, 0.0
 
-        Исключения:
-         - ValueError   не получилось распознать дату и время в EXIF
-        """
-        datetimes_templates = ('%Y:%m:%d %H:%M:%S', '%Y.%m.%d %H:%M:%S', '%Y/%m/%d %H:%M:%S',
-                               '%Y/%d/%m %H:%M:%S', '%Y-%m-%dT%H:%M:%S.000000Z')
-        for template in datetimes_templates:
-            # strptime() возвращает ValueError в случае, если не получилось преобразовать строку в Datetime.
-            # Но так как нужно проверить все вариант шаблонов, но просто переходим к следующей итерции цикла.
-            # И только если совпадения небыли найдены - возвращает ValueError.
-            # Это будет означать, что данные в Datetime некорректные.
-            try:
-                return datetime.strptime(datetime_string, template)
-            except ValueError:
-                continue
-        raise ValueError()
+        started = perf_counter()
+        extractor = 'failure'
+        new_name = None
+        error_code = None
+        try:
+            exifdata, extractor = self.__get_datetime_from_exif(entry)
+            new_name = self.__datetime_parser.format(exifdata) + os.path.splitext(entry.name)[1]
+        except FileNotFoundError:
+            error_code = 'FILE_NOT_EXISTS'
+        except (FileDoesntHaveExif, KeyError):
+            error_code = 'FILE_DOESNT_HAVE_EXIF'
+        except PermissionError:
+            error_code = 'PERMISSION_DENIED'
+        except ValueError:
+            error_code = 'INCORRECT_EXIF'
+        finally:
+            # Если до ffprobe дело не дошло, например дата нашлась в кэше или файл оказался не видео,
+            # то запущенное заранее получение метаданных больше не нужно
+            self.__video_probe.discard(entry.path)
+        seconds = perf_counter() - started
+        self.statistics.record_extraction(extractor, seconds)
+        return dirname, entry.name, new_name, error_code, extractor, seconds
 
-    def __reformat_datetime(self, old_format: datetime) -> str:
+    def __is_prefetch_skipped(self, entry: os.DirEntry) -> bool:
         """
-        Возвращает строку с изменённым на основе шаблона форматом даты и времени.
+        Возвращает True для видеофайла, который не нужно заранее отправлять в ffprobe:
+        его имя уже составлено по шаблону (в инкрементальном режиме) или его дата уже есть в кэше.
         """
-        return datetime.strftime(old_format, self.template_datetime_for_new_file)
+        if self.__template_matcher is not None and self.__template_matcher.matches(entry.name):
+            return True
+        if self.__cache is None:
+            return False
+        try:
+            return self.__cache.contains(self.__cache.key(entry.stat()))
+        except OSError:
+            return True
 
-    @staticmethod
-    def __print_message(code: str, old_filename: str, new_filename: str = ''):
+    def __report(self, plan: RenamePlan) -> None:
         """
-        Выводит в консоль отформатированное сообщение.
+        Выводит в консоль результаты выполнения плана в порядке обхода файлов и обновляет счётчики.
+        Локальный адрес директории вычисляется один раз на план, а не для каждого файла.
         """
-        click.echo(code.format(old_filename, new_filename))
+        local_dir = self.__get_local_dir(plan.dirname)
+        for planned in plan.renames:
+            old_filename_local = local_dir + planned.old_name
+            new_filename_local = local_dir + planned.new_name if planned.new_name is not None else ''
+
+            self.__count(planned.code)
+            self.__output.message(planned.code, old_filename_local, new_filename_local)
+        self.__output.flush_interactive()
 
-    def __make_unique_filename(self, filename: str) -> str:
+    def __count(self, code: str) -> None:
         """
-        Добавляет к названию файла 'filename' перед расширением ' (copy)' и возвращает полученное имя.
-        :param filename: Имя файла, для которого нужно найти уникальное имя
-        :return: Новое имя файла, уникальное для папки dirname
+        Учитывает результат обработки одного файла в счётчиках и статистике.
         """
-        splited = filename.split('.')
-        extention = splited[-1]
-        new_filename = ''
-        for item in range(0, len(splited) - 1):
-            if item == 0:
-                new_filename += f'{splited[item]}'
-            else:
-                new_filename += f'.{splited[item]}'
-        new_filename += f'{self.suffix_for_unique_name}.{extention}'
-        if isfile(new_filename):
-            new_filename = self.__make_unique_filename(new_filename)
+        if code == 'SUCCESS':
+            self._renamed_qty += 1
+        elif code == 'UNCHANGED':
+            self._unchanged_qty += 1
+        else:
+            self._failed_qty += 1
+        self.statistics.record_result(code)
+
+    def __get_datetime_from_exif(self, entry: os.DirEntry) -> tuple:
+        """
+        Получает дату и время из EXIF-данных файла 'entry' (см. __read_exif_datetime).
+        Если включён кэш, то файлы, которые не изменились с прошлого запуска, повторно не открываются.
+
+        Возвращает дату и время в том виде, в каком они записаны в файле,
+        и название способа, которым они получены (см. RunStatistics.EXTRACTORS).
+
+        Исключения:
+         - FileNotFoundError     файл не существует
+         - PermissionError       нет прав доступа к файлу
+         - FileDoesntHaveExif   'entry' не является изображением или у него нет EXIF-данных
+         - KeyError              нет ключа 306 в EXIF-данных
+        """
+        if self.__cache is None:
+            return self.__read_exif_datetime(entry.path)
+
+        key = self.__cache.key(entry.stat())
+        is_cached, exifdata = self.__cache.get(key)
+        extractor = 'cache'
+        if not is_cached:
+            try:
+                exifdata, extractor = self.__read_exif_datetime(entry.path)
+            except (FileDoesntHaveExif, KeyError):
+                exifdata = None
+            self.__cache.put(key, exifdata)
+        if exifdata is None:
+            raise FileDoesntHaveExif
+        return exifdata, extractor
+
+    def __read_exif_datetime(self, filename: str) -> tuple:
+        """
+        Пытается получить EXIF-данные из файла, указанного в 'filename'.
+        Формат файла определяется по его первым байтам (см. FormatSniffer), и файл сразу передаётся тому,
+        кто умеет его читать:
+         - JPEG - быстрому парсеру JpegExifReader, а если он не смог разобрать файл, то модулю PIL;
+         - TIFF/RAW, PNG, WebP, HEIF - модулю PIL, который читает только этот формат;
+         - MP4/MOV - парсеру IsoBmffReader, а если он не смог разобрать файл, то ffprobe;
+         - остальные видеоформаты - ffprobe.
+        Файлы неизвестного формата не открываются ни PIL, ни ffprobe.
+
+        Возвращает дату и время в том виде, в каком они записаны в файле,
+        и название способа, которым они получены (см. RunStatistics.EXTRACTORS).
+
+        Исключения:
+         - FileNotFoundError     файл не существует
+         - PermissionError       нет прав доступа к файлу
+         - FileDoesntHaveExif   'filename' не является изображением
+         - KeyError              нет ключа 306 в EXIF-данных
+        """
+        tracer = self.__tracer
+        with open(filename, 'rb') as file:
+            kind = FormatSniffer.sniff(file.read(FormatSniffer.HEADER_SIZE))
+
+            if kind == 'jpeg':
+                file.seek(0)
+                try:
+                    with tracer.span('jpeg', 'extract', file=filename):
+                        return JpegExifReader.read_datetime_from_file(file), 'jpeg'
+                except UnsupportedFormat:
+                    ...
+
+            if kind in CodecLoader.PILLOW_FORMATS:
+                file.seek(0)
+                with tracer.span('pillow', 'extract', file=filename), CodecLoader.open_image(file, kind) as image:
+                    return image.getexif()[306], 'pillow'
 
-        return new_filename
+            if kind == 'iso-bmff':
+                try:
+                    with tracer.span('iso-bmff', 'extract', file=filename):
+                        return IsoBmffReader.read_creation_time_from_file(file), 'iso-bmff'
+                except KeyError:
+                    raise FileDoesntHaveExif
+                except UnsupportedFormat:
+                    ...
+
+        if kind not in ('iso-bmff', 'video'):
+            raise FileDoesntHaveExif
+        try:
+            with tracer.span('ffprobe', 'extract', file=filename):
+                return self.__video_probe.creation_time(filename), 'ffprobe'
+        except KeyError:
+            raise FileDoesntHaveExif
 
     def __get_local_name_from_full(self, filename_full: str) -> str:
         """
@@ -191,11 +570,14 @@ class ImageRenamer(FieldBasic, FieldCounter, FieldTextString):
         * folder/filename.jpg
         * folder/folder/filename.jpg
         """
-        return filename_full.replace(self.root_path + os.sep, '', 1)
+        prefix = self.root_path + os.sep
+        return filename_full[len(prefix):] if filename_full.startswith(prefix) else filename_full
 
-    @staticmethod
-    def __get_short_name_from_full(filename_full: str) -> str:
+    def __get_local_dir(self, dirname: str) -> str:
         """
-        Возвращает имя файла на основе его абсолютного адреса.
+        Возвращает начало локального имени файлов директории dirname:
+        '' для корневой директории, 'folder/' для вложенной и т.д.
         """
-        return filename_full.split(os.sep)[-1]
+        if dirname == self.root_path:
+            return ''
+        return self.__get_local_name_from_full(dirname) + os.sep
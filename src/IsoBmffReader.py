@@ -0,0 +1,177 @@
+import os
+import struct
+from datetime import datetime, timedelta, timezone
+
+from src.ProjectException import UnsupportedFormat
+
+
+class IsoBmffReader:
+    """
+    Читает дату создания из MP4/MOV-файлов (ISO Base Media File Format) без запуска ffprobe.
+    По файлу перемещаемся только с помощью seek() по заголовкам боксов,
+    поэтому файлы, у которых 'moov' находится в конце, не читаются целиком.
+
+    Дата ищется в следующем порядке:
+     - 'mdhd' первой дорожки - именно это значение ffprobe возвращает как streams[0].tags.creation_time;
+     - 'mvhd' - дата создания всего ролика;
+     - тег com.apple.quicktime.creationdate из 'meta'.
+    Результат форматируется так же, как это делает ffmpeg: '%Y-%m-%dT%H:%M:%S.000000Z' в UTC.
+    """
+    # Количество секунд между 1904-01-01 и 1970-01-01
+    __EPOCH_DELTA = 2082844800
+    __UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    # Типы боксов, с которых может начинаться файл. У старых QuickTime-файлов 'ftyp' может отсутствовать.
+    __FIRST_BOX_TYPES = frozenset((b'ftyp', b'moov', b'mdat', b'wide', b'free', b'skip', b'pnot'))
+    __APPLE_CREATION_DATE = b'com.apple.quicktime.creationdate'
+
+    @classmethod
+    def read_creation_time_from_file(cls, file) -> str:
+        """
+        Возвращает дату создания из файла 'file', открытого в двоичном режиме. Позиция в файле не важна.
+
+        Исключения:
+         - UnsupportedFormat     файл не является ISO-BMFF или его не получилось разобрать
+         - KeyError              даты создания в файле нет
+        """
+        file_size = os.fstat(file.fileno()).st_size
+        try:
+            first_box = cls.__read_header(file, 0, file_size)
+            if first_box is None or first_box[0] not in cls.__FIRST_BOX_TYPES:
+                raise UnsupportedFormat
+            moov = cls.__find_box(file, 0, file_size, b'moov')
+            if moov is None:
+                raise UnsupportedFormat
+
+            for time in (cls.__read_track_time(file, *moov),
+                         cls.__read_header_time(file, *moov, b'mvhd'),
+                         cls.__read_apple_creation_date(file, *moov)):
+                if time is not None:
+                    return time
+        except (struct.error, IndexError):
+            raise UnsupportedFormat
+        raise KeyError('creation_time')
+
+    @staticmethod
+    def __read_header(file, position: int, end: int) -> tuple | None:
+        """
+        Читает заголовок бокса, начинающегося в 'position'.
+        Возвращает кортеж (тип, начало содержимого, конец бокса) или None, если боксов больше нет.
+        """
+        if position + 8 > end:
+            return None
+        file.seek(position)
+        header = file.read(8)
+        if len(header) != 8:
+            return None
+        size, box_type = struct.unpack('>L4s', header)
+        payload = position + 8
+        if size == 1:
+            size = struct.unpack('>Q', file.read(8))[0]
+            payload += 8
+        elif size == 0:
+            size = end - position
+        if size < payload - position or position + size > end:
+            raise UnsupportedFormat
+        return box_type, payload, position + size
+
+    @classmethod
+    def __find_box(cls, file, start: int, end: int, box_type: bytes) -> tuple | None:
+        """
+        Возвращает (начало содержимого, конец) первого бокса типа 'box_type' на отрезке [start, end).
+        """
+        position = start
+        while (header := cls.__read_header(file, position, end)) is not None:
+            if header[0] == box_type:
+                return header[1], header[2]
+            position = header[2]
+        return None
+
+    @classmethod
+    def __read_track_time(cls, file, start: int, end: int) -> str | None:
+        trak = cls.__find_box(file, start, end, b'trak')
+        if trak is None:
+            return None
+        mdia = cls.__find_box(file, *trak, b'mdia')
+        if mdia is None:
+            return None
+        return cls.__read_header_time(file, *mdia, b'mdhd')
+
+    @classmethod
+    def __read_header_time(cls, file, start: int, end: int, box_type: bytes) -> str | None:
+        """
+        Читает creation_time из 'mvhd' или 'mdhd' так же, как это делает ffmpeg.
+        """
+        box = cls.__find_box(file, start, end, box_type)
+        if box is None:
+            return None
+        file.seek(box[0])
+        version = file.read(4)[0]
+        if version == 1:
+            time = struct.unpack('>q', file.read(8))[0]
+            if time < 0:
+                return None
+        else:
+            time = struct.unpack('>L', file.read(4))[0]
+            # Некоторые устройства записывают в это поле unix-время, ffmpeg исправляет это так же
+            if 0 < time < cls.__EPOCH_DELTA:
+                time += cls.__EPOCH_DELTA
+        if not time:
+            return None
+        try:
+            return cls.__format(cls.__UNIX_EPOCH + timedelta(seconds=time - cls.__EPOCH_DELTA))
+        except (OverflowError, ValueError):
+            # Повреждённое 64-битное значение за пределами диапазона datetime - даты в боксе нет
+            return None
+
+    @classmethod
+    def __read_apple_creation_date(cls, file, start: int, end: int) -> str | None:
+        """
+        Читает тег com.apple.quicktime.creationdate из moov/meta (боксы 'keys' и 'ilst').
+        """
+        meta = cls.__find_box(file, start, end, b'meta')
+        if meta is None:
+            return None
+        meta_start, meta_end = meta
+        # В QuickTime 'meta' - обычный бокс, а в MP4 - "полный" бокс с 4 байтами версии и флагов
+        file.seek(meta_start + 4)
+        if file.read(4) != b'hdlr':
+            meta_start += 4
+
+        keys = cls.__find_box(file, meta_start, meta_end, b'keys')
+        ilst = cls.__find_box(file, meta_start, meta_end, b'ilst')
+        if keys is None or ilst is None:
+            return None
+
+        file.seek(keys[0] + 4)
+        key_index = None
+        entries_qty = struct.unpack('>L', file.read(4))[0]
+        for index in range(1, entries_qty + 1):
+            key_size = struct.unpack('>L', file.read(4))[0]
+            if key_size < 8:
+                return None
+            # Размер записи включает 4 байта самого размера, за ним идут 4 байта пространства имён и ключ
+            key = file.read(key_size - 4)[4:]
+            if key == cls.__APPLE_CREATION_DATE:
+                key_index = index
+                break
+        if key_index is None:
+            return None
+
+        item = cls.__find_box(file, *ilst, struct.pack('>L', key_index))
+        if item is None:
+            return None
+        data = cls.__find_box(file, *item, b'data')
+        if data is None:
+            return None
+        # Содержимое 'data': 4 байта типа, 4 байта локали, затем само значение
+        file.seek(data[0] + 8)
+        value = file.read(data[1] - data[0] - 8).decode('utf-8', 'replace')
+        try:
+            moment = datetime.strptime(value, '%Y-%m-%dT%H:%M:%S%z')
+        except ValueError:
+            return None
+        return cls.__format(moment.astimezone(timezone.utc))
+
+    @staticmethod
+    def __format(moment: datetime) -> str:
+        return moment.strftime('%Y-%m-%dT%H:%M:%S.000000Z')
@@ -0,0 +1,111 @@
+import struct
+
+from src.ProjectException import UnsupportedFormat
+
+
+class JpegExifReader:
+    """
+    Читает тег DateTime (306) из JPEG-файла без использования Pillow.
+    Из файла считываются только заголовки сегментов до APP1 с EXIF-данными и сам этот сегмент,
+    после чего файл сразу же закрывается.
+    """
+    TAG_DATETIME = 306
+
+    __SOI = b'\xff\xd8'
+    __APP1 = 0xE1
+    __SOS = 0xDA
+    __EOI = 0xD9
+    __EXIF_HEADER = b'Exif\x00\x00'
+    __TYPE_ASCII = 2
+    # Маркеры без поля длины: TEM и RST0-RST7
+    __STANDALONE_MARKERS = frozenset((0x01, *range(0xD0, 0xD8)))
+
+    @classmethod
+    def read_datetime_from_file(cls, file) -> str:
+        """
+        Возвращает значение тега DateTime в том же виде, в каком его возвращает Pillow.
+        Файл 'file' должен быть открыт в двоичном режиме и читается с текущей позиции.
+
+        Исключения:
+         - UnsupportedFormat     файл не является JPEG или его не получилось разобрать
+         - KeyError              в EXIF-данных нет тега 306 или самих EXIF-данных нет
+        """
+        if file.read(2) != cls.__SOI:
+            raise UnsupportedFormat
+        return cls.__read_ascii_tag(cls.__find_exif_segment(file), cls.TAG_DATETIME)
+
+    @classmethod
+    def __find_exif_segment(cls, file) -> bytes:
+        """
+        Последовательно пропускает сегменты JPEG и возвращает TIFF-структуру из первого сегмента APP1 с EXIF.
+        """
+        while True:
+            byte = file.read(1)
+            if byte != b'\xff':
+                raise UnsupportedFormat
+            # Перед маркером может быть произвольное количество байтов-заполнителей 0xFF
+            while byte == b'\xff':
+                byte = file.read(1)
+            if not byte:
+                raise UnsupportedFormat
+            marker = byte[0]
+
+            if marker in cls.__STANDALONE_MARKERS:
+                continue
+            if marker in (cls.__SOS, cls.__EOI):
+                # Дальше идут сжатые данные изображения, EXIF-данных в файле нет
+                raise KeyError(cls.TAG_DATETIME)
+
+            length_bytes = file.read(2)
+            if len(length_bytes) != 2:
+                raise UnsupportedFormat
+            length = struct.unpack('>H', length_bytes)[0] - 2
+            if length < 0:
+                raise UnsupportedFormat
+
+            if marker == cls.__APP1:
+                segment = file.read(length)
+                if len(segment) != length:
+                    raise UnsupportedFormat
+                if segment.startswith(cls.__EXIF_HEADER):
+                    return segment[len(cls.__EXIF_HEADER):]
+            else:
+                file.seek(length, 1)
+
+    @classmethod
+    def __read_ascii_tag(cls, tiff: bytes, tag: int) -> str:
+        """
+        Ищет тег 'tag' в IFD0 TIFF-структуры и возвращает его строковое значение.
+        """
+        if tiff[:2] == b'II':
+            endian = '<'
+        elif tiff[:2] == b'MM':
+            endian = '>'
+        else:
+            raise UnsupportedFormat
+
+        try:
+            magic, ifd_offset = struct.unpack_from(endian + 'HL', tiff, 2)
+            if magic != 42:
+                raise UnsupportedFormat
+            entries_qty = struct.unpack_from(endian + 'H', tiff, ifd_offset)[0]
+            for position in range(ifd_offset + 2, ifd_offset + 2 + entries_qty * 12, 12):
+                entry_tag, entry_type, count = struct.unpack_from(endian + 'HHL', tiff, position)
+                if entry_tag != tag:
+                    continue
+                if entry_type != cls.__TYPE_ASCII:
+                    raise UnsupportedFormat
+                if count <= 4:
+                    data = tiff[position + 8:position + 8 + count]
+                else:
+                    value_offset = struct.unpack_from(endian + 'L', tiff, position + 8)[0]
+                    data = tiff[value_offset:value_offset + count]
+                if len(data) != count:
+                    raise UnsupportedFormat
+                # Так же, как это делает Pillow: отбрасываем завершающий нулевой байт
+                if data.endswith(b'\x00'):
+                    data = data[:-1]
+                return data.decode('latin-1', 'replace')
+        except struct.error:
+            raise UnsupportedFormat
+        raise KeyError(tag)
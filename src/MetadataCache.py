@@ -0,0 +1,120 @@
+import os
+import sqlite3
+import threading
+import time
+
+
+class MetadataCache:
+    """
+    Постоянный кэш EXIF-данных в базе SQLite.
+
+    Ключом служит кортеж (устройство, inode, размер, mtime_ns) - он не меняется при переименовании файла,
+    но меняется при любом изменении его содержимого. Значением служит строка с датой и временем
+    в том виде, в каком она записана в файле, или None, если у файла нет EXIF-данных.
+
+    Размер кэша ограничен: при закрытии удаляются записи, которые дольше всего не использовались.
+    """
+    __FLUSH_SIZE = 1000
+
+    def __init__(self, path: str, max_entries: int = 1_000_000):
+        self.__max_entries = max_entries
+        self.__generation = time.time_ns()
+        self.__pending_puts = dict()
+        self.__pending_hits = list()
+        self.__lock = threading.Lock()
+
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute('PRAGMA journal_mode=WAL')
+        self.__connection.execute('PRAGMA synchronous=NORMAL')
+        self.__connection.execute('CREATE TABLE IF NOT EXISTS metadata ('
+                                  'device INTEGER NOT NULL, inode INTEGER NOT NULL, '
+                                  'size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, '
+                                  'exif_datetime TEXT, last_used INTEGER NOT NULL, '
+                                  'PRIMARY KEY (device, inode, size, mtime_ns))')
+        self.__connection.execute('CREATE INDEX IF NOT EXISTS metadata_last_used ON metadata (last_used)')
+        self.__connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def key(stat_result: os.stat_result) -> tuple:
+        """
+        Возвращает ключ кэша для файла с указанным результатом stat().
+        """
+        return stat_result.st_dev, stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns
+
+    def get(self, key: tuple) -> tuple:
+        """
+        Возвращает кортеж (найдено ли значение в кэше, значение).
+        """
+        with self.__lock:
+            if key in self.__pending_puts:
+                return True, self.__pending_puts[key]
+            row = self.__connection.execute('SELECT exif_datetime FROM metadata WHERE device = ? AND inode = ? '
+                                            'AND size = ? AND mtime_ns = ?', key).fetchone()
+            if row is None:
+                return False, None
+            self.__pending_hits.append(key)
+            if len(self.__pending_hits) >= self.__FLUSH_SIZE:
+                self.__flush()
+            return True, row[0]
+
+    def contains(self, key: tuple) -> bool:
+        """
+        Проверяет, есть ли значение в кэше. В отличие от get, не считается использованием записи.
+        """
+        with self.__lock:
+            if key in self.__pending_puts:
+                return True
+            return self.__connection.execute('SELECT 1 FROM metadata WHERE device = ? AND inode = ? '
+                                             'AND size = ? AND mtime_ns = ?', key).fetchone() is not None
+
+    def put(self, key: tuple, exif_datetime: str | None) -> None:
+        """
+        Сохраняет в кэше значение 'exif_datetime'. None означает, что у файла нет EXIF-данных.
+        """
+        with self.__lock:
+            self.__pending_puts[key] = exif_datetime
+            if len(self.__pending_puts) >= self.__FLUSH_SIZE:
+                self.__flush()
+
+    def close(self) -> None:
+        with self.__lock:
+            if self.__connection is None:
+                return
+            self.__flush()
+            self.__evict()
+            self.__connection.close()
+            self.__connection = None
+
+    def __flush(self) -> None:
+        """
+        Записывает накопленные изменения одной транзакцией.
+        """
+        with self.__connection:
+            self.__connection.executemany('INSERT OR REPLACE INTO metadata '
+                                          '(device, inode, size, mtime_ns, exif_datetime, last_used) '
+                                          'VALUES (?, ?, ?, ?, ?, ?)',
+                                          ((*key, exif_datetime, self.__generation)
+                                           for key, exif_datetime in self.__pending_puts.items()))
+            self.__connection.executemany('UPDATE metadata SET last_used = ? WHERE device = ? AND inode = ? '
+                                          'AND size = ? AND mtime_ns = ?',
+                                          ((self.__generation, *key) for key in self.__pending_hits))
+        self.__pending_puts.clear()
+        self.__pending_hits.clear()
+
+    def __evict(self) -> None:
+        """
+        Удаляет самые давно использовавшиеся записи, если их больше, чем max_entries.
+        """
+        entries_qty = self.__connection.execute('SELECT COUNT(*) FROM metadata').fetchone()[0]
+        excess = entries_qty - self.__max_entries
+        if excess <= 0:
+            return
+        with self.__connection:
+            self.__connection.execute('DELETE FROM metadata WHERE rowid IN '
+                                      '(SELECT rowid FROM metadata ORDER BY last_used LIMIT ?)', (excess,))
@@ -0,0 +1,163 @@
+import json
+import sys
+
+import click
+
+from src.FieldTextString import FieldTextString
+
+
+class OutputWriter:
+    """
+    Буферизованный вывод результатов работы программы.
+
+    Строки накапливаются в буфере и записываются в поток пачками, а не по одной, как click.echo.
+    Шаблоны сообщений подготовлены заранее в FieldTextString: если вывод идёт не в терминал,
+    то используются шаблоны без ANSI-кодов, и удалять их из каждой строки не нужно.
+
+    Форматы вывода:
+     - text  - цветной (в терминале) или обычный текст;
+     - jsonl - по одной JSON-записи на файл и итоговая запись со счётчиками.
+    """
+    FORMATS = ('text', 'jsonl')
+    __BUFFER_SIZE = 512
+
+    def __init__(self, output_format: str = 'text', is_quiet: bool = False, is_summary_only: bool = False,
+                 stream=None):
+        """
+        :param output_format: Один из FORMATS
+        :param is_quiet: Не выводить ничего, кроме ошибок, из-за которых работа невозможна
+        :param is_summary_only: Выводить только итоговые счётчики
+        :param stream: Поток вывода, по-умолчанию sys.stdout
+        """
+        self.__stream = stream if stream is not None else sys.stdout
+        self.__is_tty = hasattr(self.__stream, 'isatty') and self.__stream.isatty()
+        self.__is_jsonl = output_format == 'jsonl'
+        self.__is_per_file = not (is_quiet or is_summary_only)
+        self.__is_summary = not is_quiet
+        self.__templates = FieldTextString.message_code if self.__is_tty else FieldTextString.message_code_plain
+        self.__buffer = list()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def message(self, code: str, old_filename: str, new_filename: str = '') -> None:
+        """
+        Выводит результат обработки одного файла. code - ключ из FieldTextString.message_code.
+        """
+        if not self.__is_per_file:
+            return
+        if self.__is_jsonl:
+            self.__write(self.__dumps({'status': code, 'old': old_filename, 'new': new_filename or None}))
+        else:
+            self.__write(self.__templates[code].format(old_filename, new_filename))
+
+    def error(self, code: str, template: str, argument: str) -> None:
+        """
+        Выводит ошибку, из-за которой работа программы невозможна. Такие ошибки выводятся в любом режиме.
+        """
+        if self.__is_jsonl:
+            self.__write(self.__dumps({'error': code, 'path': argument}))
+        else:
+            self.__write((template if self.__is_tty else click.unstyle(template)).format(argument))
+        self.flush()
+
+    def summary(self, renamed_qty: int, failed_qty: int, unchanged_qty: int = 0) -> None:
+        """
+        Выводит итоговые счётчики. Количество файлов, у которых уже правильное имя, выводится, только если оно не 0.
+        """
+        if not self.__is_summary:
+            return
+        if self.__is_jsonl:
+            record = {'renamed': renamed_qty, 'failed': failed_qty}
+            if unchanged_qty:
+                record['unchanged'] = unchanged_qty
+            self.__write(self.__dumps(record))
+            return
+        words = ['файлов', 'файл', 'файла', 'файла', 'файла', 'файлов', 'файлов', 'файлов', 'файлов', 'файлов']
+        self.__write(f'\nУспешно переименовано: {renamed_qty} {words[int(str(renamed_qty)[-1])]}')
+        if unchanged_qty:
+            self.__write(f'Уже названы по шаблону: {unchanged_qty} {words[int(str(unchanged_qty)[-1])]}')
+        if failed_qty:
+            self.__write(f'Не удалось переименовать: {failed_qty} {words[int(str(failed_qty)[-1])]}')
+
+    def statistics(self, report: dict) -> None:
+        """
+        Выводит статистику работы (см. RunStatistics.as_dict). Пользователь запрашивает её явно,
+        поэтому она выводится в любом режиме.
+        """
+        if self.__is_jsonl:
+            self.__write(self.__dumps({'stats': report}))
+            return
+
+        self.__write('\nСтатистика:')
+        for phase, duration in report['phases'].items():
+            self.__write(f'  {phase:<10} {duration:10.3f} с')
+        files_per_second = report['files_per_second'] or 0
+        self.__write(f'  {"всего":<10} {report["wall_time"]:10.3f} с, {files_per_second:.0f} файлов/с')
+        if report['bytes_read'] is not None:
+            self.__write(f'  Прочитано: {self.__format_size(report["bytes_read"])}')
+        if report['peak_rss'] is not None:
+            self.__write(f'  Пиковое потребление памяти: {self.__format_size(report["peak_rss"])}')
+        if report['extractors']:
+            self.__write('  Получение даты:')
+        for extractor, extractor_report in report['extractors'].items():
+            average = extractor_report['time'] / extractor_report['files'] * 1000
+            self.__write(f'    {extractor:<10} {extractor_report["path"]:<8} '
+                         f'файлов: {extractor_report["files"]}, в среднем {average:.3f} мс')
+            self.__write('      ' + ', '.join(f'<{bucket} мкс: {qty}'
+                                              for bucket, qty in extractor_report['histogram_us'].items()))
+        if report['failures']:
+            self.__write('  Ошибки:')
+        for code, qty in report['failures'].items():
+            self.__write(f'    {code}: {qty}')
+
+    @staticmethod
+    def __format_size(size: int) -> str:
+        for unit in ('байт', 'КБ', 'МБ'):
+            if size < 1024:
+                return f'{size:.1f} {unit}' if unit != 'байт' else f'{size} {unit}'
+            size /= 1024
+        return f'{size:.1f} ГБ'
+
+    @property
+    def is_tty(self) -> bool:
+        return self.__is_tty
+
+    def forward(self, text: str) -> None:
+        """
+        Записывает в поток вывод, уже подготовленный другим OutputWriter, например в другом процессе.
+        """
+        self.flush()
+        self.__stream.write(text)
+        if self.__is_tty:
+            self.__stream.flush()
+
+    def flush(self) -> None:
+        """
+        Записывает накопленные строки в поток.
+        """
+        if self.__buffer:
+            self.__buffer.append('')
+            self.__stream.write('\n'.join(self.__buffer))
+            self.__buffer.clear()
+        self.__stream.flush()
+
+    def flush_interactive(self) -> None:
+        """
+        Сбрасывает буфер, только если вывод идёт в терминал, чтобы пользователь видел прогресс.
+        Используется после обработки каждой директории.
+        """
+        if self.__is_tty:
+            self.flush()
+
+    def __write(self, line: str) -> None:
+        self.__buffer.append(line)
+        if len(self.__buffer) >= self.__BUFFER_SIZE:
+            self.flush()
+
+    @staticmethod
+    def __dumps(record: dict) -> str:
+        return json.dumps(record, ensure_ascii=False, separators=(',', ':'))
@@ -0,0 +1,64 @@
+import fnmatch
+import os
+import re
+
+
+class PathFilter:
+    """
+    Фильтр файлов и директорий для DirectoryWalker.
+
+    Шаблоны - glob-выражения (*, ?, [...]), которые сравниваются без учёта регистра:
+     - шаблон без '/' сравнивается с именем файла или директории, например '*.jpg' или '@eaDir';
+     - шаблон с '/' сравнивается с путём относительно корневой директории, например 'Camera/thumbs';
+     - шаблон вида '.jpg' (расширение без символов glob) означает '*.jpg'.
+    exclude применяется и к файлам, и к директориям: исключённая директория не сканируется вовсе.
+    include применяется только к файлам: если он задан, то обрабатываются только подходящие под него файлы.
+    max_depth - глубина вложенности директорий, в которые можно спускаться (0 - только корневая директория).
+    """
+    def __init__(self, include: tuple = (), exclude: tuple = (), max_depth: int | None = None):
+        self.__include = self.__compile(include)
+        self.__exclude = self.__compile(exclude)
+        self.__max_depth = max_depth
+
+    def is_dir_allowed(self, relative_path: str, name: str, depth: int) -> bool:
+        """
+        :param relative_path: Путь директории относительно корневой, через '/'
+        :param name: Имя директории
+        :param depth: Глубина директории, у вложенных в корневую директорий она равна 1
+        """
+        if self.__max_depth is not None and depth > self.__max_depth:
+            return False
+        return not self.__matches(self.__exclude, relative_path, name)
+
+    def is_file_allowed(self, relative_path: str, name: str) -> bool:
+        """
+        :param relative_path: Путь файла относительно корневой директории, через '/'
+        :param name: Имя файла
+        """
+        if self.__matches(self.__exclude, relative_path, name):
+            return False
+        return self.__include is None or self.__matches(self.__include, relative_path, name)
+
+    @staticmethod
+    def __matches(patterns: tuple | None, relative_path: str, name: str) -> bool:
+        if patterns is None:
+            return False
+        by_name, by_path = patterns
+        return bool(by_name and by_name.match(name) or by_path and by_path.match(relative_path))
+
+    @staticmethod
+    def __compile(patterns: tuple) -> tuple | None:
+        """
+        Объединяет шаблоны в два регулярных выражения: для имени и для относительного пути.
+        """
+        if not patterns:
+            return None
+        by_name = list()
+        by_path = list()
+        for pattern in patterns:
+            pattern = pattern.replace(os.sep, '/').strip('/')
+            if pattern.startswith('.') and not any(char in pattern for char in '*?[/'):
+                pattern = f'*{pattern}'
+            (by_path if '/' in pattern else by_name).append(fnmatch.translate(pattern))
+        return tuple(re.compile('|'.join(regexps), re.IGNORECASE) if regexps else None
+                     for regexps in (by_name, by_path))
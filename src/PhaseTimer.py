@@ -0,0 +1,53 @@
+from contextlib import contextmanager
+from time import perf_counter
+
+
+class PhaseTimer:
+    """
+    Считает время, потраченное на каждую фазу переименования: scan, extract, plan, apply.
+
+    Фазы выполняются не по очереди, а вперемешку: директории сканируются по мере того, как из них
+    извлекаются данные, а план строится после каждой директории. Поэтому время вложенной фазы вычитается
+    из времени внешней, и сумма всех фаз не превышает общего времени работы.
+    Таймер рассчитан на один поток: фазы, выполняющиеся в пуле потоков, учитываются по времени ожидания их результатов.
+    """
+    PHASES = ('scan', 'extract', 'plan', 'apply')
+
+    def __init__(self):
+        self.durations = dict.fromkeys(self.PHASES, 0.0)
+        # Стек выполняющихся фаз: [фаза, время начала, время вложенных фаз]
+        self.__stack = list()
+
+    @contextmanager
+    def measure(self, phase: str):
+        """
+        Учитывает время выполнения блока with в фазе 'phase'.
+        """
+        self.__stack.append([phase, perf_counter(), 0.0])
+        try:
+            yield
+        finally:
+            _, started, nested = self.__stack.pop()
+            elapsed = perf_counter() - started
+            self.durations[phase] = self.durations.get(phase, 0.0) + elapsed - nested
+            if self.__stack:
+                self.__stack[-1][2] += elapsed
+
+    def add(self, phase: str, seconds: float) -> None:
+        """
+        Добавляет к фазе 'phase' время, измеренное вне таймера, например в другом потоке.
+        """
+        self.durations[phase] = self.durations.get(phase, 0.0) + seconds
+
+    def measure_iter(self, phase: str, iterable):
+        """
+        Отдаёт элементы 'iterable', учитывая в фазе 'phase' время получения каждого из них.
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.measure(phase):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
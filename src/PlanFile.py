@@ -0,0 +1,76 @@
+import json
+import os
+
+from src.RenamePlanner import RenamePlan
+
+
+class PlanWriter:
+    """
+    Записывает планы переименования в файл в формате JSON Lines.
+    Первая строка - заголовок с корневой директорией, далее по одной строке на директорию:
+    {"dir": абсолютный адрес, "ops": [[старое имя, новое имя, размер, mtime_ns], ...]}.
+    Размер и время изменения нужны, чтобы перед применением плана убедиться, что файлы не изменились.
+    """
+    VERSION = 1
+
+    def __init__(self, path: str, root_path: str):
+        self.__file = open(path, 'w', encoding='utf-8')
+        self.__write({'version': self.VERSION, 'root': root_path})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        self.__file.close()
+
+    def write(self, plan: RenamePlan) -> None:
+        """
+        Записывает успешные переименования плана. Директории без переименований не записываются.
+        """
+        operations = list()
+        for planned in plan.renames:
+            if planned.code != 'SUCCESS':
+                continue
+            try:
+                stat_result = os.stat(os.path.join(plan.dirname, planned.old_name))
+            except OSError:
+                continue
+            operations.append((planned.old_name, planned.new_name, stat_result.st_size, stat_result.st_mtime_ns))
+        if operations:
+            self.__write({'dir': plan.dirname, 'ops': operations})
+
+    def __write(self, record: dict) -> None:
+        self.__file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+        self.__file.write('\n')
+
+
+class PlanReader:
+    """
+    Читает файл, записанный PlanWriter, построчно.
+    Итерация отдаёт кортежи (директория, список [старое имя, новое имя, размер, mtime_ns]).
+    """
+    def __init__(self, path: str):
+        self.__file = open(path, encoding='utf-8')
+        header = json.loads(self.__file.readline() or '{}')
+        if header.get('version') != PlanWriter.VERSION:
+            self.__file.close()
+            raise ValueError(f'{path} не является файлом плана переименования')
+        self.root_path = header['root']
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __iter__(self):
+        for line in self.__file:
+            if line.strip():
+                record = json.loads(line)
+                yield record['dir'], record['ops']
+
+    def close(self) -> None:
+        self.__file.close()
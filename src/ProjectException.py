@@ -1,2 +1,9 @@
 class FileDoesntHaveExif(Exception):
     ...
+
+
+class UnsupportedFormat(Exception):
+    """
+    Быстрый парсер не смог разобрать файл, его нужно прочитать универсальным способом.
+    """
+    ...
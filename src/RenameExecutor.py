@@ -0,0 +1,105 @@
+import os
+
+from src.RenameJournal import RenameJournal
+from src.RenamePlanner import RenamePlan
+from src.Tracer import NullTracer
+
+
+class RenameExecutor:
+    """
+    Выполняет план переименования, построенный RenamePlanner.
+
+    Если переименование в цепочке не удалось, то файлы, которые должны были занять его имя, остаются на месте.
+    Цикл выполняется целиком или не выполняется вовсе: при ошибке уже сделанные в нём переименования откатываются.
+    В режиме предпросмотра файлы не переименовываются, но обработчик on_rename вызывается так же,
+    как и при реальном запуске, поэтому результат предпросмотра совпадает с результатом переименования.
+    """
+    def __init__(self, preview: bool = False, on_rename=None, journal: RenameJournal | None = None, tracer=None):
+        """
+        :param preview: Если True, то файлы не переименовываются
+        :param on_rename: Функция, которая вызывается с абсолютными адресами (старый, новый)
+                          после каждого успешного переименования, в том числе временного и отката
+        :param journal: Журнал, в который записываются переименования до их выполнения
+        :param tracer: Tracer, в который записывается время каждого переименования
+        """
+        self.__preview = preview
+        self.__on_rename = on_rename
+        self.__journal = journal
+        self.__tracer = tracer if tracer is not None else NullTracer()
+
+    def execute(self, plan: RenamePlan) -> None:
+        """
+        Выполняет план. Для файлов, которые не удалось переименовать, меняет код в plan.renames.
+        """
+        failed = dict()
+        durable = self.__write_ahead(plan)
+        for unit in plan.units:
+            # Все операции группы должны оказаться в журнале раньше, чем будет выполнена первая из них
+            for _ in unit.operations:
+                next(durable)
+            if unit.is_cycle:
+                self.__execute_cycle(plan.dirname, unit.operations, failed)
+            else:
+                self.__execute_chain(plan.dirname, unit.operations, failed)
+
+        if failed:
+            for planned in plan.renames:
+                if planned.old_name in failed:
+                    planned.code = failed[planned.old_name]
+
+    def __write_ahead(self, plan: RenamePlan):
+        """
+        Возвращает итератор по операциям плана: очередной элемент отдаётся только после того,
+        как операция записана в журнал и сброшена на диск.
+        """
+        operations = ((os.path.join(plan.dirname, source), os.path.join(plan.dirname, destination))
+                      for unit in plan.units for _, source, destination in unit.operations)
+        if self.__journal is None or self.__preview:
+            return operations
+        return iter(self.__journal.write_ahead(operations))
+
+    def __execute_chain(self, dirname: str, operations: list, failed: dict) -> None:
+        # Имена, которые должны были освободиться, но остались заняты
+        blocked = set()
+        for owner, source, destination in operations:
+            if destination in blocked:
+                failed[owner] = 'FILE_EXISTS'
+                blocked.add(source)
+                continue
+            error_code = self.__rename(dirname, source, destination)
+            if error_code:
+                failed[owner] = error_code
+                blocked.add(source)
+
+    def __execute_cycle(self, dirname: str, operations: list, failed: dict) -> None:
+        done = list()
+        for owner, source, destination in operations:
+            error_code = self.__rename(dirname, source, destination)
+            if error_code:
+                for _, done_source, done_destination in reversed(done):
+                    self.__rename(dirname, done_destination, done_source)
+                for other_owner, _, _ in operations:
+                    failed.setdefault(other_owner, 'FILE_EXISTS')
+                failed[owner] = error_code
+                return
+            done.append((owner, source, destination))
+
+    def __rename(self, dirname: str, source: str, destination: str) -> str | None:
+        """
+        Переименовывает файл и возвращает None или код ошибки из FieldTextString.message_code.
+        """
+        source_full = os.path.join(dirname, source)
+        destination_full = os.path.join(dirname, destination)
+        if not self.__preview:
+            try:
+                with self.__tracer.span('rename', 'apply', source=source_full, destination=destination_full):
+                    os.rename(source_full, destination_full)
+            except PermissionError:
+                return 'PERMISSION_DENIED'
+            except FileNotFoundError:
+                return 'FILE_NOT_EXISTS'
+            except OSError:
+                return 'FILE_EXISTS'
+        if self.__on_rename is not None:
+            self.__on_rename(source_full, destination_full)
+        return None
@@ -0,0 +1,72 @@
+import json
+import os
+
+
+class RenameJournal:
+    """
+    Журнал переименований, который ведётся по принципу write-ahead log.
+
+    Перед тем как переименовать группу файлов, в конец журнала дописываются записи [откуда, куда]
+    с абсолютными адресами, и журнал сбрасывается на диск с помощью fsync.
+    fsync вызывается не после каждой записи, а один раз на sync_every записей, но всегда до того,
+    как соответствующие переименования будут выполнены. RenameExecutor передаёт в write_ahead операции одного плана,
+    то есть одной директории, поэтому пачки не бывают больше директории, и fsync выполняется хотя бы раз
+    на каждую директорию с переименованиями. Поэтому после аварийного завершения в журнале есть
+    все переименования, которые могли быть выполнены, и, возможно, несколько невыполненных.
+    Невыполненные записи при отмене безопасно пропускаются (см. undo_operations).
+    """
+    def __init__(self, path: str, sync_every: int = 1000):
+        self.__file = open(path, 'a', encoding='utf-8')
+        self.__sync_every = max(1, sync_every)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        self.__file.close()
+
+    def write_ahead(self, operations):
+        """
+        Записывает операции (откуда, куда) в журнал и отдаёт их обратно пачками, каждая из которых
+        уже сброшена на диск. Вызывающий код выполняет переименования пачки только после того, как её получил.
+        """
+        batch = list()
+        for operation in operations:
+            batch.append(operation)
+            if len(batch) >= self.__sync_every:
+                self.__write(batch)
+                yield from batch
+                batch = list()
+        if batch:
+            self.__write(batch)
+            yield from batch
+
+    def __write(self, batch: list) -> None:
+        self.__file.write(''.join(json.dumps(operation, ensure_ascii=False) + '\n' for operation in batch))
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+
+    @staticmethod
+    def undo_operations(path: str):
+        """
+        Читает журнал за один последовательный проход и отдаёт переименования (откуда, куда),
+        которые отменяют записанные, в обратном порядке.
+        Запись отменяется, только если исходного файла нет, а файл с новым именем есть,
+        то есть переименование действительно было выполнено. Оборванная последняя строка пропускается.
+        """
+        operations = list()
+        with open(path, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    source, destination = json.loads(line)
+                except ValueError:
+                    continue
+                operations.append((source, destination))
+
+        for source, destination in reversed(operations):
+            if os.path.lexists(source) or not os.path.lexists(destination):
+                continue
+            yield destination, source
@@ -0,0 +1,182 @@
+from dataclasses import dataclass, field
+
+from src.UniqueNameAllocator import UniqueNameAllocator
+
+
+@dataclass
+class PlannedRename:
+    """
+    Результат планирования для одного файла.
+    code - ключ из FieldTextString.message_code: SUCCESS, если файл будет переименован,
+    UNCHANGED, если у файла уже правильное имя, иначе код ошибки.
+    """
+    old_name: str
+    new_name: str | None
+    code: str
+
+
+@dataclass
+class RenameUnit:
+    """
+    Группа переименований, которые нужно выполнить строго в указанном порядке.
+    operations - список кортежей (исходное имя файла в плане, откуда переименовать, куда переименовать).
+    Цепочку (a -> b, b -> c) можно выполнить частично, а цикл (a -> b, b -> a) - только целиком.
+    """
+    is_cycle: bool
+    operations: list = field(default_factory=list)
+
+
+@dataclass
+class RenamePlan:
+    """
+    План переименования файлов одной директории.
+    renames - результаты в порядке обхода файлов, units - операции в порядке выполнения.
+    """
+    dirname: str
+    renames: list = field(default_factory=list)
+    units: list = field(default_factory=list)
+
+
+class RenamePlanner:
+    """
+    Строит план переименования директории целиком, прежде чем переименовывать хотя бы один файл.
+
+    Благодаря этому имя, которое освободится позже в этом же запуске, не считается занятым:
+    цепочки (a -> b, b -> c) выполняются с конца, а циклы (a -> b, b -> a) - через одно временное имя на цикл.
+    Если несколько файлов претендуют на одно имя, то его получает первый из них по порядку обхода.
+    """
+    TEMP_SUFFIX = '.imagerenamer-tmp'
+
+    def __init__(self, is_unique_name: bool = False, suffix_for_unique_name: str = ' (copy)',
+                 unique_style: str = 'copy'):
+        self.__is_unique_name = is_unique_name
+        self.__suffix_for_unique_name = suffix_for_unique_name
+        self.__unique_style = unique_style
+
+    def plan(self, dirname: str, names: set, extracted) -> RenamePlan:
+        """
+        :param dirname: Абсолютный адрес директории
+        :param names: Имена всех файлов, которые сейчас находятся в директории
+        :param extracted: Последовательность кортежей (старое имя, новое имя, код ошибки) в порядке обхода
+        :return: План переименования
+        """
+        plan = RenamePlan(dirname)
+        moving = dict()
+        claimed = set()
+        for old_name, new_name, error_code in extracted:
+            if error_code:
+                plan.renames.append(PlannedRename(old_name, None, error_code))
+                continue
+            if new_name == old_name:
+                plan.renames.append(PlannedRename(old_name, new_name, 'UNCHANGED'))
+                continue
+            planned = PlannedRename(old_name, new_name, 'SUCCESS')
+            if new_name in claimed:
+                planned.code = 'FILE_EXISTS'
+            else:
+                claimed.add(new_name)
+                moving[old_name] = planned
+            plan.renames.append(planned)
+
+        for old_name, is_possible in self.__resolve(names, moving).items():
+            if not is_possible:
+                moving.pop(old_name).code = 'FILE_EXISTS'
+
+        occupied = set(names)
+        occupied.update(planned.new_name for planned in moving.values())
+        plan.units = self.schedule({old_name: planned.new_name for old_name, planned in moving.items()}, occupied)
+
+        if self.__is_unique_name:
+            allocator = UniqueNameAllocator(occupied, self.__suffix_for_unique_name, self.__unique_style)
+            for planned in plan.renames:
+                if planned.code != 'FILE_EXISTS':
+                    continue
+                planned.new_name = allocator.allocate(planned.new_name)
+                planned.code = 'SUCCESS'
+                plan.units.append(RenameUnit(False, [(planned.old_name, planned.old_name, planned.new_name)]))
+
+        return plan
+
+    @staticmethod
+    def __resolve(names: set, moving: dict) -> dict:
+        """
+        Определяет, какие переименования возможны. Переименование возможно, если новое имя свободно,
+        или его занимает файл, который сам будет переименован, или файлы образуют цикл.
+        Каждое имя может быть целью не более чем одного переименования, поэтому файлы образуют
+        только непересекающиеся цепочки и циклы, и каждый из них просматривается один раз.
+        """
+        is_possible = dict()
+        for start in moving:
+            path = list()
+            on_path = set()
+            node = start
+            while True:
+                if node in is_possible:
+                    outcome = is_possible[node]
+                    break
+                if node in on_path:
+                    outcome = True
+                    break
+                path.append(node)
+                on_path.add(node)
+                target = moving[node].new_name
+                if target not in names:
+                    outcome = True
+                    break
+                if target not in moving:
+                    outcome = False
+                    break
+                node = target
+            for node in path:
+                is_possible[node] = outcome
+        return is_possible
+
+    def schedule(self, mapping: dict, occupied: set) -> list:
+        """
+        Упорядочивает переименования 'mapping' (старое имя -> новое имя) так, чтобы ни одно из них
+        не затёрло существующий файл. Для каждого цикла используется ровно одно временное имя.
+        :param mapping: Переименования, каждое новое имя в которых уникально
+        :param occupied: Занятые имена, временные имена выбираются вне этого множества
+        :return: Список RenameUnit в порядке выполнения
+        """
+        source_of = {new_name: old_name for old_name, new_name in mapping.items()}
+        units = list()
+        done = set()
+
+        # Цепочки начинаем выполнять с конца: с файла, который переименовывается в свободное имя
+        for old_name, new_name in mapping.items():
+            if new_name in mapping:
+                continue
+            unit = RenameUnit(False)
+            node = old_name
+            while node is not None:
+                unit.operations.append((node, node, mapping[node]))
+                done.add(node)
+                node = source_of.get(node)
+            units.append(unit)
+
+        # Всё, что осталось, - циклы
+        for old_name in mapping:
+            if old_name in done:
+                continue
+            temp_name = self.__make_temp_name(old_name, occupied)
+            occupied.add(temp_name)
+            unit = RenameUnit(True, [(old_name, old_name, temp_name)])
+            done.add(old_name)
+            node = source_of[old_name]
+            while node != old_name:
+                unit.operations.append((node, node, mapping[node]))
+                done.add(node)
+                node = source_of[node]
+            unit.operations.append((old_name, temp_name, mapping[old_name]))
+            units.append(unit)
+
+        return units
+
+    def __make_temp_name(self, name: str, occupied: set) -> str:
+        temp_name = f'.{name}{self.TEMP_SUFFIX}'
+        number = 0
+        while temp_name in occupied:
+            number += 1
+            temp_name = f'.{name}.{number}{self.TEMP_SUFFIX}'
+        return temp_name
@@ -0,0 +1,21 @@
+class RenameResult:
+    """
+    Результат обработки одного файла, который отдаёт программный интерфейс ImageRenamer.iter_results().
+    Результатов могут быть миллионы, поэтому у объекта нет __dict__, только поля из __slots__:
+     - old_path  - абсолютный адрес файла до переименования;
+     - new_path  - абсолютный адрес файла после переименования или None, если новое имя получить не удалось;
+     - code      - ключ из FieldTextString.message_code;
+     - extractor - способ получения даты (см. RunStatistics.EXTRACTORS) или None, если файл не открывался;
+     - seconds   - время получения даты в секундах.
+    """
+    __slots__ = ('old_path', 'new_path', 'code', 'extractor', 'seconds')
+
+    def __init__(self, old_path: str, new_path: str | None, code: str, extractor: str | None, seconds: float):
+        self.old_path = old_path
+        self.new_path = new_path
+        self.code = code
+        self.extractor = extractor
+        self.seconds = seconds
+
+    def __repr__(self):
+        return f'RenameResult({self.old_path!r}, {self.new_path!r}, {self.code!r}, {self.extractor!r}, {self.seconds})'
@@ -0,0 +1,135 @@
+import sys
+import threading
+from collections import Counter
+from time import perf_counter
+
+try:
+    import resource
+except ImportError:
+    # Модуля resource нет в Windows: пиковое потребление памяти не выводится
+    resource = None
+
+from src.PhaseTimer import PhaseTimer
+
+
+class RunStatistics:
+    """
+    Статистика одного запуска: время каждой фазы, время получения даты каждым способом,
+    количество прочитанных байт, пиковое потребление памяти и количество ошибок по кодам из message_code.
+
+    Время получения даты записывается из потоков пула, поэтому record_extraction() защищён блокировкой.
+    Гистограммы времени логарифмические: в корзину N попадают значения не меньше N/2 и меньше N микросекунд.
+    """
+    # Способы получения даты и к какому пути обработки они относятся
+    EXTRACTORS = {'jpeg': 'image', 'pillow': 'image', 'iso-bmff': 'video', 'ffprobe': 'video',
+                  'cache': 'cache', 'failure': 'failure'}
+
+    def __init__(self):
+        self.phases = PhaseTimer()
+        self.files_qty = 0
+        self.failures = Counter()
+        self.__histograms = dict()
+        self.__extraction_time = Counter()
+        self.__lock = threading.Lock()
+        self.__started = perf_counter()
+        self.__wall_time = None
+        self.__read_bytes_at_start = self.__read_bytes()
+        self.__read_bytes_qty = None
+        # Данные других процессов, добавленные через merge()
+        self.__merged_bytes_read = 0
+        self.__merged_peak_rss = None
+
+    def record_extraction(self, extractor: str, seconds: float) -> None:
+        """
+        Записывает время, за которое способом 'extractor' (см. EXTRACTORS) получена дата одного файла.
+        """
+        bucket = 1 << int(seconds * 1_000_000).bit_length()
+        with self.__lock:
+            self.__histograms.setdefault(extractor, Counter())[bucket] += 1
+            self.__extraction_time[extractor] += seconds
+
+    def record_result(self, code: str) -> None:
+        """
+        Записывает результат обработки одного файла. code - ключ из FieldTextString.message_code.
+        """
+        self.files_qty += 1
+        if code not in ('SUCCESS', 'UNCHANGED'):
+            self.failures[code] += 1
+
+    def merge(self, report: dict) -> None:
+        """
+        Добавляет статистику, полученную в другом процессе (см. as_dict).
+        Время фаз и получения даты складывается, поэтому при нескольких процессах оно может превышать общее время.
+        Пиковое потребление памяти - наибольшее среди процессов.
+        """
+        for phase, duration in report['phases'].items():
+            self.phases.add(phase, duration)
+        self.files_qty += report['files']
+        self.failures.update(report['failures'])
+        with self.__lock:
+            for extractor, extractor_report in report['extractors'].items():
+                self.__histograms.setdefault(extractor, Counter()).update(extractor_report['histogram_us'])
+                self.__extraction_time[extractor] += extractor_report['time']
+        self.__merged_bytes_read += report['bytes_read'] or 0
+        if report['peak_rss'] is not None:
+            self.__merged_peak_rss = max(self.__merged_peak_rss or 0, report['peak_rss'])
+
+    def finish(self) -> None:
+        """
+        Фиксирует общее время работы и количество прочитанных байт.
+        """
+        self.__wall_time = perf_counter() - self.__started
+        read_bytes = self.__read_bytes()
+        if read_bytes is not None and self.__read_bytes_at_start is not None:
+            self.__read_bytes_qty = read_bytes - self.__read_bytes_at_start + self.__merged_bytes_read
+
+    def as_dict(self) -> dict:
+        """
+        Возвращает статистику в виде словаря, пригодного для записи в JSON.
+        Время - в секундах, объём - в байтах. Если значение не удалось получить, то вместо него None.
+        """
+        if self.__wall_time is None:
+            self.finish()
+        extractors = dict()
+        for extractor, histogram in sorted(self.__histograms.items()):
+            extractors[extractor] = {
+                'path': self.EXTRACTORS.get(extractor, extractor),
+                'files': sum(histogram.values()),
+                'time': self.__extraction_time[extractor],
+                'histogram_us': {bucket: histogram[bucket] for bucket in sorted(histogram)},
+            }
+        peak_rss = self.__peak_rss()
+        if self.__merged_peak_rss is not None:
+            peak_rss = max(peak_rss or 0, self.__merged_peak_rss)
+        return {
+            'phases': dict(self.phases.durations),
+            'wall_time': self.__wall_time,
+            'files': self.files_qty,
+            'files_per_second': self.files_qty / self.__wall_time if self.__wall_time else None,
+            'bytes_read': self.__read_bytes_qty,
+            'peak_rss': peak_rss,
+            'extractors': extractors,
+            'failures': dict(self.failures.most_common()),
+        }
+
+    @staticmethod
+    def __read_bytes() -> int | None:
+        """
+        Возвращает количество байт, прочитанных процессом, по данным /proc/self/io (только Linux).
+        """
+        try:
+            with open('/proc/self/io', encoding='ascii') as file:
+                for line in file:
+                    if line.startswith('rchar:'):
+                        return int(line.split()[1])
+        except (OSError, ValueError):
+            ...
+        return None
+
+    @staticmethod
+    def __peak_rss() -> int | None:
+        if resource is None:
+            return None
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # В Linux ru_maxrss в килобайтах, в macOS - в байтах
+        return peak_rss if sys.platform == 'darwin' else peak_rss * 1024
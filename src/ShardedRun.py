@@ -0,0 +1,135 @@
+import multiprocessing
+import queue
+import threading
+import traceback
+
+from src.DirectoryWalker import DirectoryWalker
+from src.PathFilter import PathFilter
+
+
+class QueueStream:
+    """
+    Поток вывода процесса-обработчика: всё, что в него записано, передаётся в основной процесс.
+    """
+    def __init__(self, results, is_tty: bool):
+        self.__results = results
+        self.__is_tty = is_tty
+
+    def write(self, text: str) -> None:
+        self.__results.put(('output', text))
+
+    def flush(self) -> None:
+        ...
+
+    def isatty(self) -> bool:
+        return self.__is_tty
+
+
+class ShardedRun:
+    """
+    Переименование большого дерева директорий в нескольких процессах.
+
+    Директории раздаются через общую очередь: процесс берёт из неё директорию, сканирует её, кладёт в очередь
+    её поддиректории и переименовывает её файлы. Поэтому поддеревья директории, которую обрабатывает
+    занятый процесс, сразу достаются свободным процессам, и дерево делится между ними по мере обхода.
+    Каждую директорию сканирует и переименовывает ровно один процесс, поэтому коллизии по-прежнему
+    разрешаются внутри директории так же, как и в одном процессе.
+    Процессы передают вывод и итоговые счётчики в основной процесс, где они объединяются.
+    """
+    def __init__(self, fields: dict, processes: int, preview: bool = False):
+        """
+        :param fields: Поля ImageRenamer (см. FieldBasic), с которыми он создаётся в каждом процессе
+        :param processes: Количество процессов-обработчиков
+        :param preview: Если True, то файлы не переименовываются
+        """
+        self.__fields = fields
+        self.__processes = processes
+        self.__preview = preview
+
+    def run(self, output) -> list:
+        """
+        Запускает процессы и передаёт их вывод в OutputWriter 'output'.
+        Возвращает список отчётов процессов (см. ImageRenamer.rename_shard).
+
+        Исключения:
+         - RuntimeError   процесс-обработчик завершился с ошибкой
+        """
+        context = multiprocessing.get_context()
+        directories = context.JoinableQueue()
+        results = context.Queue()
+        directories.put(self.__fields['root_path'])
+        workers = [context.Process(target=self._work, daemon=True,
+                                   args=(self.__fields, self.__preview, directories, results, output.is_tty))
+                   for _ in range(self.__processes)]
+        for worker in workers:
+            worker.start()
+        # Когда все директории отсканированы, процессам отправляется признак конца работы
+        threading.Thread(target=self.__stop_when_scanned, args=(directories,), daemon=True).start()
+
+        reports = list()
+        errors = list()
+        try:
+            while len(reports) + len(errors) < len(workers):
+                try:
+                    kind, payload = results.get(timeout=1)
+                except queue.Empty:
+                    if any(worker.exitcode not in (None, 0) for worker in workers):
+                        raise RuntimeError('Процесс-обработчик неожиданно завершился') from None
+                    continue
+                if kind == 'output':
+                    output.forward(payload)
+                elif kind == 'done':
+                    reports.append(payload)
+                else:
+                    errors.append(payload)
+        finally:
+            for worker in workers:
+                worker.join(timeout=1)
+                if worker.is_alive():
+                    worker.terminate()
+        if errors:
+            raise RuntimeError('Процесс-обработчик завершился с ошибкой:\n' + errors[0])
+        return reports
+
+    def __stop_when_scanned(self, directories) -> None:
+        directories.join()
+        for _ in range(self.__processes):
+            directories.put(None)
+
+    @staticmethod
+    def _work(fields: dict, preview: bool, directories, results, is_tty: bool) -> None:
+        """
+        Точка входа процесса-обработчика.
+        """
+        try:
+            from src.ImageRenamer import ImageRenamer
+
+            renamer = ImageRenamer(**fields)
+            walker = DirectoryWalker(renamer.root_path, renamer.is_recursion,
+                                     path_filter=PathFilter(renamer.include, renamer.exclude, renamer.max_depth))
+            report = renamer.rename_shard(ShardedRun.__iter_directories(walker, directories),
+                                          QueueStream(results, is_tty), preview)
+            results.put(('done', report))
+        except Exception:
+            results.put(('error', traceback.format_exc()))
+
+    @staticmethod
+    def __iter_directories(walker: DirectoryWalker, directories):
+        """
+        Берёт директории из общей очереди и отдаёт их содержимое в формате DirectoryWalker.
+        Поддиректории кладутся в очередь до того, как директория отмечается обработанной,
+        поэтому очередь не может опустеть, пока дерево не отсканировано целиком.
+        """
+        while (dirname := directories.get()) is not None:
+            try:
+                files, skipped, subdirs = walker.scan_dir(dirname)
+                for subdir in subdirs:
+                    directories.put(subdir)
+            except (FileNotFoundError, PermissionError):
+                # Директорию могли удалить во время обхода
+                continue
+            finally:
+                # Иначе при любой другой ошибке очередь никогда не опустеет, и остальные процессы не остановятся
+                directories.task_done()
+            yield dirname, files, skipped
+        directories.task_done()
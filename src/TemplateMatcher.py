@@ -0,0 +1,54 @@
+import os
+import re
+
+
+class TemplateMatcher:
+    """
+    Проверяет, что имя файла уже составлено по шаблону даты и времени, не открывая сам файл.
+
+    Шаблон strftime преобразуется в регулярное выражение: каждая директива заменяется группой цифр
+    (или букв - для названий месяцев и дней недели) той ширины, которую даёт strftime.
+    После даты допускается суффикс уникального имени (см. UniqueNameAllocator), а расширение не проверяется.
+    Если в шаблоне есть директива, ширину которой нельзя предсказать, то ни одно имя не считается подходящим,
+    то есть все файлы обрабатываются как обычно.
+    """
+    __DIRECTIVES = {
+        'Y': '[0-9]{4}', 'y': '[0-9]{2}', 'm': '[0-9]{2}', 'd': '[0-9]{2}', 'H': '[0-9]{2}', 'I': '[0-9]{2}',
+        'M': '[0-9]{2}', 'S': '[0-9]{2}', 'j': '[0-9]{3}', 'f': '[0-9]{6}', 'U': '[0-9]{2}', 'W': '[0-9]{2}',
+        'w': '[0-6]', 'u': '[1-7]', 'G': '[0-9]{4}', 'V': '[0-9]{2}',
+        'a': '[^\\W\\d_]+', 'A': '[^\\W\\d_]+', 'b': '[^\\W\\d_]+', 'B': '[^\\W\\d_]+', 'p': '[^\\W\\d_]+',
+        '%': '%',
+    }
+
+    def __init__(self, template: str, suffix: str = ' (copy)', style: str = 'copy'):
+        """
+        :param template: Шаблон strftime, по которому составляются новые имена
+        :param suffix: Суффикс уникального имени для стиля 'copy'
+        :param style: Стиль уникальных имён, один из UniqueNameAllocator.STYLES
+        """
+        pattern = self.__translate(template)
+        if pattern is not None:
+            unique = '(?:_[0-9]{3,})?' if style == 'number' else f'(?:{re.escape(suffix)})*'
+            pattern = re.compile(pattern + unique)
+        self.__pattern = pattern
+
+    def matches(self, name: str) -> bool:
+        """
+        Возвращает True, если имя файла 'name' (без директории) составлено по шаблону.
+        """
+        if self.__pattern is None:
+            return False
+        return self.__pattern.fullmatch(os.path.splitext(name)[0]) is not None
+
+    @classmethod
+    def __translate(cls, template: str) -> str | None:
+        parts = list()
+        for literal, directive in re.findall(r'([^%]*)(%.?)?', template):
+            parts.append(re.escape(literal))
+            if not directive:
+                continue
+            regexp = cls.__DIRECTIVES.get(directive[1:])
+            if regexp is None:
+                return None
+            parts.append(regexp)
+        return ''.join(parts)
@@ -0,0 +1,116 @@
+import itertools
+import json
+import os
+import threading
+from contextlib import nullcontext
+from time import perf_counter_ns
+
+
+class Span:
+    """
+    Отрезок времени, который записывается в трассировку при выходе из блока with.
+    """
+    __slots__ = ('tracer', 'name', 'category', 'args', 'started')
+
+    def __init__(self, tracer, name: str, category: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.started = 0
+
+    def __enter__(self):
+        self.started = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.tracer._record(self, perf_counter_ns(), exc_type)
+
+
+class Tracer:
+    """
+    Записывает трассировку в формате Chrome trace event (JSON), который открывается в chrome://tracing и Perfetto.
+
+    Чтобы трассировка большого дерева не замедляла работу и не занимала гигабайты, записывается
+    только каждый sample_every-й отрезок. Отрезки длиннее slow_ms записываются всегда:
+    именно они показывают, на каком файле или директории программа остановилась.
+    События пишутся в файл пачками по мере работы, поэтому память не растёт вместе с количеством файлов.
+    """
+    __FLUSH_EVERY = 1000
+
+    def __init__(self, path: str, sample_every: int = 1, slow_ms: float = 10):
+        """
+        :param path: Файл, в который записывается трассировка
+        :param sample_every: Записывать каждый N-й отрезок
+        :param slow_ms: Отрезки не короче этого времени (в миллисекундах) записываются всегда
+        """
+        self.__path = path
+        self.__sample_every = max(1, sample_every)
+        self.__slow_ns = int(slow_ms * 1_000_000)
+        self.__counter = itertools.count()
+        self.__origin = perf_counter_ns()
+        self.__pid = os.getpid()
+        self.__threads = set()
+        self.__events = list()
+        self.__lock = threading.Lock()
+        self.__file = None
+        self.__is_first = True
+
+    def __enter__(self):
+        self.__file = open(self.__path, 'w', encoding='utf-8')
+        self.__file.write('[\n')
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        with self.__lock:
+            self.__flush()
+            self.__file.write('\n]\n')
+            self.__file.close()
+
+    def span(self, name: str, category: str, **args) -> Span:
+        """
+        Возвращает отрезок для блока with. args попадают в трассировку как аргументы события.
+        """
+        return Span(self, name, category, args)
+
+    def _record(self, span: Span, finished: int, exc_type) -> None:
+        duration = finished - span.started
+        if next(self.__counter) % self.__sample_every and duration < self.__slow_ns:
+            return
+        if exc_type is not None:
+            span.args['error'] = exc_type.__name__
+        thread_id = threading.get_ident()
+        event = {'name': span.name, 'cat': span.category, 'ph': 'X', 'pid': self.__pid, 'tid': thread_id,
+                 'ts': (span.started - self.__origin) / 1000, 'dur': duration / 1000, 'args': span.args}
+        with self.__lock:
+            if thread_id not in self.__threads:
+                self.__threads.add(thread_id)
+                self.__events.append({'name': 'thread_name', 'ph': 'M', 'pid': self.__pid, 'tid': thread_id,
+                                      'args': {'name': threading.current_thread().name}})
+            self.__events.append(event)
+            if len(self.__events) >= self.__FLUSH_EVERY:
+                self.__flush()
+
+    def __flush(self) -> None:
+        if not self.__events:
+            return
+        lines = ',\n'.join(json.dumps(event, ensure_ascii=False, separators=(',', ':')) for event in self.__events)
+        self.__file.write(lines if self.__is_first else ',\n' + lines)
+        self.__is_first = False
+        self.__events.clear()
+
+
+class NullTracer:
+    """
+    Трассировка выключена: span() возвращает один и тот же пустой контекстный менеджер и ничего не измеряет.
+    """
+    __SPAN = nullcontext()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        ...
+
+    def span(self, name: str, category: str, **args) -> nullcontext:
+        return self.__SPAN
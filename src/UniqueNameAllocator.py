@@ -0,0 +1,50 @@
+import os
+
+
+class UniqueNameAllocator:
+    """
+    Подбирает уникальные имена файлов внутри одной директории без обращений к файловой системе.
+
+    Занятые имена хранятся в множестве, которое заполняется одним сканированием директории,
+    а для каждого исходного имени запоминается номер последнего занятого варианта.
+    Поэтому серия из k файлов с одинаковым именем обходится в O(k) проверок, а не в O(k²).
+    Стили:
+     - 'copy'   - суффикс повторяется: 'a (copy).jpg', 'a (copy) (copy).jpg', ...
+     - 'number' - к имени добавляется номер: 'a_001.jpg', 'a_002.jpg', ...
+    """
+    STYLES = ('copy', 'number')
+
+    def __init__(self, taken: set, suffix: str = ' (copy)', style: str = 'copy'):
+        """
+        :param taken: Занятые имена. Множество не копируется: выданные имена добавляются в него же
+        :param suffix: Суффикс для стиля 'copy'
+        :param style: Один из STYLES
+        """
+        if style not in self.STYLES:
+            raise ValueError(f'Неизвестный стиль уникальных имён: {style}')
+        self.__taken = taken
+        self.__suffix = suffix
+        self.__style = style
+        self.__counters = dict()
+
+    def allocate(self, name: str) -> str:
+        """
+        Возвращает имя 'name', если оно свободно, или первый свободный вариант с суффиксом,
+        и помечает его занятым.
+        """
+        number = self.__counters.get(name, 0)
+        candidate = self.__make_name(name, number)
+        while candidate in self.__taken:
+            number += 1
+            candidate = self.__make_name(name, number)
+        self.__counters[name] = number
+        self.__taken.add(candidate)
+        return candidate
+
+    def __make_name(self, name: str, number: int) -> str:
+        if number == 0:
+            return name
+        stem, extension = os.path.splitext(name)
+        if self.__style == 'number':
+            return f'{stem}_{number:03d}{extension}'
+        return f'{stem}{self.__suffix * number}{extension}'
@@ -0,0 +1,113 @@
+import json
+import os
+import threading
+from collections import deque
+
+from src.ProjectException import FileDoesntHaveExif
+
+
+class VideoProbe:
+    """
+    Получает дату создания видеофайлов с помощью ffprobe.
+
+    ffprobe принимает только один входной файл за запуск, поэтому стоимость запуска процесса
+    амортизируется по-другому: файлы с видео-расширениями заранее (prefetch) отправляются
+    в пул долгоживущих потоков, каждый из которых запускает ffprobe.
+    К моменту, когда основной цикл доходит до видеофайла, его метаданные, как правило, уже получены.
+    Пул потоков создаётся только при первом видеофайле, поэтому на папках без видео он ничего не стоит.
+    """
+    # MP4/MOV читаются без ffprobe с помощью IsoBmffReader, поэтому заранее запускать ffprobe для них не нужно
+    VIDEO_EXTENSIONS = frozenset(('.avi', '.mkv', '.webm', '.mts', '.m2ts', '.wmv', '.flv', '.mpg', '.mpeg'))
+
+    def __init__(self, workers: int = 4, cmd: str = 'ffprobe'):
+        self.__cmd = cmd
+        self.__workers = max(1, workers)
+        self.__executor = None
+        self.__pending = dict()
+        self.__lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        with self.__lock:
+            if self.__executor is not None:
+                self.__executor.shutdown(cancel_futures=True)
+                self.__executor = None
+            self.__pending.clear()
+
+    def is_video(self, filename: str) -> bool:
+        return os.path.splitext(filename)[1].lower() in self.VIDEO_EXTENSIONS
+
+    def prefetch(self, filename: str) -> None:
+        """
+        Запускает получение метаданных файла 'filename' в фоне.
+        """
+        with self.__lock:
+            if filename in self.__pending:
+                return
+            if self.__executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self.__executor = ThreadPoolExecutor(max_workers=self.__workers)
+            self.__pending[filename] = self.__executor.submit(self.__probe, filename)
+
+    def discard(self, filename: str) -> None:
+        """
+        Забывает о фоновом получении метаданных файла 'filename', если до creation_time дело не дошло,
+        например потому, что файл оказался не видео. Если ffprobe ещё не запущен, то он и не запускается.
+        """
+        with self.__lock:
+            future = self.__pending.pop(filename, None)
+        if future is not None:
+            future.cancel()
+
+    def prefetching(self, filenames, lookahead: int = 32, is_skipped=None):
+        """
+        Отдаёт элементы 'filenames' (строки или os.DirEntry) без изменений, но заранее отправляет в фон
+        видеофайлы, находящиеся на 'lookahead' элементов впереди.
+        Видеофайлы, для которых функция is_skipped (получает элемент 'filenames') возвращает True,
+        в фон не отправляются.
+        """
+        upcoming = deque()
+        for filename in filenames:
+            path = os.fspath(filename)
+            if self.is_video(path) and (is_skipped is None or not is_skipped(filename)):
+                self.prefetch(path)
+            upcoming.append(filename)
+            if len(upcoming) > lookahead:
+                yield upcoming.popleft()
+        yield from upcoming
+
+    def creation_time(self, filename: str) -> str:
+        """
+        Возвращает тег creation_time первого потока файла 'filename' - то же самое значение,
+        что и ffmpeg.probe(filename)['streams'][0]['tags']['creation_time'].
+
+        Исключения:
+         - FileDoesntHaveExif   ffprobe не смог прочитать файл
+         - KeyError             у первого потока нет тега creation_time
+        """
+        with self.__lock:
+            future = self.__pending.pop(filename, None)
+        if future is None:
+            return self.__probe(filename)
+        return future.result()
+
+    def __probe(self, filename: str) -> str:
+        import subprocess
+        process = subprocess.run([self.__cmd, '-v', 'error',
+                                  '-show_entries', 'stream=index:stream_tags=creation_time',
+                                  '-of', 'json', filename],
+                                 stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        if process.returncode != 0:
+            raise FileDoesntHaveExif
+        try:
+            streams = json.loads(process.stdout)['streams']
+        except (ValueError, KeyError):
+            raise FileDoesntHaveExif
+        if not streams:
+            raise KeyError('streams')
+        return streams[0]['tags']['creation_time']
@@ -0,0 +1,43 @@
+from collections import deque
+
+
+class WorkerPool:
+    """
+    Пул потоков, который применяет функцию к элементам последовательности
+    и отдаёт результаты строго в том же порядке, в котором были переданы элементы.
+    При jobs = 1 пул не создаётся и функция вызывается последовательно в текущем потоке.
+    """
+    def __init__(self, jobs: int = 1):
+        self.__jobs = max(1, jobs)
+        self.__executor = None
+
+    def __enter__(self):
+        if self.__jobs > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            self.__executor = ThreadPoolExecutor(max_workers=self.__jobs)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.__executor is not None:
+            self.__executor.shutdown(cancel_futures=True)
+            self.__executor = None
+
+    def map(self, function, iterable):
+        """
+        Аналог встроенного map(). Количество одновременно выполняющихся задач ограничено,
+        поэтому последовательность может быть сколь угодно длинной.
+        """
+        if self.__executor is None:
+            yield from map(function, iterable)
+            return
+
+        # Окно из нескольких задач на каждый поток, чтобы потоки не простаивали,
+        # пока основной цикл обрабатывает очередной результат.
+        window = self.__jobs * 4
+        pending = deque()
+        for item in iterable:
+            pending.append(self.__executor.submit(function, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,120 @@
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+from src import ImageRenamer
+from src.AsyncPipeline import AsyncPipeline
+from src.DirectoryWalker import DirectoryWalker
+from .utils import new_image, add_exif, execute_renamer
+
+
+@pytest.fixture(scope='function', name='create_images')
+def fixture_create_images(tmpdir) -> str:
+    """
+    Фикстура, срабатывающая при каждом вызове тестирующей функции.
+    Создаёт изображения с совпадающими датами, файлы без EXIF-данных и вложенную директорию.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будут создаваться файлы.
+    :return: Абсолютный адрес временной папки, в которой были созданы файлы.
+    """
+    abs_temp_dir = tmpdir.mkdir('images')
+    tmpdir.mkdir('images/level1')
+    filenames = (
+        ('image01.jpg', '1001:01:01 01:01:01'),
+        ('image02.jpg', '1002:01:01 01:01:01'),
+        ('image03.jpg', '1002:01:01 01:01:01'),
+        ('image04.jpg',),
+        ('level1/image05.jpg', '1002:01:01 01:01:01'),
+        ('level1/image06.jpg', 'incorrect Datetime info'),
+    )
+    for file in filenames:
+        new_image(abs_temp_dir, file[0])
+        if len(file) > 1:
+            add_exif(abs_temp_dir, file[0], file[1])
+    return str(abs_temp_dir)
+
+
+def test_async_pipeline__same_as_serial(tmpdir, create_images: str, capsys):
+    """
+    Тестирует, что конвейер на asyncio выводит и переименовывает то же самое, что и последовательный запуск.
+    """
+    serial_dir = str(tmpdir.join('serial'))
+    shutil.copytree(create_images, serial_dir)
+    execute_renamer(serial_dir, make_unique_name=True, recursion=True)
+    serial_stdout = capsys.readouterr().out.replace(serial_dir, '')
+
+    ImageRenamer.ImageRenamer(root_path=create_images, is_unique_name=True, is_recursion=True,
+                              is_async=True, in_flight=2, queue_size=1).rename()
+    async_stdout = capsys.readouterr().out.replace(create_images, '')
+
+    assert async_stdout == serial_stdout
+    for subdir in ('', 'level1'):
+        assert sorted(os.listdir(os.path.join(create_images, subdir))) == \
+               sorted(os.listdir(os.path.join(serial_dir, subdir)))
+
+
+def test_async_pipeline__in_flight(create_images: str):
+    """
+    Тестирует, что одновременно обрабатывается не больше in_flight файлов, а директории передаются по порядку.
+    """
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def extract(entry: os.DirEntry) -> str:
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        return entry.name
+
+    directories = list()
+    AsyncPipeline(DirectoryWalker(create_images, True), extract,
+                  lambda dirname, names, results: directories.append((dirname, results)), in_flight=2).run()
+
+    assert running[1] == 2
+    assert directories == [(create_images, ['image01.jpg', 'image02.jpg', 'image03.jpg', 'image04.jpg']),
+                           (os.path.join(create_images, 'level1'), ['image05.jpg', 'image06.jpg'])]
+
+
+def test_async_pipeline__error(create_images: str):
+    """
+    Тестирует, что исключение стадии прерывает конвейер и передаётся вызывающему коду.
+    """
+    def on_directory(dirname: str, names: set, results: list) -> None:
+        raise RuntimeError(dirname)
+
+    with pytest.raises(RuntimeError):
+        AsyncPipeline(DirectoryWalker(create_images, True), os.fspath, on_directory, queue_size=1).run()
+    with pytest.raises(FileNotFoundError):
+        AsyncPipeline(DirectoryWalker(os.path.join(create_images, 'missing')), os.fspath, on_directory).run()
+
+
+def test_async_pipeline__error_many_directories(tmpdir):
+    """
+    Тестирует, что ошибка переименования не оставляет сканирование заблокированным на заполненной очереди.
+    """
+    root = tmpdir.mkdir('many')
+    for number in range(50):
+        root.mkdir(f'dir{number:02d}').join('image.jpg').write('')
+
+    def on_directory(dirname: str, names: set, results: list) -> None:
+        raise OSError(28, 'No space left on device')
+
+    errors = list()
+
+    def run() -> None:
+        try:
+            AsyncPipeline(DirectoryWalker(str(root), True), os.fspath, on_directory, queue_size=1).run()
+        except OSError as error:
+            errors.append(error)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert [error.errno for error in errors] == [28]
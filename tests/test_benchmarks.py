@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from benchmarks.Benchmark import Benchmark
+from benchmarks.Corpus import Corpus
+from benchmarks.Memory import Memory
+from src.PhaseTimer import PhaseTimer
+
+
+def list_files(root: str) -> dict:
+    files = dict()
+    for dirname, _, filenames in os.walk(root):
+        for filename in filenames:
+            with open(os.path.join(dirname, filename), 'rb') as file:
+                files[os.path.relpath(os.path.join(dirname, filename), root)] = file.read()
+    return files
+
+
+def test_corpus__reproducible(tmpdir):
+    """
+    Тестирует, что одни и те же параметры дают одно и то же дерево файлов.
+    """
+    corpus = Corpus(files=150, layout='deep', seed=7, files_per_dir=10, max_depth=4)
+    first = corpus.generate(str(tmpdir.mkdir('first')))
+    second = corpus.generate(str(tmpdir.mkdir('second')))
+
+    assert first == second
+    assert sum(first.values()) == 150
+    assert list_files(str(tmpdir.join('first'))) == list_files(str(tmpdir.join('second')))
+    assert os.path.isdir(str(tmpdir.join('first', 'branch_00000', 'level_00', 'level_01', 'level_02')))
+
+
+def test_benchmark__run(tmpdir):
+    """
+    Тестирует, что замер переименовывает весь корпус и возвращает время каждой фазы.
+    """
+    corpus = Corpus(files=60, layout='flat', mix={'jpeg': 1, 'noexif': 1, 'heic': 1, 'mp4': 1}, burst=0)
+    result = Benchmark(corpus, repeat=1, workdir=str(tmpdir)).run()
+
+    assert set(result['phases']) == set(PhaseTimer.PHASES)
+    assert result['renamed'] == 60 - result['created']['noexif']
+    assert result['failed'] == result['created']['noexif']
+    assert os.listdir(str(tmpdir)) == []
+
+
+def test_memory__run():
+    """
+    Тестирует, что список файлов занимает меньше памяти, чем при хранении полных адресов.
+    """
+    result = Memory(files=5000, files_per_dir=100).run()
+
+    assert set(result['phases']) == {'legacy', 'compact'}
+    assert 0 < result['phases']['compact'] < result['phases']['legacy']
+    assert result['total'] == result['phases']['compact']
+
+
+def test_benchmark__compare():
+    """
+    Тестирует, что замедление засчитывается, только если оно больше и порога, и минимальной разницы.
+    """
+    baseline = {'corpus': {'files': 1}, 'jobs': 1, 'phases': {'scan': 1.0, 'extract': 0.01}, 'total': 1.01}
+    current = {'corpus': {'files': 1}, 'jobs': 1, 'phases': {'scan': 1.2, 'extract': 0.03}, 'total': 1.23}
+
+    rows = Benchmark.compare(baseline, current, threshold=0.1, min_delta=0.05)
+
+    assert [(phase, is_regression) for phase, _, _, is_regression in rows] == [
+        ('scan', True), ('extract', False), ('total', True)]
+    with pytest.raises(ValueError):
+        Benchmark.compare(baseline, dict(current, jobs=4))
@@ -0,0 +1,73 @@
+import random
+from datetime import datetime
+
+import pytest
+
+from src.DatetimeParser import DatetimeParser
+
+
+def parse_with_strptime(datetime_string: str) -> datetime | None:
+    """
+    Прежний способ распознавания: перебор шаблонов через strptime() в фиксированном порядке.
+    """
+    for template in ('%Y:%m:%d %H:%M:%S', '%Y.%m.%d %H:%M:%S', '%Y/%m/%d %H:%M:%S',
+                     '%Y/%d/%m %H:%M:%S', '%Y-%m-%dT%H:%M:%S.000000Z'):
+        try:
+            return datetime.strptime(datetime_string, template)
+        except ValueError:
+            ...
+    return None
+
+
+def random_datetime_strings(qty: int):
+    generator = random.Random(2012)
+    for _ in range(qty):
+        year = generator.choice(('2021', '1999', '0001', '10000', '20'))
+        month, day = (generator.choice(('01', '02', '12', '13', '29', '31', '1', '00')) for _ in range(2))
+        hour, minute, second = (generator.choice(('00', '09', '23', '24', '59', '60', '61', '7')) for _ in range(3))
+        separator = generator.choice((':', '.', '/', '-'))
+        if generator.random() < 0.2:
+            yield f'{year}-{month}-{day}{generator.choice("Tt ")}{hour}:{minute}:{second}.000000{generator.choice("Zz")}'
+        else:
+            yield f'{year}{separator}{month}{separator}{day}{generator.choice((" ", "  ", "T"))}{hour}:{minute}:{second}'
+
+
+def test_datetime_parser__same_as_strptime():
+    """
+    Тестирует, что быстрый разбор даёт тот же результат, что и перебор шаблонов через strptime(),
+    в том числе при чередовании форматов, когда запоминается последний совпавший шаблон.
+    """
+    parser = DatetimeParser('%Y%m%d_%H%M%S')
+    for datetime_string in random_datetime_strings(5000):
+        expected = parse_with_strptime(datetime_string)
+        if expected is None:
+            with pytest.raises(ValueError):
+                parser.parse(datetime_string)
+        else:
+            assert parser.parse(datetime_string) == expected, datetime_string
+
+
+@pytest.mark.parametrize('datetime_string, expected', [
+    ('2021/01/02 03:04:05', datetime(2021, 1, 2, 3, 4, 5)),
+    ('2021/25/02 03:04:05', datetime(2021, 2, 25, 3, 4, 5)),
+    ('2021/01/02 03:04:05', datetime(2021, 1, 2, 3, 4, 5)),
+])
+def test_datetime_parser__ambiguous_order(datetime_string: str, expected: datetime):
+    """
+    Тестирует, что '%Y/%d/%m' проверяется только после '%Y/%m/%d', даже если совпал последним.
+    """
+    parser = DatetimeParser('%Y%m%d_%H%M%S')
+    parser.parse('2021/25/02 03:04:05')
+    assert parser.parse(datetime_string) == expected
+
+
+def test_datetime_parser__format():
+    """
+    Тестирует форматирование даты по шаблону пользователя и запоминание результата.
+    """
+    parser = DatetimeParser('%Y-%m-%d %H.%M.%S')
+    assert parser.format('2021:01:02 03:04:05') == '2021-01-02 03.04.05'
+    assert parser.format('2021:01:02 03:04:05') == '2021-01-02 03.04.05'
+    assert parser.format.cache_info().hits == 1
+    with pytest.raises(ValueError):
+        parser.format('not a date')
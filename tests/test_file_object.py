@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+from src.FileObject import FileObject
+
+
+@pytest.fixture(scope='function', name='create_files')
+def fixture_create_files(tmpdir) -> str:
+    """
+    Фикстура, срабатывающая при каждом вызове тестирующей функции.
+    Создаёт несколько пустых файлов в двух уровнях директорий.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будут создаваться файлы.
+    :return: Абсолютный адрес временной папки, в которой были созданы файлы.
+    """
+    abs_temp_dir = tmpdir.mkdir('files')
+    tmpdir.mkdir('files/level1')
+    for filename in ('b.jpg', 'a.jpg', 'level1/c.jpg'):
+        abs_temp_dir.join(filename).write('')
+    return str(abs_temp_dir)
+
+
+def test_file_object__contains(create_files: str):
+    """
+    Тестирует проверку наличия файла в индексе.
+    """
+    file_objects = FileObject(create_files, is_recursion=True)
+    assert os.path.join(create_files, 'a.jpg') in file_objects
+    assert os.path.join(create_files, 'level1', 'c.jpg') in file_objects
+    assert os.path.join(create_files, 'c.jpg') not in file_objects
+
+
+def test_file_object__update(create_files: str):
+    """
+    Тестирует замену элемента: старое имя исчезает из индекса, новое занимает его позицию.
+    """
+    file_objects = FileObject(create_files)
+    old_item = os.path.join(create_files, 'a.jpg')
+    new_item = os.path.join(create_files, 'd.jpg')
+    position = file_objects.index(old_item)
+
+    file_objects.update(old_item, new_item)
+
+    assert old_item not in file_objects
+    assert new_item in file_objects
+    assert file_objects.index(new_item) == position
+    assert file_objects.names_in_dir(create_files) == {'b.jpg', 'd.jpg'}
+
+
+def test_file_object__append(create_files: str):
+    """
+    Тестирует добавление нового элемента в конец списка.
+    """
+    file_objects = FileObject(create_files)
+    new_item = os.path.join(create_files, 'e.jpg')
+
+    file_objects.append(new_item)
+
+    assert new_item in file_objects
+    assert file_objects[len(file_objects) - 1] == new_item
+
+
+def test_file_object__order(create_files: str):
+    """
+    Тестирует, что порядок обхода файлов детерминирован:
+    сначала файлы директории по алфавиту, затем вложенные директории.
+    """
+    file_objects = FileObject(create_files, is_recursion=True)
+    assert list(file_objects) == [os.path.join(create_files, 'a.jpg'),
+                                  os.path.join(create_files, 'b.jpg'),
+                                  os.path.join(create_files, 'level1', 'c.jpg')]
+
+
+def test_file_object__streaming(create_files: str):
+    """
+    Тестирует, что директории сканируются по мере обхода, а не заранее.
+    """
+    file_objects = FileObject(create_files, is_recursion=True)
+    entries = file_objects.iter_entries()
+
+    first_entry = next(entries)
+
+    assert first_entry.name == 'a.jpg'
+    assert first_entry.is_file()
+    assert os.path.join(create_files, 'b.jpg') in file_objects
+    assert os.path.join(create_files, 'level1') not in file_objects.names_in_dir(create_files)
+    assert [entry.name for entry in entries] == ['b.jpg', 'c.jpg']
+
+
+def test_file_object__move_between_dirs(create_files: str):
+    """
+    Тестирует, что адрес файла собирается из таблицы директорий и после переноса в другую директорию.
+    """
+    file_objects = FileObject(create_files, is_recursion=True)
+    old_item = os.path.join(create_files, 'b.jpg')
+    new_item = os.path.join(create_files, 'level1', 'b.jpg')
+    position = file_objects.index(old_item)
+
+    file_objects.update(old_item, new_item)
+
+    assert file_objects[position] == new_item
+    assert file_objects[-1] == os.path.join(create_files, 'level1', 'c.jpg')
+    assert file_objects[:2] == [os.path.join(create_files, 'a.jpg'), new_item]
+    assert file_objects.names_in_dir(create_files) == {'a.jpg'}
+    assert file_objects.names_in_dir(os.path.join(create_files, 'level1')) == {'b.jpg', 'c.jpg'}
@@ -0,0 +1,103 @@
+import piexif
+import pytest
+from PIL import Image
+
+from src import ImageRenamer
+from src.CodecLoader import CodecLoader
+from src.FormatSniffer import FormatSniffer
+from src.VideoProbe import VideoProbe
+from .utils import execute_renamer
+
+
+@pytest.mark.parametrize('header, expected', [
+    (b'\xff\xd8\xff\xe1\x00\x10Exif', 'jpeg'),
+    (b'II*\x00\x08\x00\x00\x00', 'tiff'),
+    (b'MM\x00*\x00\x00\x00\x08', 'tiff'),
+    (b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR', 'png'),
+    (b'RIFF\x00\x00\x00\x00WEBPVP8 ', 'webp'),
+    (b'RIFF\x00\x00\x00\x00AVI LIST', 'video'),
+    (b'\x00\x00\x00\x18ftypheic\x00\x00\x00\x00mif1heic', 'heif'),
+    (b'\x00\x00\x00\x1cftypavif\x00\x00\x00\x00avifmif1miaf', 'avif'),
+    (b'\x00\x00\x00\x18ftypisom\x00\x00\x02\x00isommp41', 'iso-bmff'),
+    (b'\x00\x00\x00\x08wide\x00\x00\x00\x00mdat', 'iso-bmff'),
+    (b'\x1a\x45\xdf\xa3\x9f\x42\x86\x81', 'video'),
+    ((b'\x47' + bytes(187)) * 3, 'video'),
+    (b'G is for text, not for MPEG-TS' * 20, None),
+    (b'<?xpacket begin="" id="W5M0MpCehiHzreSzNTczkc9d"?>', None),
+    (b'SQLite format 3\x00', None),
+    (b'', None),
+])
+def test_format_sniffer__sniff(header: bytes, expected: str | None):
+    """
+    Тестирует определение формата по первым байтам файла.
+    """
+    assert FormatSniffer.sniff(header[:FormatSniffer.HEADER_SIZE]) == expected
+
+
+@pytest.fixture(scope='function', name='create_files')
+def fixture_create_files(tmpdir) -> str:
+    """
+    Фикстура, срабатывающая при каждом вызове тестирующей функции.
+    Создаёт изображения TIFF, PNG и WebP с EXIF-данными (с неподходящими расширениями)
+    и файлы, которые не являются медиафайлами, в том числе с расширением видео.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будут создаваться файлы.
+    :return: Абсолютный адрес временной папки, в которой были созданы файлы.
+    """
+    abs_temp_dir = tmpdir.mkdir('files')
+    exif = piexif.dump({'0th': {piexif.ImageIFD.DateTime: b'2001:02:03 04:05:06'}})
+    for filename, image_format in (('a.dat', 'TIFF'), ('b.dat', 'PNG'), ('c.dat', 'WEBP')):
+        Image.new('RGB', (8, 8)).save(str(abs_temp_dir.join(filename)), image_format, exif=exif)
+    abs_temp_dir.join('notes.txt').write('just text')
+    abs_temp_dir.join('sidecar.xmp').write('<?xpacket begin=""?>')
+    abs_temp_dir.join('fake.mkv').write('not a video')
+    return str(abs_temp_dir)
+
+
+def test_format_sniffer__rename(create_files: str, capsys, monkeypatch):
+    """
+    Тестирует, что изображения распознаются по содержимому, а не по расширению,
+    а для файлов неизвестного формата ffprobe не запускается.
+    """
+    def creation_time(self, filename: str) -> str:
+        raise AssertionError(f'ffprobe запущен для {filename}')
+
+    monkeypatch.setattr(VideoProbe, 'creation_time', creation_time)
+    renamer = ImageRenamer.ImageRenamer(root_path=create_files, is_unique_name=True)
+    renamer.rename()
+    stdout = capsys.readouterr().out
+
+    assert 'a.dat -> 20010203_040506.dat' in stdout
+    assert 'b.dat -> 20010203_040506 (copy).dat' in stdout
+    assert 'c.dat -> 20010203_040506 (copy) (copy).dat' in stdout
+    report = renamer.statistics.as_dict()
+    assert report['extractors']['pillow']['files'] == 3
+    assert report['failures'] == {'FILE_DOESNT_HAVE_EXIF': 3}
+
+
+def test_codec_loader__fallback(tmpdir, monkeypatch):
+    """
+    Тестирует, что файл передаётся следующему модулю из списка, если модуля нет в этой версии Pillow
+    или он не смог прочитать файл.
+    """
+    monkeypatch.setitem(CodecLoader.PILLOW_FORMATS, 'avif', (('NoSuchImagePlugin', 'NOSUCH'),
+                                                             ('WebPImagePlugin', 'WEBP'), ('PngImagePlugin', 'PNG')))
+    filename = str(tmpdir.join('image.avif'))
+    Image.new('RGB', (8, 8)).save(filename, 'PNG')
+
+    with open(filename, 'rb') as file, CodecLoader.open_image(file, 'avif') as image:
+        assert image.format == 'PNG'
+
+
+def test_codec_loader__avif(tmpdir):
+    """
+    Тестирует, что AVIF читает модуль Pillow, даже если pillow_heif собран без AVIF.
+    """
+    avif_plugin = pytest.importorskip('PIL.AvifImagePlugin')
+    if not avif_plugin.SUPPORTED:
+        pytest.skip('Pillow собран без libavif')
+    exif = piexif.dump({'0th': {piexif.ImageIFD.DateTime: b'2001:02:03 04:05:06'}})
+    Image.new('RGB', (8, 8)).save(str(tmpdir.join('image.avif')), 'AVIF', exif=exif)
+
+    execute_renamer(str(tmpdir))
+
+    assert tmpdir.join('20010203_040506.avif').check()
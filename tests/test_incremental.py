@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+from src import ImageRenamer
+from src.RenamePlanner import RenamePlanner
+from src.TemplateMatcher import TemplateMatcher
+from .utils import new_image, add_exif
+
+
+@pytest.fixture(scope='function', name='create_images')
+def fixture_create_images(tmpdir) -> str:
+    """
+    Фикстура, срабатывающая при каждом вызове тестирующей функции.
+    Создаёт изображения, одно из которых уже названо по шаблону.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будут создаваться файлы.
+    :return: Абсолютный адрес временной папки, в которой были созданы файлы.
+    """
+    abs_temp_dir = tmpdir.mkdir('images')
+    filenames = (
+        ('10010101_010101.jpg', '1001:01:01 01:01:01'),
+        ('image02.jpg', '1002:01:01 01:01:01'),
+    )
+    for filename, datetime_string in filenames:
+        new_image(abs_temp_dir, filename)
+        add_exif(abs_temp_dir, filename, datetime_string)
+    return str(abs_temp_dir)
+
+
+def test_template_matcher__matches():
+    """
+    Тестирует, что имена, составленные по шаблону, в том числе уникальные, распознаются без учёта расширения.
+    """
+    matcher = TemplateMatcher('%Y%m%d_%H%M%S')
+    assert matcher.matches('20200101_010101.jpg')
+    assert matcher.matches('20200101_010101 (copy) (copy).HEIC')
+    assert not matcher.matches('IMG_0001.jpg')
+    assert not matcher.matches('20200101_010101_001.jpg')
+
+    assert TemplateMatcher('%Y%m%d_%H%M%S', style='number').matches('20200101_010101_001.jpg')
+    assert TemplateMatcher('%d %B %Y').matches('01 January 2020.jpg')
+    assert not TemplateMatcher('%c').matches('Wed Jan  1 01:01:01 2020.jpg')
+
+
+def test_rename_planner__unchanged():
+    """
+    Тестирует, что файл, у которого уже правильное имя, не считается ошибкой и не получает уникальное имя.
+    """
+    plan = RenamePlanner(is_unique_name=True).plan('/dir', {'a', 'b'}, [('a', 'a', None), ('b', 'a', None)])
+    assert [(planned.old_name, planned.new_name, planned.code) for planned in plan.renames] == \
+           [('a', 'a', 'UNCHANGED'), ('b', 'a (copy)', 'SUCCESS')]
+    assert [unit.operations for unit in plan.units] == [[('b', 'b', 'a (copy)')]]
+
+
+def test_incremental__stdout(create_images: str, capsys):
+    """
+    Тестирует, что файл с правильным именем выводится как успешный и не учитывается как ошибка.
+    """
+    ImageRenamer.ImageRenamer(root_path=create_images).rename()
+    assert capsys.readouterr().out == ('[  OK  ]  10010101_010101.jpg уже назван по шаблону.\n'
+                                       '[  OK  ]  image02.jpg -> 10020101_010101.jpg\n'
+                                       '\nУспешно переименовано: 1 файл\n'
+                                       'Уже названы по шаблону: 1 файл\n')
+
+
+def test_incremental__files_are_not_opened(create_images: str, monkeypatch):
+    """
+    Тестирует, что в инкрементальном режиме файлы с правильными именами не открываются.
+    """
+    opened = list()
+    read_exif_datetime = ImageRenamer.ImageRenamer._ImageRenamer__read_exif_datetime
+    monkeypatch.setattr(ImageRenamer.ImageRenamer, '_ImageRenamer__read_exif_datetime',
+                        lambda renamer, filename: opened.append(os.path.basename(filename)) or
+                        read_exif_datetime(renamer, filename))
+
+    ImageRenamer.ImageRenamer(root_path=create_images, is_incremental=True).rename()
+    assert opened == ['image02.jpg']
+
+    opened.clear()
+    ImageRenamer.ImageRenamer(root_path=create_images, is_incremental=True).rename()
+    assert opened == []
+    assert sorted(os.listdir(create_images)) == ['10010101_010101.jpg', '10020101_010101.jpg']
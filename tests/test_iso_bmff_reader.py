@@ -0,0 +1,109 @@
+import os
+import struct
+from datetime import datetime
+
+import pytest
+
+from src.IsoBmffReader import IsoBmffReader
+from src.ProjectException import UnsupportedFormat
+from .utils import new_image, new_video, execute_renamer
+
+
+def read_creation_time(filename: str) -> str:
+    with open(filename, 'rb') as file:
+        return IsoBmffReader.read_creation_time_from_file(file)
+
+
+def box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack('>L4s', len(payload) + 8, box_type) + payload
+
+
+def write_video(filename: str, moov_payload: bytes) -> None:
+    with open(filename, 'wb') as file:
+        file.write(box(b'ftyp', b'qt  ' + bytes(4) + b'qt  ') + box(b'moov', moov_payload))
+
+
+@pytest.fixture(scope='function', name='create_videos')
+def fixture_create_videos(tmpdir):
+    """
+    Фикстура, срабатывающая при каждом вызове тестирующей функции.
+    Создаёт MP4-файлы с 'moov' в начале и в конце файла, файл без даты создания и JPEG.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будут создаваться файлы.
+    :return: Временная папка, в которой были созданы файлы.
+    """
+    abs_temp_dir = tmpdir.mkdir('videos')
+
+    new_video(abs_temp_dir, 'moov_at_end.mp4', datetime(2001, 2, 3, 4, 5, 6))
+    new_video(abs_temp_dir, 'moov_at_start.mov', datetime(2002, 2, 3, 4, 5, 6), moov_at_end=False)
+    new_video(abs_temp_dir, 'without_date.mp4')
+    new_image(abs_temp_dir, 'image.jpg')
+
+    return abs_temp_dir
+
+
+@pytest.mark.parametrize('filename, expected', [
+    ('moov_at_end.mp4', '2001-02-03T04:05:06.000000Z'),
+    ('moov_at_start.mov', '2002-02-03T04:05:06.000000Z'),
+])
+def test_iso_bmff_reader__creation_time(create_videos, filename: str, expected: str):
+    """
+    Тестирует чтение даты создания в том же формате, в котором её возвращает ffprobe.
+    """
+    assert read_creation_time(str(create_videos.join(filename))) == expected
+
+
+def test_iso_bmff_reader__without_date(create_videos):
+    """
+    Тестирует видео без даты создания.
+    """
+    with pytest.raises(KeyError):
+        read_creation_time(str(create_videos.join('without_date.mp4')))
+
+
+def test_iso_bmff_reader__not_video(create_videos):
+    """
+    Тестирует файл, не являющийся ISO-BMFF: его нужно передать ffprobe.
+    """
+    with pytest.raises(UnsupportedFormat):
+        read_creation_time(str(create_videos.join('image.jpg')))
+
+
+def test_iso_bmff_reader__rename(create_videos, capsys):
+    """
+    Тестирует переименование видео без запуска ffprobe.
+    """
+    execute_renamer(str(create_videos))
+    actual_list_of_files = os.listdir(str(create_videos))
+    assert '20010203_040506.mp4' in actual_list_of_files
+    assert '20020203_040506.mov' in actual_list_of_files
+    assert '[ FAIL ]  without_date.mp4 невозможно переименовать. У файла нет EXIF-данных.' in capsys.readouterr().out
+
+
+def test_iso_bmff_reader__out_of_range_time(tmpdir):
+    """
+    Тестирует 64-битную дату за пределами диапазона datetime: даты в файле нет, а не ошибка всей программы.
+    """
+    filename = str(tmpdir.join('corrupt.mp4'))
+    # Версия 1: версия и флаги, 64-битные creation_time и modification_time
+    header = struct.pack('>Lqq', 1 << 24, 2 ** 62, 2 ** 62) + bytes(20)
+    write_video(filename, box(b'mvhd', header))
+
+    with pytest.raises(KeyError):
+        read_creation_time(filename)
+
+
+def test_iso_bmff_reader__apple_creation_date(tmpdir):
+    """
+    Тестирует чтение com.apple.quicktime.creationdate, когда это не первый ключ в 'keys'.
+    """
+    filename = str(tmpdir.join('iphone.mov'))
+    keys = [b'com.apple.quicktime.make', b'com.apple.quicktime.creationdate']
+    keys_payload = struct.pack('>LL', 0, len(keys)) + b''.join(struct.pack('>L', len(key) + 8) + b'mdta' + key
+                                                                for key in keys)
+    values = [b'Apple', b'2003-04-05T06:07:08+0300']
+    ilst_payload = b''.join(box(struct.pack('>L', index), box(b'data', struct.pack('>LL', 1, 0) + value))
+                            for index, value in enumerate(values, 1))
+    write_video(filename, box(b'meta', box(b'hdlr', bytes(25)) + box(b'keys', keys_payload) +
+                              box(b'ilst', ilst_payload)))
+
+    assert read_creation_time(filename) == '2003-04-05T03:07:08.000000Z'
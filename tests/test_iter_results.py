@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from src import ImageRenamer
+from src.RenameResult import RenameResult
+from .utils import new_image, add_exif
+
+
+@pytest.fixture(scope='function', name='create_images')
+def fixture_create_images(tmpdir) -> str:
+    """
+    Фикстура, срабатывающая при каждом вызове тестирующей функции.
+    Создаёт изображения с EXIF-данными и без них в двух уровнях директорий.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будут создаваться файлы.
+    :return: Абсолютный адрес временной папки, в которой были созданы файлы.
+    """
+    abs_temp_dir = tmpdir.mkdir('images')
+    tmpdir.mkdir('images/level1')
+    for filename, datetime_string in (('a.jpg', '1001:01:01 01:01:01'), ('level1/c.jpg', '1003:01:01 01:01:01')):
+        new_image(abs_temp_dir, filename)
+        add_exif(abs_temp_dir, filename, datetime_string)
+    new_image(abs_temp_dir, 'b.jpg')
+    return str(abs_temp_dir)
+
+
+def summary(results, root: str) -> list:
+    return [(os.path.relpath(result.old_path, root),
+             os.path.relpath(result.new_path, root) if result.new_path else None,
+             result.code, result.extractor) for result in results]
+
+
+def test_iter_results__records(create_images: str, capsys):
+    """
+    Тестирует, что iter_results переименовывает файлы, ничего не выводит и отдаёт результат каждого файла.
+    """
+    renamer = ImageRenamer.ImageRenamer(root_path=create_images, is_recursion=True)
+    results = list(renamer.iter_results())
+
+    assert capsys.readouterr().out == ''
+    assert summary(results, create_images) == [
+        ('a.jpg', '10010101_010101.jpg', 'SUCCESS', 'jpeg'),
+        ('b.jpg', None, 'FILE_DOESNT_HAVE_EXIF', 'failure'),
+        (os.path.join('level1', 'c.jpg'), os.path.join('level1', '10030101_010101.jpg'), 'SUCCESS', 'jpeg'),
+    ]
+    assert all(isinstance(result, RenameResult) and result.seconds >= 0 for result in results)
+    assert not hasattr(results[0], '__dict__')
+    assert (renamer._renamed_qty, renamer._failed_qty) == (2, 1)
+    assert os.path.exists(os.path.join(create_images, 'level1', '10030101_010101.jpg'))
+
+
+def test_iter_results__streaming(create_images: str):
+    """
+    Тестирует, что результаты отдаются по мере обработки директорий, а не после обработки всего дерева.
+    """
+    results = ImageRenamer.ImageRenamer(root_path=create_images, is_recursion=True).iter_results()
+
+    assert next(results).old_path == os.path.join(create_images, 'a.jpg')
+    assert os.path.exists(os.path.join(create_images, '10010101_010101.jpg'))
+    assert os.path.exists(os.path.join(create_images, 'level1', 'c.jpg'))
+    results.close()
+
+
+def test_plan__preview(create_images: str):
+    """
+    Тестирует, что plan отдаёт те же результаты, но файлы не переименовываются.
+    """
+    results = list(ImageRenamer.ImageRenamer(root_path=create_images).plan())
+
+    assert [result.code for result in results] == ['SUCCESS', 'FILE_DOESNT_HAVE_EXIF']
+    assert sorted(os.listdir(create_images)) == ['a.jpg', 'b.jpg', 'level1']
+
+
+def test_iter_results__dir_not_exists(tmpdir):
+    """
+    Тестирует, что об отсутствии директории сообщает исключение, а не вывод в консоль.
+    """
+    with pytest.raises(FileNotFoundError):
+        list(ImageRenamer.ImageRenamer(root_path=str(tmpdir.join('missing'))).iter_results())
@@ -0,0 +1,55 @@
+import os
+import shutil
+
+import pytest
+
+from .utils import new_image, add_exif, execute_renamer
+
+
+@pytest.fixture(scope='function', name='create_images')
+def fixture_create_images(tmpdir) -> str:
+    """
+    Фикстура, срабатывающая при каждом вызове тестирующей функции.
+    Создаёт набор изображений с совпадающими датами и файлы без EXIF-данных.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будут создаваться файлы.
+    :return: Абсолютный адрес временной папки, в которой были созданы файлы.
+    """
+    abs_temp_dir = tmpdir.mkdir('images')
+
+    filenames = (
+        ('image01.jpg', '1001.01.01 01:01:01'),
+        ('image02.jpg', '1002.01.01 01:01:01'),
+        ('image03.jpg', '1002.01.01 01:01:01'),
+        ('image04.jpg',),
+        ('image05.jpg', '1002.01.01 01:01:01'),
+        ('image06.jpg', 'incorrect Datetime info'),
+        ('image07.jpg', '1003.01.01 01:01:01'),
+        ('image08.jpg', '1001.01.01 01:01:01'),
+    )
+
+    for file in filenames:
+        new_image(abs_temp_dir, file[0])
+        try:
+            add_exif(abs_temp_dir, file[0], file[1])
+        except IndexError:
+            ...
+    return str(abs_temp_dir)
+
+
+@pytest.mark.parametrize('make_unique_name', [False, True])
+def test_jobs__same_as_serial(tmpdir, create_images: str, capsys, make_unique_name: bool):
+    """
+    Тестирует, что при параллельном чтении EXIF-данных вывод в консоль и результат переименования
+    полностью совпадают с последовательным запуском.
+    """
+    serial_dir = str(tmpdir.join('serial'))
+    shutil.copytree(create_images, serial_dir)
+
+    execute_renamer(serial_dir, make_unique_name=make_unique_name)
+    serial_stdout = capsys.readouterr().out.replace(serial_dir, '')
+
+    execute_renamer(create_images, make_unique_name=make_unique_name, jobs=4)
+    parallel_stdout = capsys.readouterr().out.replace(create_images, '')
+
+    assert parallel_stdout == serial_stdout
+    assert sorted(os.listdir(create_images)) == sorted(os.listdir(serial_dir))
@@ -0,0 +1,60 @@
+import pytest
+from PIL import Image
+
+from src.JpegExifReader import JpegExifReader
+from src.ProjectException import UnsupportedFormat
+from .utils import new_image, add_exif
+
+
+def read_datetime(filename: str) -> str:
+    with open(filename, 'rb') as file:
+        return JpegExifReader.read_datetime_from_file(file)
+
+
+@pytest.fixture(scope='function', name='create_images')
+def fixture_create_images(tmpdir):
+    """
+    Фикстура, срабатывающая при каждом вызове тестирующей функции.
+    Создаёт изображения с EXIF-данными, без них и файл, не являющийся JPEG.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будут создаваться файлы.
+    :return: Временная папка, в которой были созданы файлы.
+    """
+    abs_temp_dir = tmpdir.mkdir('images')
+
+    new_image(abs_temp_dir, 'with_exif.jpg')
+    add_exif(abs_temp_dir, 'with_exif.jpg', '1001.01.01 01:01:01')
+    new_image(abs_temp_dir, 'empty_exif.jpg')
+    add_exif(abs_temp_dir, 'empty_exif.jpg', '')
+    new_image(abs_temp_dir, 'without_exif.jpg')
+    Image.new('RGB', (10, 10), 'blue').save(str(abs_temp_dir.join('image.png')), 'PNG')
+    abs_temp_dir.join('text.txt').write('not an image')
+
+    return abs_temp_dir
+
+
+@pytest.mark.parametrize('filename', ['with_exif.jpg', 'empty_exif.jpg'])
+def test_jpeg_exif_reader__same_as_pillow(create_images, filename: str):
+    """
+    Тестирует, что быстрый парсер возвращает то же значение тега DateTime, что и Pillow.
+    """
+    filename = str(create_images.join(filename))
+    with Image.open(filename) as image:
+        expected = image.getexif()[306]
+    assert read_datetime(filename) == expected
+
+
+def test_jpeg_exif_reader__without_exif(create_images):
+    """
+    Тестирует JPEG без EXIF-данных: как и в случае с Pillow, должен возникать KeyError.
+    """
+    with pytest.raises(KeyError):
+        read_datetime(str(create_images.join('without_exif.jpg')))
+
+
+@pytest.mark.parametrize('filename', ['image.png', 'text.txt'])
+def test_jpeg_exif_reader__not_jpeg(create_images, filename: str):
+    """
+    Тестирует файлы, не являющиеся JPEG: их нужно передать универсальному парсеру.
+    """
+    with pytest.raises(UnsupportedFormat):
+        read_datetime(str(create_images.join(filename)))
@@ -0,0 +1,62 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from .utils import new_image, add_exif
+
+HEAVY_MODULES = ('PIL', 'pillow_heif', 'asyncio', 'sqlite3', 'concurrent.futures', 'subprocess')
+
+
+def rename_code(root: str) -> str:
+    return f'from src.ImageRenamer import ImageRenamer\nImageRenamer(root_path={root!r}, is_quiet=True).rename()'
+
+
+def imported_modules(code: str) -> list:
+    """
+    Выполняет 'code' в отдельном процессе и возвращает, какие из HEAVY_MODULES оказались загружены.
+    """
+    code += f'\nimport json, sys\nprint(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))'
+    process = subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.PIPE, text=True)
+    return json.loads(process.stdout.splitlines()[-1])
+
+
+@pytest.fixture(scope='function', name='create_images')
+def fixture_create_images(tmpdir) -> str:
+    """
+    Фикстура, срабатывающая при каждом вызове тестирующей функции.
+    Создаёт JPEG-изображения с EXIF-данными и без них.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будут создаваться файлы.
+    :return: Абсолютный адрес временной папки, в которой были созданы файлы.
+    """
+    abs_temp_dir = tmpdir.mkdir('images')
+    new_image(abs_temp_dir, 'with_exif.jpg')
+    add_exif(abs_temp_dir, 'with_exif.jpg', '1001:01:01 01:01:01')
+    new_image(abs_temp_dir, 'without_exif.jpg')
+    return str(abs_temp_dir)
+
+
+def test_lazy_imports__module():
+    """
+    Тестирует, что импорт ImageRenamer не загружает библиотеки, которые нужны не при каждом запуске.
+    """
+    assert imported_modules('import src.ImageRenamer') == []
+
+
+def test_lazy_imports__jpeg_only(create_images: str):
+    """
+    Тестирует, что папка с одними JPEG-файлами переименовывается без PIL.
+    """
+    assert imported_modules(rename_code(create_images)) == []
+
+
+def test_lazy_imports__png(tmpdir):
+    """
+    Тестирует, что для PNG-файла загружается PIL, но не pillow_heif.
+    """
+    abs_temp_dir = tmpdir.mkdir('images')
+    abs_temp_dir.join('image.png').write_binary(b'\x89PNG\r\n\x1a\n' + bytes(32))
+    modules = imported_modules(rename_code(str(abs_temp_dir)))
+    assert 'PIL' in modules
+    assert 'pillow_heif' not in modules
@@ -0,0 +1,111 @@
+import os
+
+import pytest
+
+from src import ImageRenamer
+from src.MetadataCache import MetadataCache
+from src.VideoProbe import VideoProbe
+from .utils import new_image, add_exif
+
+
+@pytest.fixture(scope='function', name='create_images')
+def fixture_create_images(tmpdir) -> str:
+    """
+    Фикстура, срабатывающая при каждом вызове тестирующей функции.
+    Создаёт изображения с EXIF-данными и без них.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будут создаваться файлы.
+    :return: Абсолютный адрес временной папки, в которой были созданы файлы.
+    """
+    abs_temp_dir = tmpdir.mkdir('images')
+
+    filenames = (
+        ('with_exif1.jpg', '1001.01.01 01:01:01'),
+        ('with_exif2.jpg', '1002.01.01 01:01:01'),
+        ('without_exif.jpg',),
+    )
+
+    for file in filenames:
+        new_image(abs_temp_dir, file[0])
+        try:
+            add_exif(abs_temp_dir, file[0], file[1])
+        except IndexError:
+            ...
+    return str(abs_temp_dir)
+
+
+def test_metadata_cache__warm_run(tmpdir, create_images: str, capsys, monkeypatch):
+    """
+    Тестирует, что при повторном запуске неизменившиеся файлы не открываются,
+    а результат совпадает с первым запуском.
+    """
+    cache_path = str(tmpdir.join('cache.sqlite'))
+    renamer = ImageRenamer.ImageRenamer(root_path=create_images, cache_path=cache_path)
+    renamer.rename(preview=True)
+    cold_stdout = capsys.readouterr().out
+
+    def fail(renamer, filename):
+        raise AssertionError(f'{filename} не должен открываться')
+
+    monkeypatch.setattr(ImageRenamer.ImageRenamer, '_ImageRenamer__read_exif_datetime', fail)
+    renamer = ImageRenamer.ImageRenamer(root_path=create_images, cache_path=cache_path)
+    renamer.rename(preview=True)
+    warm_stdout = capsys.readouterr().out
+
+    assert warm_stdout == cold_stdout
+    assert 'without_exif.jpg невозможно переименовать. У файла нет EXIF-данных.' in warm_stdout
+
+
+def test_metadata_cache__warm_run_video(tmpdir, monkeypatch):
+    """
+    Тестирует, что при повторном запуске для видео из кэша ffprobe не запускается, в том числе заранее.
+    """
+    root = tmpdir.mkdir('videos')
+    for number in range(3):
+        root.join(f'clip{number}.mkv').write_binary(b'\x1a\x45\xdf\xa3' + bytes(60))
+    probed = list()
+
+    def probe(self, filename: str) -> str:
+        probed.append(filename)
+        return '2001-02-03T04:05:06.000000Z'
+
+    monkeypatch.setattr(VideoProbe, '_VideoProbe__probe', probe)
+    cache_path = str(tmpdir.join('cache.sqlite'))
+    ImageRenamer.ImageRenamer(root_path=str(root), cache_path=cache_path).rename(preview=True)
+    assert len(probed) == 3
+
+    probed.clear()
+    renamer = ImageRenamer.ImageRenamer(root_path=str(root), cache_path=cache_path)
+    renamer.rename(preview=True)
+
+    assert probed == []
+    assert renamer.statistics.as_dict()['extractors'].keys() == {'cache'}
+
+
+def test_metadata_cache__changed_file(tmpdir, create_images: str):
+    """
+    Тестирует, что изменение файла делает запись в кэше недействительной.
+    """
+    filename = os.path.join(create_images, 'with_exif1.jpg')
+    with MetadataCache(str(tmpdir.join('cache.sqlite'))) as cache:
+        key = cache.key(os.stat(filename))
+        cache.put(key, '1001.01.01 01:01:01')
+        assert cache.get(key) == (True, '1001.01.01 01:01:01')
+
+        with open(filename, 'ab') as file:
+            file.write(b'\x00')
+        assert cache.get(cache.key(os.stat(filename))) == (False, None)
+
+
+def test_metadata_cache__eviction(tmpdir):
+    """
+    Тестирует, что при превышении размера кэша удаляются самые давно использовавшиеся записи.
+    """
+    cache_path = str(tmpdir.join('cache.sqlite'))
+    with MetadataCache(cache_path, max_entries=3) as cache:
+        for inode in range(3):
+            cache.put((1, inode, 10, 10), None)
+    with MetadataCache(cache_path, max_entries=2) as cache:
+        assert cache.get((1, 0, 10, 10))[0]
+        cache.put((1, 3, 10, 10), None)
+    with MetadataCache(cache_path, max_entries=2) as cache:
+        assert [cache.get((1, inode, 10, 10))[0] for inode in range(4)] == [True, False, False, True]
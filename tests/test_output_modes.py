@@ -0,0 +1,62 @@
+import io
+import json
+
+import pytest
+
+from src import ImageRenamer
+from src.OutputWriter import OutputWriter
+from .utils import new_image, add_exif
+
+
+@pytest.fixture(scope='function', name='create_images')
+def fixture_create_images(tmpdir) -> str:
+    """
+    Фикстура, срабатывающая при каждом вызове тестирующей функции.
+    Создаёт изображение с EXIF-данными и изображение без них.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будут создаваться файлы.
+    :return: Абсолютный адрес временной папки, в которой были созданы файлы.
+    """
+    abs_temp_dir = tmpdir.mkdir('images')
+    new_image(abs_temp_dir, 'with_exif.jpg')
+    add_exif(abs_temp_dir, 'with_exif.jpg', '1001.01.01 01:01:01')
+    new_image(abs_temp_dir, 'without_exif.jpg')
+    return str(abs_temp_dir)
+
+
+def test_output_modes__quiet(create_images: str, capsys):
+    """
+    Тестирует, что в режиме --quiet ничего не выводится.
+    """
+    ImageRenamer.ImageRenamer(root_path=create_images, is_quiet=True).rename()
+    assert capsys.readouterr().out == ''
+
+
+def test_output_modes__summary_only(create_images: str, capsys):
+    """
+    Тестирует, что в режиме --summary-only выводятся только итоговые счётчики.
+    """
+    ImageRenamer.ImageRenamer(root_path=create_images, is_summary_only=True).rename()
+    assert capsys.readouterr().out == '\nУспешно переименовано: 1 файл\nНе удалось переименовать: 1 файл\n'
+
+
+def test_output_modes__jsonl(create_images: str, capsys):
+    """
+    Тестирует вывод в формате JSON Lines.
+    """
+    ImageRenamer.ImageRenamer(root_path=create_images, output_format='jsonl').rename()
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert records == [
+        {'status': 'SUCCESS', 'old': 'with_exif.jpg', 'new': '10010101_010101.jpg'},
+        {'status': 'FILE_DOESNT_HAVE_EXIF', 'old': 'without_exif.jpg', 'new': None},
+        {'renamed': 1, 'failed': 1},
+    ]
+
+
+def test_output_modes__no_ansi_codes_without_tty():
+    """
+    Тестирует, что при выводе не в терминал ANSI-коды не выводятся.
+    """
+    stream = io.StringIO()
+    with OutputWriter(stream=stream) as output:
+        output.message('SUCCESS', 'a.jpg', 'b.jpg')
+    assert stream.getvalue() == '[  OK  ]  a.jpg -> b.jpg\n'
@@ -0,0 +1,109 @@
+import os
+
+import pytest
+
+from src import ImageRenamer
+from src.DirectoryWalker import DirectoryWalker
+from src.PathFilter import PathFilter
+from .utils import new_image, add_exif
+
+
+@pytest.fixture(scope='function', name='create_images')
+def fixture_create_images(tmpdir) -> str:
+    """
+    Фикстура, срабатывающая при каждом вызове тестирующей функции.
+    Создаёт изображения в трёх уровнях директорий и служебную директорию @eaDir.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будут создаваться файлы.
+    :return: Абсолютный адрес временной папки, в которой были созданы файлы.
+    """
+    abs_temp_dir = tmpdir.mkdir('images')
+    tmpdir.mkdir('images/@eaDir')
+    tmpdir.mkdir('images/level1')
+    tmpdir.mkdir('images/level1/level2')
+    filenames = (
+        ('image01.jpg', '1001:01:01 01:01:01'),
+        ('image02.JPG', '1002:01:01 01:01:01'),
+        ('@eaDir/image03.jpg', '1003:01:01 01:01:01'),
+        ('level1/image04.jpg', '1004:01:01 01:01:01'),
+        ('level1/level2/image05.jpg', '1005:01:01 01:01:01'),
+    )
+    for filename, datetime_string in filenames:
+        new_image(abs_temp_dir, filename)
+        add_exif(abs_temp_dir, filename, datetime_string)
+    abs_temp_dir.join('notes.txt').write('')
+    return str(abs_temp_dir)
+
+
+def walk(root: str, path_filter: PathFilter) -> list:
+    return [(os.path.relpath(dirname, root), [entry.name for entry in entries], sorted(skipped))
+            for dirname, entries, skipped in DirectoryWalker(root, True, path_filter=path_filter)]
+
+
+def test_path_filter__patterns():
+    """
+    Тестирует сравнение шаблонов: расширение, имя, относительный путь и регистр.
+    """
+    path_filter = PathFilter(include=('.jpg', 'raw/*.dng'), exclude=('@eaDir', 'Camera/thumbs'))
+
+    assert path_filter.is_file_allowed('a/IMG.JPG', 'IMG.JPG')
+    assert path_filter.is_file_allowed('raw/a.dng', 'a.dng')
+    assert not path_filter.is_file_allowed('other/a.dng', 'a.dng')
+    assert not path_filter.is_file_allowed('a.png', 'a.png')
+    assert not path_filter.is_dir_allowed('@eadir', '@eadir', 1)
+    assert not path_filter.is_dir_allowed('Camera/thumbs', 'thumbs', 2)
+    assert path_filter.is_dir_allowed('thumbs', 'thumbs', 1)
+
+
+def test_path_filter__exclude_dir_is_pruned(create_images: str, monkeypatch):
+    """
+    Тестирует, что исключённая директория не сканируется вовсе.
+    """
+    scanned = list()
+    scandir = os.scandir
+    monkeypatch.setattr(os, 'scandir', lambda path: scanned.append(path) or scandir(path))
+
+    result = walk(create_images, PathFilter(exclude=('@eaDir',)))
+
+    assert os.path.join(create_images, '@eaDir') not in scanned
+    assert [dirname for dirname, _, _ in result] == ['.', 'level1', os.path.join('level1', 'level2')]
+
+
+def test_path_filter__include_and_max_depth(create_images: str):
+    """
+    Тестирует, что include отбирает файлы по расширению без учёта регистра, а max_depth ограничивает глубину обхода.
+    """
+    result = walk(create_images, PathFilter(include=('.jpg',), exclude=('@eaDir',), max_depth=1))
+
+    assert result == [('.', ['image01.jpg', 'image02.JPG'], ['notes.txt']),
+                      ('level1', ['image04.jpg'], [])]
+
+
+@pytest.mark.parametrize('is_async', (False, True))
+def test_path_filter__renamer(create_images: str, is_async: bool):
+    """
+    Тестирует, что ImageRenamer не трогает исключённые файлы и директории.
+    """
+    ImageRenamer.ImageRenamer(root_path=create_images, is_recursion=True, exclude=('@eaDir', 'image02*'),
+                              max_depth=1, is_async=is_async).rename()
+
+    assert sorted(os.listdir(create_images)) == ['10010101_010101.jpg', '@eaDir', 'image02.JPG', 'level1', 'notes.txt']
+    assert os.listdir(os.path.join(create_images, '@eaDir')) == ['image03.jpg']
+    assert sorted(os.listdir(os.path.join(create_images, 'level1'))) == ['10040101_010101.jpg', 'level2']
+    assert os.listdir(os.path.join(create_images, 'level1', 'level2')) == ['image05.jpg']
+
+
+@pytest.mark.parametrize('is_async', (False, True))
+def test_path_filter__excluded_file_blocks_name(create_images: str, is_async: bool):
+    """
+    Тестирует, что имя исключённого файла остаётся занятым и он не будет перезаписан.
+    """
+    excluded = os.path.join(create_images, '10010101_010101.jpg')
+    with open(excluded, 'w') as file:
+        file.write('excluded')
+
+    ImageRenamer.ImageRenamer(root_path=create_images, include=('image*',), is_async=is_async).rename()
+
+    with open(excluded) as file:
+        assert file.read() == 'excluded'
+    assert os.path.exists(os.path.join(create_images, 'image01.jpg'))
+    assert os.path.exists(os.path.join(create_images, '10020101_010101.JPG'))
@@ -0,0 +1,91 @@
+import os
+
+import pytest
+
+from src import ImageRenamer
+from .utils import new_image, add_exif
+
+
+@pytest.fixture(scope='function', name='create_images')
+def fixture_create_images(tmpdir) -> str:
+    """
+    Фикстура, срабатывающая при каждом вызове тестирующей функции.
+    Создаёт изображения с EXIF-данными и без них.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будут создаваться файлы.
+    :return: Абсолютный адрес временной папки, в которой были созданы файлы.
+    """
+    abs_temp_dir = tmpdir.mkdir('images')
+
+    filenames = (
+        ('image1.jpg', '1001.01.01 01:01:01'),
+        ('image2.jpg', '1002.01.01 01:01:01'),
+        ('without_exif.jpg',),
+    )
+
+    for file in filenames:
+        new_image(abs_temp_dir, file[0])
+        try:
+            add_exif(abs_temp_dir, file[0], file[1])
+        except IndexError:
+            ...
+    return str(abs_temp_dir)
+
+
+def test_plan_out__doesnt_rename(tmpdir, create_images: str):
+    """
+    Тестирует, что при записи плана файлы не переименовываются.
+    """
+    plan_path = str(tmpdir.join('plan.jsonl'))
+    ImageRenamer.ImageRenamer(root_path=create_images, plan_out=plan_path).rename()
+
+    assert os.path.isfile(plan_path)
+    assert sorted(os.listdir(create_images)) == ['image1.jpg', 'image2.jpg', 'without_exif.jpg']
+
+
+def test_apply_plan__without_opening_files(tmpdir, create_images: str, capsys, monkeypatch):
+    """
+    Тестирует выполнение плана: файлы переименовываются, но не открываются.
+    """
+    plan_path = str(tmpdir.join('plan.jsonl'))
+    ImageRenamer.ImageRenamer(root_path=create_images, plan_out=plan_path).rename()
+    capsys.readouterr()
+
+    def fail(renamer, filename):
+        raise AssertionError(f'{filename} не должен открываться')
+
+    monkeypatch.setattr(ImageRenamer.ImageRenamer, '_ImageRenamer__read_exif_datetime', fail)
+    ImageRenamer.ImageRenamer(root_path='.').apply_plan(plan_path)
+
+    assert sorted(os.listdir(create_images)) == ['10010101_010101.jpg', '10020101_010101.jpg', 'without_exif.jpg']
+    actual_stdout = capsys.readouterr().out
+    assert '[  OK  ]  image1.jpg -> 10010101_010101.jpg' in actual_stdout
+    assert 'Успешно переименовано: 2 файла' in actual_stdout
+
+
+def test_apply_plan__file_changed(tmpdir, create_images: str, capsys):
+    """
+    Тестирует, что файл, изменившийся после построения плана, не переименовывается.
+    """
+    plan_path = str(tmpdir.join('plan.jsonl'))
+    ImageRenamer.ImageRenamer(root_path=create_images, plan_out=plan_path).rename()
+    capsys.readouterr()
+    with open(os.path.join(create_images, 'image1.jpg'), 'ab') as file:
+        file.write(b'\x00')
+
+    ImageRenamer.ImageRenamer(root_path='.').apply_plan(plan_path)
+
+    assert sorted(os.listdir(create_images)) == ['10020101_010101.jpg', 'image1.jpg', 'without_exif.jpg']
+    assert ('[ FAIL ]  image1.jpg невозможно переименовать. Файл изменился после построения плана.'
+            in capsys.readouterr().out)
+
+
+def test_apply_plan__incorrect_file(tmpdir, capsys):
+    """
+    Тестирует попытку выполнить файл, который не является планом.
+    """
+    plan_path = tmpdir.join('plan.jsonl')
+    plan_path.write('{}\n')
+
+    ImageRenamer.ImageRenamer(root_path='.').apply_plan(str(plan_path))
+
+    assert 'не является планом переименования.' in capsys.readouterr().out
@@ -0,0 +1,87 @@
+import json
+import os
+
+import pytest
+
+from src import ImageRenamer
+from src.RenameJournal import RenameJournal
+from .utils import new_image, add_exif
+
+
+@pytest.fixture(scope='function', name='create_images')
+def fixture_create_images(tmpdir) -> str:
+    """
+    Фикстура, срабатывающая при каждом вызове тестирующей функции.
+    Создаёт изображения, среди которых есть обмен именами.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будут создаваться файлы.
+    :return: Абсолютный адрес временной папки, в которой были созданы файлы.
+    """
+    abs_temp_dir = tmpdir.mkdir('images')
+
+    filenames = (
+        ('image1.jpg', '1001.01.01 01:01:01'),
+        ('image2.jpg', '1002.01.01 01:01:01'),
+        ('10040101_010101.jpg', '1003.01.01 01:01:01'),
+        ('10030101_010101.jpg', '1004.01.01 01:01:01'),
+    )
+
+    for file in filenames:
+        new_image(abs_temp_dir, file[0])
+        add_exif(abs_temp_dir, file[0], file[1])
+    return str(abs_temp_dir)
+
+
+def test_rename_journal__undo(tmpdir, create_images: str, capsys):
+    """
+    Тестирует, что отмена по журналу возвращает все файлы к исходным именам.
+    """
+    journal_path = str(tmpdir.join('journal.jsonl'))
+    contents = {filename: tmpdir.join('images', filename).read_binary() for filename in os.listdir(create_images)}
+
+    ImageRenamer.ImageRenamer(root_path=create_images, journal_path=journal_path).rename()
+    assert sorted(os.listdir(create_images)) == ['10010101_010101.jpg', '10020101_010101.jpg',
+                                                 '10030101_010101.jpg', '10040101_010101.jpg']
+    capsys.readouterr()
+
+    ImageRenamer.ImageRenamer(root_path=create_images).undo(journal_path)
+
+    assert {filename: tmpdir.join('images', filename).read_binary()
+            for filename in os.listdir(create_images)} == contents
+    actual_stdout = capsys.readouterr().out
+    assert '[  OK  ]  10010101_010101.jpg -> image1.jpg' in actual_stdout
+    # Обмен именами выполнялся через временное имя, но выводится и считается как одно переименование на файл
+    assert '[  OK  ]  10030101_010101.jpg -> 10040101_010101.jpg' in actual_stdout
+    assert '[  OK  ]  10040101_010101.jpg -> 10030101_010101.jpg' in actual_stdout
+    assert 'imagerenamer-tmp' not in actual_stdout
+    assert 'Успешно переименовано: 4 файла' in actual_stdout
+
+
+def test_rename_journal__not_executed_records(tmpdir):
+    """
+    Тестирует отмену по журналу, в котором после аварийного завершения остались невыполненные записи
+    и оборванная последняя строка: такие записи пропускаются.
+    """
+    tmpdir.join('a').write('')
+    tmpdir.join('c').write('')
+    journal = tmpdir.join('journal.jsonl')
+    journal.write(json.dumps([str(tmpdir.join('b')), str(tmpdir.join('c'))]) + '\n' +
+                  json.dumps([str(tmpdir.join('a')), str(tmpdir.join('d'))]) + '\n' +
+                  '["' + str(tmpdir.join('x')))
+
+    assert list(RenameJournal.undo_operations(str(journal))) == [(str(tmpdir.join('c')), str(tmpdir.join('b')))]
+
+
+def test_rename_journal__batched_fsync(tmpdir, monkeypatch):
+    """
+    Тестирует, что fsync вызывается один раз на sync_every записей и до того, как записи отданы на выполнение.
+    """
+    synced = list()
+    monkeypatch.setattr(os, 'fsync', lambda descriptor: synced.append(len(given)))
+    given = list()
+
+    with RenameJournal(str(tmpdir.join('journal.jsonl')), sync_every=2) as journal:
+        for operation in journal.write_ahead([('a', 'b'), ('c', 'd'), ('e', 'f')]):
+            given.append(operation)
+
+    assert synced == [0, 2]
+    assert given == [('a', 'b'), ('c', 'd'), ('e', 'f')]
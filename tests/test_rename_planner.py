@@ -0,0 +1,124 @@
+import os
+
+import pytest
+
+from src.RenameExecutor import RenameExecutor
+from src.RenamePlanner import RenamePlanner
+from .utils import new_image, add_exif, execute_renamer
+
+
+def codes(plan) -> dict:
+    return {planned.old_name: (planned.new_name, planned.code) for planned in plan.renames}
+
+
+def test_rename_planner__chain():
+    """
+    Тестирует цепочку a -> b -> c: имя b освобождается в этом же запуске, поэтому оба переименования возможны,
+    а выполняться они должны с конца цепочки.
+    """
+    plan = RenamePlanner().plan('/dir', {'a', 'b'}, [('a', 'b', None), ('b', 'c', None)])
+    assert codes(plan) == {'a': ('b', 'SUCCESS'), 'b': ('c', 'SUCCESS')}
+    assert [unit.operations for unit in plan.units] == [[('b', 'b', 'c'), ('a', 'a', 'b')]]
+
+
+def test_rename_planner__blocked_chain():
+    """
+    Тестирует цепочку, которая упирается в файл, который не переименовывается.
+    """
+    plan = RenamePlanner().plan('/dir', {'a', 'b', 'c'}, [('a', 'b', None), ('b', 'c', None),
+                                                          ('c', None, 'FILE_DOESNT_HAVE_EXIF')])
+    assert codes(plan) == {'a': ('b', 'FILE_EXISTS'), 'b': ('c', 'FILE_EXISTS'),
+                           'c': (None, 'FILE_DOESNT_HAVE_EXIF')}
+    assert plan.units == []
+
+
+def test_rename_planner__cycle():
+    """
+    Тестирует обмен именами: выполняется через одно временное имя.
+    """
+    plan = RenamePlanner().plan('/dir', {'a', 'b'}, [('a', 'b', None), ('b', 'a', None)])
+    assert codes(plan) == {'a': ('b', 'SUCCESS'), 'b': ('a', 'SUCCESS')}
+    assert len(plan.units) == 1
+    assert plan.units[0].is_cycle
+    assert len(plan.units[0].operations) == 3
+
+
+def test_rename_planner__same_target():
+    """
+    Тестирует несколько файлов с одним новым именем: его получает первый, остальные - уникальные имена.
+    """
+    plan = RenamePlanner(is_unique_name=True).plan('/dir', {'a.jpg', 'b.jpg', 'c.jpg'},
+                                                   [('a.jpg', 'x.jpg', None), ('b.jpg', 'x.jpg', None),
+                                                    ('c.jpg', 'x.jpg', None)])
+    assert codes(plan) == {'a.jpg': ('x.jpg', 'SUCCESS'), 'b.jpg': ('x (copy).jpg', 'SUCCESS'),
+                           'c.jpg': ('x (copy) (copy).jpg', 'SUCCESS')}
+
+
+def test_rename_executor__cycle(tmpdir):
+    """
+    Тестирует выполнение обмена именами на диске.
+    """
+    dirname = str(tmpdir)
+    tmpdir.join('a').write('content of a')
+    tmpdir.join('b').write('content of b')
+
+    plan = RenamePlanner().plan(dirname, {'a', 'b'}, [('a', 'b', None), ('b', 'a', None)])
+    RenameExecutor().execute(plan)
+
+    assert sorted(os.listdir(dirname)) == ['a', 'b']
+    assert tmpdir.join('a').read() == 'content of b'
+    assert tmpdir.join('b').read() == 'content of a'
+
+
+def test_rename_executor__preview(tmpdir):
+    """
+    Тестирует, что в режиме предпросмотра файлы не переименовываются, но обработчик вызывается.
+    """
+    dirname = str(tmpdir)
+    tmpdir.join('a').write('')
+    renamed = list()
+
+    plan = RenamePlanner().plan(dirname, {'a'}, [('a', 'b', None)])
+    RenameExecutor(preview=True, on_rename=lambda old, new: renamed.append((old, new))).execute(plan)
+
+    assert os.listdir(dirname) == ['a']
+    assert renamed == [(os.path.join(dirname, 'a'), os.path.join(dirname, 'b'))]
+
+
+@pytest.fixture(scope='function', name='create_images')
+def fixture_create_images(tmpdir) -> str:
+    """
+    Фикстура, срабатывающая при каждом вызове тестирующей функции.
+    Создаёт изображения, новые имена которых заняты файлами, переименовываемыми в этом же запуске.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будут создаваться файлы.
+    :return: Абсолютный адрес временной папки, в которой были созданы файлы.
+    """
+    abs_temp_dir = tmpdir.mkdir('images')
+
+    filenames = (
+        ('10010101_010101.jpg', '1002.01.01 01:01:01'),
+        ('10020101_010101.jpg', '1001.01.01 01:01:01'),
+        ('image.jpg', '1003.01.01 01:01:01'),
+        ('10030101_010101.jpg', '1004.01.01 01:01:01'),
+    )
+
+    for file in filenames:
+        new_image(abs_temp_dir, file[0])
+        add_exif(abs_temp_dir, file[0], file[1])
+    return str(abs_temp_dir)
+
+
+def test_rename_planner__rename(create_images: str, capsys):
+    """
+    Тестирует переименование обмена именами и цепочки без ошибок FILE_EXISTS.
+    """
+    execute_renamer(create_images)
+    expected_stdout = ['[  OK  ]  10010101_010101.jpg -> 10020101_010101.jpg',
+                       '[  OK  ]  10020101_010101.jpg -> 10010101_010101.jpg',
+                       '[  OK  ]  image.jpg -> 10030101_010101.jpg',
+                       '[  OK  ]  10030101_010101.jpg -> 10040101_010101.jpg']
+    actual_stdout = capsys.readouterr().out
+    for out in expected_stdout:
+        assert out in actual_stdout
+    assert sorted(os.listdir(create_images)) == ['10010101_010101.jpg', '10020101_010101.jpg',
+                                                 '10030101_010101.jpg', '10040101_010101.jpg']
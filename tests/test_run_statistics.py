@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from src import ImageRenamer
+from src.PhaseTimer import PhaseTimer
+from src.RunStatistics import RunStatistics
+from .utils import new_image, add_exif
+
+
+@pytest.fixture(scope='function', name='create_images')
+def fixture_create_images(tmpdir) -> str:
+    """
+    Фикстура, срабатывающая при каждом вызове тестирующей функции.
+    Создаёт два изображения с одинаковой датой в EXIF и изображение без EXIF.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будут создаваться файлы.
+    :return: Абсолютный адрес временной папки, в которой были созданы файлы.
+    """
+    abs_temp_dir = tmpdir.mkdir('images')
+    for filename in ('a.jpg', 'b.jpg'):
+        new_image(abs_temp_dir, filename)
+        add_exif(abs_temp_dir, filename, '1001:01:01 01:01:01')
+    new_image(abs_temp_dir, 'without_exif.jpg')
+    return str(abs_temp_dir)
+
+
+def test_run_statistics__programmatic(create_images: str, capsys):
+    """
+    Тестирует, что статистика доступна после запуска и без --stats, но не выводится.
+    """
+    renamer = ImageRenamer.ImageRenamer(root_path=create_images, is_quiet=True)
+    renamer.rename()
+    report = renamer.statistics.as_dict()
+
+    assert capsys.readouterr().out == ''
+    assert report['files'] == 3
+    assert set(report['phases']) == set(PhaseTimer.PHASES)
+    assert {extractor: value['files'] for extractor, value in report['extractors'].items()} == {'jpeg': 2,
+                                                                                                'failure': 1}
+    assert report['failures'] == {'FILE_EXISTS': 1, 'FILE_DOESNT_HAVE_EXIF': 1}
+
+
+def test_run_statistics__jsonl(create_images: str, capsys):
+    """
+    Тестирует вывод статистики последней записью JSON Lines даже в режиме --quiet.
+    """
+    ImageRenamer.ImageRenamer(root_path=create_images, output_format='jsonl', is_quiet=True, is_stats=True).rename()
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    assert len(records) == 1
+    assert records[0]['stats']['files'] == 3
+    assert records[0]['stats']['extractors']['jpeg']['path'] == 'image'
+
+
+def test_run_statistics__histogram():
+    """
+    Тестирует логарифмические корзины гистограммы: в корзину N попадают значения не меньше N/2 и меньше N микросекунд.
+    """
+    statistics = RunStatistics()
+    for seconds in (0.000_000_5, 0.000_003, 0.000_004, 0.001):
+        statistics.record_extraction('pillow', seconds)
+    assert statistics.as_dict()['extractors']['pillow']['histogram_us'] == {1: 1, 4: 1, 8: 1, 1024: 1}
+
+
+def test_phase_timer__nested():
+    """
+    Тестирует, что время вложенной фазы не учитывается во внешней.
+    """
+    timer = PhaseTimer()
+    with timer.measure('extract'):
+        for _ in timer.measure_iter('scan', range(3)):
+            ...
+    assert timer.durations['extract'] >= 0
+    assert timer.durations['scan'] > 0
+    assert timer.durations['plan'] == 0
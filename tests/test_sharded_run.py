@@ -0,0 +1,139 @@
+import errno
+import multiprocessing
+import os
+import shutil
+import threading
+
+import pytest
+
+from src import ImageRenamer
+from src.DirectoryWalker import DirectoryWalker
+from src.PathFilter import PathFilter
+from src.RunStatistics import RunStatistics
+from .utils import new_image, add_exif, execute_renamer
+
+
+@pytest.fixture(scope='function', name='create_images')
+def fixture_create_images(tmpdir) -> str:
+    """
+    Фикстура, срабатывающая при каждом вызове тестирующей функции.
+    Создаёт дерево директорий, в каждой из которых есть изображения с совпадающими датами и файл без EXIF.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будут создаваться файлы.
+    :return: Абсолютный адрес временной папки, в которой были созданы файлы.
+    """
+    abs_temp_dir = tmpdir.mkdir('images')
+    for dirname in ('', 'a', 'a/aa', 'a/ab', 'b', 'b/ba', 'c'):
+        if dirname:
+            tmpdir.mkdir(f'images/{dirname}')
+        prefix = f'{dirname}/' if dirname else ''
+        for number, datetime_string in enumerate(('1001:01:01 01:01:01', '1001:01:01 01:01:01', '1002:01:01 01:01:01')):
+            new_image(abs_temp_dir, f'{prefix}image{number}.jpg')
+            add_exif(abs_temp_dir, f'{prefix}image{number}.jpg', datetime_string)
+        new_image(abs_temp_dir, f'{prefix}without_exif.jpg')
+    return str(abs_temp_dir)
+
+
+def listing(root: str) -> list:
+    return sorted((os.path.relpath(dirname, root), sorted(filenames)) for dirname, _, filenames in os.walk(root))
+
+
+@pytest.mark.parametrize('make_unique_name', (False, True))
+def test_sharded_run__same_as_serial(tmpdir, create_images: str, make_unique_name: bool, capsys):
+    """
+    Тестирует, что запуск в нескольких процессах переименовывает и выводит то же самое, что и в одном.
+    """
+    serial_dir = str(tmpdir.join('serial'))
+    shutil.copytree(create_images, serial_dir)
+    execute_renamer(serial_dir, make_unique_name=make_unique_name, recursion=True)
+    serial_lines = capsys.readouterr().out.replace(serial_dir, '').splitlines()
+
+    ImageRenamer.ImageRenamer(root_path=create_images, is_unique_name=make_unique_name, is_recursion=True,
+                              processes=3).rename()
+    sharded_lines = capsys.readouterr().out.replace(create_images, '').splitlines()
+
+    assert listing(create_images) == listing(serial_dir)
+    # Директории обрабатываются разными процессами, поэтому порядок директорий в выводе может быть другим
+    assert sorted(sharded_lines) == sorted(serial_lines)
+    assert sharded_lines[-2:] == serial_lines[-2:]
+
+
+def test_sharded_run__statistics(create_images: str, capsys):
+    """
+    Тестирует, что счётчики и статистика процессов объединяются.
+    """
+    renamer = ImageRenamer.ImageRenamer(root_path=create_images, is_recursion=True, is_quiet=True, processes=2)
+    renamer.rename()
+    report = renamer.statistics.as_dict()
+
+    assert capsys.readouterr().out == ''
+    assert report['files'] == 28
+    assert report['failures'] == {'FILE_EXISTS': 7, 'FILE_DOESNT_HAVE_EXIF': 7}
+    assert report['extractors']['jpeg']['files'] == 21
+
+
+def test_sharded_run__dir_not_exists(tmpdir, capsys):
+    """
+    Тестирует вывод ошибки, если директории не существует.
+    """
+    ImageRenamer.ImageRenamer(root_path=str(tmpdir.join('missing')), processes=2).rename()
+    assert 'не существует' in capsys.readouterr().out
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork', reason='подмена метода не попадёт в процессы')
+def test_sharded_run__scan_error(create_images: str, monkeypatch):
+    """
+    Тестирует, что ошибка сканирования директории (не FileNotFoundError и не PermissionError) завершает работу
+    с ошибкой, а не оставляет остальные процессы ждать директорий, которых уже не будет.
+    """
+    scan_dir = DirectoryWalker.scan_dir
+
+    def failing_scan_dir(walker: DirectoryWalker, dirname: str) -> tuple:
+        if os.path.basename(dirname) == 'b':
+            raise OSError(errno.EIO, os.strerror(errno.EIO))
+        return scan_dir(walker, dirname)
+
+    monkeypatch.setattr(DirectoryWalker, 'scan_dir', failing_scan_dir)
+    errors = list()
+
+    def run() -> None:
+        try:
+            ImageRenamer.ImageRenamer(root_path=create_images, is_recursion=True, is_quiet=True, processes=3).rename()
+        except RuntimeError as error:
+            errors.append(str(error))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=30)
+
+    assert not thread.is_alive()
+    assert len(errors) == 1 and 'OSError' in errors[0]
+
+
+def test_directory_walker__scan_dir(create_images: str):
+    """
+    Тестирует сканирование одной директории: поддиректории отбираются фильтром, а глубина считается от корня.
+    """
+    walker = DirectoryWalker(create_images, True, path_filter=PathFilter(exclude=('ab',), max_depth=1))
+
+    files, skipped, subdirs = walker.scan_dir(os.path.join(create_images, 'a'))
+
+    assert [entry.name for entry in files] == ['image0.jpg', 'image1.jpg', 'image2.jpg', 'without_exif.jpg']
+    assert skipped == set()
+    assert subdirs == []
+    assert walker.scan_dir(create_images)[2] == [os.path.join(create_images, name) for name in ('a', 'b', 'c')]
+
+
+def test_run_statistics__merge():
+    """
+    Тестирует объединение статистики нескольких процессов.
+    """
+    first, second = RunStatistics(), RunStatistics()
+    for statistics in (first, second):
+        statistics.record_extraction('jpeg', 0.000_003)
+        statistics.record_result('FILE_EXISTS')
+    first.merge(second.as_dict())
+    report = first.as_dict()
+
+    assert report['files'] == 2
+    assert report['failures'] == {'FILE_EXISTS': 2}
+    assert report['extractors']['jpeg']['histogram_us'] == {4: 2}
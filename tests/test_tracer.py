@@ -0,0 +1,66 @@
+import json
+import os
+import time
+
+import pytest
+
+from src import ImageRenamer
+from src.Tracer import NullTracer, Tracer
+from .utils import new_image, add_exif
+
+
+@pytest.fixture(scope='function', name='create_images')
+def fixture_create_images(tmpdir) -> str:
+    """
+    Фикстура, срабатывающая при каждом вызове тестирующей функции.
+    Создаёт изображение с EXIF-данными и изображение без них.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будут создаваться файлы.
+    :return: Абсолютный адрес временной папки, в которой были созданы файлы.
+    """
+    abs_temp_dir = tmpdir.mkdir('images')
+    new_image(abs_temp_dir, 'with_exif.jpg')
+    add_exif(abs_temp_dir, 'with_exif.jpg', '1001:01:01 01:01:01')
+    new_image(abs_temp_dir, 'without_exif.jpg')
+    return str(abs_temp_dir)
+
+
+def test_tracer__rename(create_images: str, tmpdir):
+    """
+    Тестирует, что трассировка содержит сканирование директории, каждый способ чтения даты,
+    построение плана и переименование.
+    """
+    trace_path = str(tmpdir.join('trace.json'))
+    ImageRenamer.ImageRenamer(root_path=create_images, is_quiet=True, trace_path=trace_path, trace_sample=1).rename()
+    with open(trace_path, encoding='utf-8') as file:
+        events = [event for event in json.load(file) if event['ph'] == 'X']
+
+    assert [(event['name'], event['cat']) for event in events] == [
+        ('scandir', 'scan'), ('jpeg', 'extract'), ('jpeg', 'extract'), ('plan', 'plan'), ('rename', 'apply')]
+    assert events[2]['args'] == {'file': os.path.join(create_images, 'without_exif.jpg'), 'error': 'KeyError'}
+
+
+def test_tracer__sampling(tmpdir):
+    """
+    Тестирует, что записывается каждый N-й отрезок, а медленные отрезки - всегда.
+    """
+    trace_path = str(tmpdir.join('trace.json'))
+    with Tracer(trace_path, sample_every=4, slow_ms=5) as tracer:
+        for number in range(2000):
+            with tracer.span('fast', 'test', number=number):
+                ...
+        with tracer.span('slow', 'test'):
+            time.sleep(0.01)
+    with open(trace_path, encoding='utf-8') as file:
+        events = [event for event in json.load(file) if event['ph'] == 'X']
+
+    assert len([event for event in events if event['name'] == 'fast']) == 500
+    assert events[-1]['name'] == 'slow'
+    assert events[-1]['dur'] >= 5000
+
+
+def test_tracer__null():
+    """
+    Тестирует, что выключенная трассировка возвращает один и тот же пустой контекстный менеджер.
+    """
+    tracer = NullTracer()
+    assert tracer.span('a', 'test') is tracer.span('b', 'test', file='c')
@@ -0,0 +1,41 @@
+import pytest
+
+from src.RenamePlanner import RenamePlanner
+from src.UniqueNameAllocator import UniqueNameAllocator
+
+
+def test_unique_name_allocator__copy():
+    """
+    Тестирует стиль по-умолчанию: суффикс ' (copy)' повторяется, пока имя не станет уникальным.
+    """
+    taken = {'x.jpg', 'x (copy).jpg'}
+    allocator = UniqueNameAllocator(taken)
+    assert [allocator.allocate('x.jpg') for _ in range(3)] == ['x (copy) (copy).jpg', 'x (copy) (copy) (copy).jpg',
+                                                               'x (copy) (copy) (copy) (copy).jpg']
+    assert allocator.allocate('y.jpg') == 'y.jpg'
+    assert 'y.jpg' in taken
+
+
+def test_unique_name_allocator__number():
+    """
+    Тестирует стиль с номером: пропускаются только занятые номера.
+    """
+    allocator = UniqueNameAllocator({'x.jpg', 'x_002.jpg'}, style='number')
+    assert [allocator.allocate('x.jpg') for _ in range(3)] == ['x_001.jpg', 'x_003.jpg', 'x_004.jpg']
+
+
+def test_unique_name_allocator__unknown_style():
+    with pytest.raises(ValueError):
+        UniqueNameAllocator(set(), style='random')
+
+
+def test_unique_name_allocator__planner():
+    """
+    Тестирует серию файлов с одинаковой датой в стиле с номером.
+    """
+    extracted = [(f'{number}.jpg', 'x.jpg', None) for number in range(40)]
+    plan = RenamePlanner(is_unique_name=True, unique_style='number').plan(
+        '/dir', {old_name for old_name, _, _ in extracted}, extracted)
+    assert [planned.new_name for planned in plan.renames] == ['x.jpg'] + [f'x_{number:03d}.jpg'
+                                                                          for number in range(1, 40)]
+    assert {planned.code for planned in plan.renames} == {'SUCCESS'}
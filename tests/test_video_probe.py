@@ -0,0 +1,64 @@
+import os
+import stat
+
+import pytest
+
+from src.ProjectException import FileDoesntHaveExif
+from src.VideoProbe import VideoProbe
+
+
+@pytest.fixture(scope='function', name='fake_ffprobe')
+def fixture_fake_ffprobe(tmpdir) -> str:
+    """
+    Фикстура, создающая скрипт, который ведёт себя как ffprobe:
+    для файлов *.mkv возвращает JSON с creation_time, для остальных завершается с ошибкой.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будет создан скрипт.
+    :return: Абсолютный адрес скрипта.
+    """
+    script = tmpdir.join('ffprobe')
+    script.write('#!/bin/sh\n'
+                 'for last; do :; done\n'
+                 'case "$last" in\n'
+                 '  *.mkv) echo \'{"streams": [{"index": 0, "tags": {"creation_time": "2001-02-03T04:05:06.000000Z"}}]}\' ;;\n'
+                 '  *.avi) echo \'{"streams": [{"index": 0}]}\' ;;\n'
+                 '  *) exit 1 ;;\n'
+                 'esac\n')
+    os.chmod(str(script), stat.S_IRWXU)
+    return str(script)
+
+
+def test_video_probe__creation_time(fake_ffprobe: str):
+    """
+    Тестирует получение creation_time первого потока.
+    """
+    with VideoProbe(cmd=fake_ffprobe) as probe:
+        assert probe.creation_time('clip.mkv') == '2001-02-03T04:05:06.000000Z'
+
+
+def test_video_probe__without_creation_time(fake_ffprobe: str):
+    """
+    Тестирует видео без тега creation_time: как и раньше, возникает KeyError.
+    """
+    with VideoProbe(cmd=fake_ffprobe) as probe:
+        with pytest.raises(KeyError):
+            probe.creation_time('clip.avi')
+
+
+def test_video_probe__not_video(fake_ffprobe: str):
+    """
+    Тестирует файл, который ffprobe не смог прочитать.
+    """
+    with VideoProbe(cmd=fake_ffprobe) as probe:
+        with pytest.raises(FileDoesntHaveExif):
+            probe.creation_time('notes.txt')
+
+
+def test_video_probe__prefetching(fake_ffprobe: str):
+    """
+    Тестирует, что предварительная загрузка не меняет порядок файлов и её результаты используются.
+    """
+    filenames = [f'clip{number}.mkv' for number in range(10)] + ['image.jpg']
+    with VideoProbe(workers=3, cmd=fake_ffprobe) as probe:
+        assert list(probe.prefetching(filenames, lookahead=4)) == filenames
+        for filename in filenames[:-1]:
+            assert probe.creation_time(filename) == '2001-02-03T04:05:06.000000Z'
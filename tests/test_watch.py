@@ -0,0 +1,148 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from src import ImageRenamer
+from src.DirectoryWatcher import DirectoryWatcher
+from .utils import new_image, add_exif
+
+SETTLE_TIME = 0.2
+
+
+def wait_for(condition, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def poll_until_ready(watcher: DirectoryWatcher, timeout: float = 5) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        batch = watcher.poll(0.05)
+        if batch:
+            return {os.path.basename(dirname) or dirname: [item.name for item in files]
+                    for dirname, files in batch.items()}
+    return {}
+
+
+@pytest.fixture(scope='function', name='create_images')
+def fixture_create_images(tmpdir) -> str:
+    """
+    Фикстура, срабатывающая при каждом вызове тестирующей функции.
+    Создаёт изображение, которое уже лежит в директории на момент запуска наблюдения.
+    :param tmpdir: Фикстура, указывающая на временную папку, в которой будут создаваться файлы.
+    :return: Абсолютный адрес временной папки, в которой были созданы файлы.
+    """
+    abs_temp_dir = tmpdir.mkdir('images')
+    new_image(abs_temp_dir, 'image01.jpg')
+    add_exif(abs_temp_dir, 'image01.jpg', '1001:01:01 01:01:01')
+    return str(abs_temp_dir)
+
+
+@pytest.mark.parametrize('use_inotify', (True, False))
+def test_directory_watcher__settle(tmpdir, use_inotify: bool):
+    """
+    Тестирует, что файл отдаётся только после того, как его размер перестал меняться.
+    """
+    root = str(tmpdir.mkdir('upload'))
+    filename = os.path.join(root, 'a.jpg')
+    with DirectoryWatcher(root, settle_time=SETTLE_TIME, poll_interval=0.05, use_inotify=use_inotify) as watcher:
+        with open(filename, 'wb') as file:
+            file.write(b'part')
+        assert watcher.poll(0.05) == {}
+        with open(filename, 'ab') as file:
+            file.write(b'rest')
+        assert watcher.poll(0.05) == {}
+        started = time.monotonic()
+
+        assert poll_until_ready(watcher) == {'upload': ['a.jpg']}
+        assert time.monotonic() - started >= SETTLE_TIME / 2
+        assert watcher.names_in_dir(root) == {'a.jpg'}
+        assert watcher.poll(SETTLE_TIME) == {}
+
+
+@pytest.mark.parametrize('use_inotify', (True, False))
+def test_directory_watcher__index(tmpdir, use_inotify: bool):
+    """
+    Тестирует, что имена файлов в памяти обновляются по событиям, а собственные переименования не попадают в очередь.
+    """
+    root = tmpdir.mkdir('upload')
+    root.join('old.jpg').write('')
+    root = str(root)
+    with DirectoryWatcher(root, is_recursion=True, settle_time=0, poll_interval=0.05,
+                          use_inotify=use_inotify) as watcher:
+        assert poll_until_ready(watcher) == {'upload': ['old.jpg']}
+
+        os.rename(os.path.join(root, 'old.jpg'), os.path.join(root, 'new.jpg'))
+        watcher.renamed(os.path.join(root, 'old.jpg'), os.path.join(root, 'new.jpg'))
+        os.mkdir(os.path.join(root, 'level1'))
+        with open(os.path.join(root, 'level1', 'b.jpg'), 'w'):
+            ...
+
+        assert poll_until_ready(watcher) == {'level1': ['b.jpg']}
+        assert watcher.names_in_dir(root) == {'new.jpg'}
+        os.remove(os.path.join(root, 'new.jpg'))
+        assert wait_for(lambda: watcher.poll(0.05) == {} and not watcher.names_in_dir(root))
+
+
+@pytest.mark.parametrize('use_inotify', (True, False))
+def test_directory_watcher__chain(tmpdir, use_inotify: bool):
+    """
+    Тестирует, что имя, которое собственная цепочка переименований освободила и заняла снова, не попадает в очередь.
+    """
+    root = tmpdir.mkdir('upload')
+    root.join('a.jpg').write('a')
+    root.join('b.jpg').write('b')
+    root = str(root)
+    with DirectoryWatcher(root, settle_time=0, poll_interval=0.05, use_inotify=use_inotify) as watcher:
+        assert poll_until_ready(watcher) == {'upload': ['a.jpg', 'b.jpg']}
+
+        for old_name, new_name in (('b.jpg', 'c.jpg'), ('a.jpg', 'b.jpg')):
+            os.rename(os.path.join(root, old_name), os.path.join(root, new_name))
+            watcher.renamed(os.path.join(root, old_name), os.path.join(root, new_name))
+        with open(os.path.join(root, 'd.jpg'), 'w'):
+            ...
+
+        assert poll_until_ready(watcher) == {'upload': ['d.jpg']}
+        assert watcher.poll(0.2) == {}
+        assert watcher.names_in_dir(root) == {'b.jpg', 'c.jpg', 'd.jpg'}
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='inotify есть только в Linux')
+def test_directory_watcher__inotify(tmpdir):
+    """
+    Тестирует, что в Linux используется inotify.
+    """
+    with DirectoryWatcher(str(tmpdir)) as watcher:
+        assert watcher.is_inotify
+
+
+def test_watch__renamer(tmpdir, create_images: str, capsys):
+    """
+    Тестирует, что ImageRenamer переименовывает и файлы, которые были в директории, и новые.
+    """
+    stop = threading.Event()
+    renamer = ImageRenamer.ImageRenamer(root_path=create_images, settle_time=SETTLE_TIME, poll_interval=0.05)
+    thread = threading.Thread(target=renamer.watch, kwargs={'stop': stop})
+    thread.start()
+    try:
+        assert wait_for(lambda: os.path.exists(os.path.join(create_images, '10010101_010101.jpg')))
+
+        new_image(tmpdir, 'image02.jpg')
+        add_exif(tmpdir, 'image02.jpg', '1002:01:01 01:01:01')
+        os.rename(str(tmpdir.join('image02.jpg')), os.path.join(create_images, 'image02.jpg'))
+        assert wait_for(lambda: os.path.exists(os.path.join(create_images, '10020101_010101.jpg')))
+    finally:
+        stop.set()
+        thread.join()
+
+    assert sorted(os.listdir(create_images)) == ['10010101_010101.jpg', '10020101_010101.jpg']
+    assert capsys.readouterr().out == ('[  OK  ]  image01.jpg -> 10010101_010101.jpg\n'
+                                       '[  OK  ]  image02.jpg -> 10020101_010101.jpg\n'
+                                       '\nУспешно переименовано: 2 файла\n')
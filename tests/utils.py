@@ -1,4 +1,6 @@
 import os
+import struct
+from datetime import datetime
 
 import pytest
 import piexif
@@ -12,7 +14,8 @@ from src import ImageRenamer
 def execute_renamer(temp_dir: str,
                     template: str = settings.TEMPLATE,
                     make_unique_name: bool = settings.UNIQUE_NAME,
-                    recursion: bool = settings.RECURSION) -> None:
+                    recursion: bool = settings.RECURSION,
+                    jobs: int = settings.JOBS) -> None:
     """
     Запускает ImageRenamer.
     """
@@ -20,7 +23,8 @@ def execute_renamer(temp_dir: str,
         root_path=temp_dir,
         template_datetime_for_new_file=template,
         is_unique_name=make_unique_name,
-        is_recursion=recursion
+        is_recursion=recursion,
+        jobs=jobs
     )
     renamer.rename()
 
@@ -46,3 +50,24 @@ def add_exif(abs_path: str, filename: str, datetime_string: str):
 def change_chmod(abs_path: str, filename: str, chmod: oct):
     filename = abs_path.join(filename)
     os.chmod(filename, chmod)
+
+
+def new_video(abs_path: str, filename: str, creation_time: datetime | None = None, moov_at_end: bool = True):
+    """
+    Создаёт минимальный MP4-файл с одной дорожкой.
+    Дата creation_time записывается в 'mvhd' и в 'mdhd' дорожки, бокс 'moov' по-умолчанию находится в конце файла.
+    """
+    def box(box_type: bytes, payload: bytes) -> bytes:
+        return struct.pack('>L4s', len(payload) + 8, box_type) + payload
+
+    seconds = 0
+    if creation_time is not None:
+        seconds = int((creation_time - datetime(1904, 1, 1)).total_seconds())
+    # Версия 0: версия и флаги, creation_time, modification_time, остальные поля не важны
+    header = struct.pack('>LLL', 0, seconds, seconds) + bytes(20)
+    moov = box(b'moov', box(b'mvhd', header) + box(b'trak', box(b'mdia', box(b'mdhd', header))))
+    ftyp = box(b'ftyp', b'isom' + bytes(4) + b'isommp41')
+    mdat = box(b'mdat', bytes(1024))
+
+    with open(str(abs_path.join(filename)), 'wb') as file:
+        file.write(ftyp + (mdat + moov if moov_at_end else moov + mdat))